@@ -47,6 +47,8 @@ class Settings(BaseSettings):
     DEFAULT_TARGET_DURATION: int = 30  # seconds
     MAX_VIDEO_DURATION: int = 1800  # 30 minutes
     ALLOWED_VIDEO_FORMATS: list = [".mp4", ".mov", ".avi", ".mkv"]
+    WARMUP_MODELS: bool = False  # Load AI models at startup instead of on the first job
+    PROCESSING_DEADLINE: Optional[float] = None  # Seconds per job; stages are planned to fit
 
     # Celery
     CELERY_BROKER_URL: str = Field(default="redis://localhost:6379/0")
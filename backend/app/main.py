@@ -5,6 +5,7 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 from .core.config import settings
@@ -26,6 +27,15 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Moments API...")
     await init_db()
     logger.info("Database initialized")
+    if settings.WARMUP_MODELS:
+        try:
+            from core.ai_analyzers import warmup_models
+            from .tasks.processor import count_active_jobs
+            # Preload the Whisper variant the policy will pick for the current queue
+            await asyncio.to_thread(warmup_models, None, max(1, await count_active_jobs()))
+            logger.info("AI models loaded")
+        except ImportError as e:
+            logger.warning(f"AI models not available for warmup: {e}")
     yield
     # Shutdown
     logger.info("Shutting down Moments API...")
@@ -9,7 +9,7 @@ from datetime import datetime
 import asyncio
 import json
 import numpy as np
-from sqlalchemy import select
+from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
@@ -76,6 +76,33 @@ async def update_job_status(
             logger.info(f"Job {job_id} updated: status={status}, progress={progress}")
 
 
+async def count_active_jobs() -> int:
+    """Jobs waiting or being processed (the load the Whisper policy adapts to)"""
+    async with async_session_maker() as session:
+        result = await session.execute(
+            select(func.count()).select_from(ProcessingJob).where(
+                ProcessingJob.status.in_([JobStatus.PENDING, JobStatus.PROCESSING])
+            )
+        )
+        return result.scalar_one()
+
+
+async def release_idle_models():
+    """Evict idle AI models after a job, sized for the jobs still queued"""
+    try:
+        from core.ai_analyzers import evict_idle_models
+    except ImportError:
+        return
+
+    # Runs in a finally block: never let eviction mask the job's own error
+    try:
+        # This job still counts as PROCESSING until its status is updated
+        remaining = max(1, await count_active_jobs() - 1)
+        await asyncio.to_thread(evict_idle_models, None, remaining)
+    except Exception as e:
+        logger.warning(f"Model eviction failed: {e}")
+
+
 def process_video_task(job_id: str):
     """
     Process video task - runs in background
@@ -122,7 +149,7 @@ async def _process_video_async(job_id: str):
         output_filename = f"highlight_{job_id}_{Path(original_filename).stem}.mp4"
         output_path = settings.OUTPUT_DIR / output_filename
 
-        # Configure processor
+        # Configure processor (AI models are borrowed from the process-wide registry)
         config = SimpleConfig(target_duration=target_duration)
         processor = SimpleVideoProcessor(config)
 
@@ -138,12 +165,24 @@ async def _process_video_async(job_id: str):
         # Scene detection (0-30%)
         await update_job_status(job_id, progress=20)
 
+        # Queue depth at start (includes this job)
+        active_jobs = await count_active_jobs()
+
         # Run processing (synchronous call to existing processor)
-        result = await asyncio.to_thread(
-            processor.process_video,
-            str(upload_path),
-            str(output_path)
-        )
+        try:
+            result = await asyncio.to_thread(
+                processor.process_video,
+                str(upload_path),
+                str(output_path),
+                settings.PROCESSING_DEADLINE,
+                active_jobs
+            )
+        finally:
+            processor.close()
+
+            # Failed jobs release too. Keep the models the next job will borrow;
+            # free Whisper variants chosen under other loads
+            await release_idle_models()
 
         # Update to 80% after processing
         await update_job_status(job_id, progress=80)
@@ -6,13 +6,24 @@ Intelligent moment detection using face detection, emotion recognition, and spee
 import cv2
 import numpy as np
 import logging
-import tempfile
-import subprocess
 import os
 import ssl
-from typing import Dict, List, Optional, Tuple
+import bisect
+import threading
+from contextlib import ExitStack
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 
+from .audio_cache import AudioPCMCache, PCMStreamReader
+from .face_tracker import FaceTracker
+from .frame_sampler import FrameSampler, FrameSchedule
+from .frame_source import FrameConsumer, FrameRequest
+from .keyword_matcher import get_matcher
+from .model_registry import ModelRegistry, get_registry
+from .transcription import BackgroundTranscription
+from .voice_activity import VoiceActivityDetector
+from .whisper_policy import WhisperChoice, WhisperPolicy
+
 # Fix SSL certificate verification issues for model downloads
 try:
     ssl._create_default_https_context = ssl._create_unverified_context
@@ -36,6 +47,72 @@ class AIAnalysisResult:
     metadata: Dict = None
 
 
+def crop_face(frame: np.ndarray, face: np.ndarray) -> np.ndarray:
+    """Crop a detected face with padding for better emotion detection"""
+    x, y, w, h = map(int, face[:4])
+
+    padding = int(w * 0.2)
+    x1 = max(0, x - padding)
+    y1 = max(0, y - padding)
+    x2 = min(frame.shape[1], x + w + padding)
+    y2 = min(frame.shape[0], y + h + padding)
+
+    return frame[y1:y2, x1:x2]
+
+
+class FaceCropCache:
+    """
+    Face crops keyed by frame index, bounded by total bytes
+
+    Filled by the face detection pass so emotion recognition can work on the
+    crops directly instead of seeking back into the video. Frames whose
+    crops do not fit in the budget are left out; callers re-read only those.
+    """
+
+    def __init__(self, max_bytes: int = 128 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.crops: Dict[int, List[np.ndarray]] = {}
+        self.frames_dropped = 0
+
+    def add(self, frame_idx: int, frame: np.ndarray, faces) -> bool:
+        """
+        Store copies of the face crops of a frame
+
+        Returns:
+            False if the crops did not fit in the budget
+        """
+        # One crop per face, aligned with `faces` (empty arrays for degenerate boxes)
+        crops = [crop_face(frame, face).copy() for face in faces]
+        size = sum(crop.nbytes for crop in crops)
+
+        if self.nbytes + size > self.max_bytes:
+            self.frames_dropped += 1
+            return False
+
+        self.crops[frame_idx] = crops
+        self.nbytes += size
+        return True
+
+    def get(self, frame_idx: int) -> Optional[List[np.ndarray]]:
+        return self.crops.get(frame_idx)
+
+
+def emotion_keys(detection: Dict, window: float) -> List[Tuple]:
+    """
+    Identity of each face in a detection record for emotion inference
+
+    Untracked faces are all distinct. Tracked faces share a key per track
+    and time window, so emotion recognition runs once per track per window.
+    """
+    track_ids = detection.get('track_ids')
+    if track_ids is None:
+        return [('face', detection['frame'], i) for i in range(detection['num_faces'])]
+
+    bucket = int(detection['timestamp'] // window)
+    return [('track', track_id, bucket) for track_id in track_ids]
+
+
 class YuNetFaceDetector:
     """
     Fast face detection using OpenCV YuNet
@@ -43,18 +120,25 @@ class YuNetFaceDetector:
     Model size: Only 233 KB
     """
 
-    def __init__(self, model_path: str = None):
+    def __init__(self, model_path: str = None, max_side: Optional[int] = 640):
         """
         Initialize YuNet face detector
 
         Args:
             model_path: Path to YuNet ONNX model (auto-downloads if None)
+            max_side: Detect on a copy downscaled to this long side
+                      (None = detect at full resolution)
         """
         if model_path is None:
             # Auto-download model
             model_path = self._download_model()
 
         self.model_path = model_path
+        self.max_side = max_side
+        self._input_size: Optional[Tuple[int, int]] = None
+
+        # One detector instance is shared across jobs; setInputSize + detect must not interleave
+        self.lock = threading.Lock()
 
         try:
             # Initialize detector
@@ -101,61 +185,121 @@ class YuNetFaceDetector:
         """
         Detect faces in a frame
 
+        Frames larger than `max_side` are downscaled (aspect preserved) before
+        detection; boxes and landmarks are returned in full-frame coordinates.
+
         Args:
             frame: BGR image from OpenCV
 
         Returns:
-            List of face detections [x, y, w, h, conf, *landmarks]
+            List of face detections [x, y, w, h, *landmarks, conf]
         """
         if self.detector is None:
             return []
 
         try:
             h, w = frame.shape[:2]
-            self.detector.setInputSize((w, h))
-
-            _, faces = self.detector.detect(frame)
-            return faces if faces is not None else []
+            scale = 1.0
+            if self.max_side and max(h, w) > self.max_side:
+                scale = self.max_side / max(h, w)
+                w, h = max(1, round(w * scale)), max(1, round(h * scale))
+                frame = cv2.resize(frame, (w, h), interpolation=cv2.INTER_AREA)
+
+            with self.lock:
+                # Reconfiguring the network is not free; only do it when the size changes
+                if self._input_size != (w, h):
+                    self.detector.setInputSize((w, h))
+                    self._input_size = (w, h)
+                _, faces = self.detector.detect(frame)
+
+            if faces is None:
+                return []
+
+            if scale != 1.0:
+                # Columns 0-13 are box and landmark coordinates; column 14 is the score
+                faces[:, :14] /= scale
+
+            return faces
         except Exception as e:
             logger.warning(f"Face detection failed: {e}")
             return []
 
-    def process_video_segment(self, video_path: str, start_time: float, end_time: float) -> Dict:
+    def detect_or_track(self, frame: np.ndarray, sample_idx: int,
+                        tracker: Optional[FaceTracker], detect_every: int) -> Dict:
+        """
+        Faces of one sampled frame, detected or propagated by a tracker
+
+        Args:
+            frame: BGR frame
+            sample_idx: Position of the frame among the sampled frames
+            tracker: FaceTracker for detect-then-track mode (None = detect every frame)
+            detect_every: Run full detection every N sampled frames when tracking
+
+        Returns:
+            Detection record fields: 'num_faces', 'faces' and, when tracking, 'track_ids'
+        """
+        if tracker is None:
+            faces = self.detect_faces(frame)
+            return {'num_faces': len(faces), 'faces': faces}
+
+        detected = self.detect_faces(frame) if sample_idx % detect_every == 0 else None
+        tracks = tracker.update(frame, detected)
+
+        return {
+            'num_faces': len(tracks),
+            'faces': [face for _, face in tracks],
+            'track_ids': [track_id for track_id, _ in tracks]
+        }
+
+    def create_tracker(self, detect_every: int) -> Optional[FaceTracker]:
+        """Tracker for detect-then-track mode, or None when detecting every frame"""
+        return FaceTracker(max_side=self.max_side) if detect_every > 1 else None
+
+    def process_video_segment(self, video_path: str, start_time: float, end_time: float,
+                              crop_cache: Optional[FaceCropCache] = None,
+                              detect_every: int = 1) -> Dict:
         """
         Process video segment and detect faces
 
         Args:
             video_path: Path to video file
             start_time, end_time: Segment boundaries in seconds
+            crop_cache: Receives the face crops of each frame for later emotion analysis
+            detect_every: Run YuNet every N sampled frames and track faces with
+                          optical flow in between (1 = detect on every frame)
 
         Returns:
             Dictionary with face detection statistics
         """
-        cap = cv2.VideoCapture(video_path)
-        fps = cap.get(cv2.CAP_PROP_FPS)
+        face_detections = []
+        tracker = self.create_tracker(detect_every)
 
-        start_frame = int(start_time * fps)
-        end_frame = int(end_time * fps)
-        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+        # Sample ~6 times per second for performance (every 5 frames at 30 fps)
+        sampler = FrameSampler.for_segment(
+            video_path, FrameSchedule.every_seconds(1 / 6), start_time, end_time
+        )
 
-        face_detections = []
+        for sample_idx, (frame_idx, timestamp, frame) in enumerate(sampler):
+            detection = {'frame': frame_idx, 'timestamp': timestamp}
+            detection.update(self.detect_or_track(frame, sample_idx, tracker, detect_every))
 
-        # Sample every 5 frames for performance (still ~6 fps sampling)
-        for frame_idx in range(start_frame, end_frame, 5):
-            ret, frame = cap.read()
-            if not ret:
-                break
+            if crop_cache is not None and detection['num_faces'] > 0:
+                crop_cache.add(frame_idx, frame, detection['faces'])
 
-            faces = self.detect_faces(frame)
-            face_detections.append({
-                'frame': frame_idx,
-                'timestamp': frame_idx / fps,
-                'num_faces': len(faces),
-                'faces': faces
-            })
+            face_detections.append(detection)
+
+        return self.summarize_detections(face_detections)
+
+    def summarize_detections(self, face_detections: List[Dict]) -> Dict:
+        """
+        Summarize per-frame detections into segment statistics
 
-        cap.release()
+        Args:
+            face_detections: Per-frame detection records
 
+        Returns:
+            Dictionary with face detection statistics
+        """
         total_faces = sum(d['num_faces'] for d in face_detections)
         avg_faces = total_faces / len(face_detections) if face_detections else 0
 
@@ -175,7 +319,8 @@ class EmotionAnalyzer:
     Emotions: Happiness, Surprise, Sadness, Anger, Fear, Disgust, Contempt, Neutral
     """
 
-    def __init__(self, model_name: str = 'enet_b0_8_best_afew'):
+    def __init__(self, model_name: str = 'enet_b0_8_best_afew', batch_size: int = 16,
+                 max_batch_bytes: int = 64 * 1024 * 1024):
         """
         Initialize emotion recognizer
 
@@ -183,7 +328,12 @@ class EmotionAnalyzer:
             model_name: HSEmotion model name
                 - 'enet_b0_8_best_afew': EfficientNet-B0, 8 emotions (RECOMMENDED)
                 - 'enet_b2_8': EfficientNet-B2, more accurate but slower
+            batch_size: Maximum faces per forward pass
+            max_batch_bytes: Memory budget per batch (crops plus model input tensors)
         """
+        self.batch_size = max(1, batch_size)
+        self.max_batch_bytes = max_batch_bytes
+
         try:
             # Add safe globals for PyTorch 2.6+ compatibility
             import torch
@@ -223,29 +373,81 @@ class EmotionAnalyzer:
         Returns:
             Dictionary with emotion, confidence, and excitement_score
         """
+        return self.analyze_faces([face_image])[0]
+
+    def analyze_faces(self, face_images: Iterable[np.ndarray], batch_size: Optional[int] = None,
+                      max_batch_bytes: Optional[int] = None) -> List[Dict]:
+        """
+        Analyze emotions of many face images with batched forward passes
+
+        Crops are consumed lazily and grouped into batches bounded by
+        `batch_size` and `max_batch_bytes`, so a generator of crops never
+        holds more than one batch in memory.
+
+        Args:
+            face_images: Cropped face images (BGR)
+            batch_size: Maximum faces per forward pass (None = the analyzer's)
+            max_batch_bytes: Memory budget per batch (None = the analyzer's). The
+                             analyzer is shared across jobs, so per-job limits
+                             are passed here rather than set on it.
+
+        Returns:
+            One result per face, in input order
+        """
+        results = []
+        for batch in self._batches(face_images, batch_size or self.batch_size,
+                                   max_batch_bytes or self.max_batch_bytes):
+            results.extend(self._predict_batch(batch))
+        return results
+
+    def _batches(self, face_images: Iterable[np.ndarray], batch_size: int,
+                 max_batch_bytes: int) -> Iterator[List[np.ndarray]]:
+        """Group crops into batches within the size and memory limits"""
+        img_size = getattr(self.recognizer, 'img_size', 224)
+        tensor_bytes = 3 * img_size * img_size * 4  # float32 model input per face
+
+        batch, batch_bytes = [], 0
+        for face_image in face_images:
+            face_bytes = face_image.nbytes + tensor_bytes
+            if batch and (len(batch) >= batch_size or batch_bytes + face_bytes > max_batch_bytes):
+                yield batch
+                batch, batch_bytes = [], 0
+            batch.append(face_image)
+            batch_bytes += face_bytes
+
+        if batch:
+            yield batch
+
+    def _predict_batch(self, face_images: List[np.ndarray]) -> List[Dict]:
+        """One forward pass for a batch of crops"""
         if self.recognizer is None:
-            return self._empty_result()
+            return [self._empty_result() for _ in face_images]
 
         try:
             # HSEmotion expects RGB
-            rgb_face = cv2.cvtColor(face_image, cv2.COLOR_BGR2RGB)
+            rgb_faces = [cv2.cvtColor(face, cv2.COLOR_BGR2RGB) for face in face_images]
 
-            # Get emotion prediction
-            emotion, scores = self.recognizer.predict_emotions(rgb_face, logits=False)
+            # Get emotion predictions (one row of probabilities per face)
+            emotions, scores = self.recognizer.predict_multi_emotions(rgb_faces, logits=False)
 
-            # Calculate excitement score (0.0 to 1.0)
-            excitement_score = self._calculate_excitement(emotion, scores)
-
-            return {
-                'emotion': emotion,
-                'confidence': scores[emotion],
-                'all_scores': scores,
-                'excitement_score': excitement_score,
-                'is_positive': emotion in self.positive_emotions
-            }
+            return [self._make_result(emotion, row) for emotion, row in zip(emotions, scores)]
         except Exception as e:
             logger.warning(f"Emotion analysis failed: {e}")
-            return self._empty_result()
+            return [self._empty_result() for _ in face_images]
+
+    def _make_result(self, emotion: str, score_row: np.ndarray) -> Dict:
+        """Per-face result from a predicted label and its probability row"""
+        scores = {
+            self.recognizer.idx_to_class[i]: float(p) for i, p in enumerate(score_row)
+        }
+
+        return {
+            'emotion': emotion,
+            'confidence': scores.get(emotion, 0.0),
+            'all_scores': scores,
+            'excitement_score': self._calculate_excitement(emotion, scores),
+            'is_positive': emotion in self.positive_emotions
+        }
 
     def _calculate_excitement(self, emotion: str, scores: Dict) -> float:
         """Calculate excitement score based on emotion probabilities"""
@@ -258,7 +460,10 @@ class EmotionAnalyzer:
         return float(min(excitement, 1.0))
 
     def analyze_segment(self, video_path: str, start_time: float, end_time: float,
-                       face_detections: List[Dict]) -> Dict:
+                       face_detections: List[Dict],
+                       crop_cache: Optional[FaceCropCache] = None,
+                       window: float = 1.0, batch_size: Optional[int] = None,
+                       max_batch_bytes: Optional[int] = None) -> Dict:
         """
         Analyze emotions for faces detected in a video segment
 
@@ -266,6 +471,11 @@ class EmotionAnalyzer:
             video_path: Path to video
             start_time, end_time: Segment boundaries
             face_detections: List of face detections from YuNet
+            crop_cache: Crops saved by the detection pass; only frames missing
+                        from it are read back from the video
+            window: For tracked faces, seconds over which one emotion result
+                    stands for every appearance of the track
+            batch_size, max_batch_bytes: Batch limits (see analyze_faces)
 
         Returns:
             Emotion statistics for the segment
@@ -273,49 +483,71 @@ class EmotionAnalyzer:
         if self.recognizer is None:
             return self._empty_segment_result()
 
-        cap = cv2.VideoCapture(video_path)
-        fps = cap.get(cv2.CAP_PROP_FPS)
+        cap = None
+        face_keys = []
+        requested = {}
 
-        emotion_data = []
-        positive_emotion_count = 0
-        total_excitement = 0.0
+        def face_crops() -> Iterator[np.ndarray]:
+            nonlocal cap
+            for detection in face_detections:
+                if detection['num_faces'] == 0:
+                    continue
 
-        for detection in face_detections:
-            frame_idx = detection['frame']
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-            ret, frame = cap.read()
+                keys = emotion_keys(detection, window)
+                face_keys.extend(keys)
 
-            if not ret:
-                continue
+                new_faces = [i for i, key in enumerate(keys) if key not in requested]
+                if not new_faces:
+                    continue
 
-            # Process each face in the frame
-            for face in detection['faces']:
-                x, y, w, h = map(int, face[:4])
+                frame_idx = detection['frame']
+                crops = crop_cache.get(frame_idx) if crop_cache is not None else None
 
-                # Add padding for better emotion detection
-                padding = int(w * 0.2)
-                x1 = max(0, x - padding)
-                y1 = max(0, y - padding)
-                x2 = min(frame.shape[1], x + w + padding)
-                y2 = min(frame.shape[0], y + h + padding)
+                if crops is None:
+                    if cap is None:
+                        cap = cv2.VideoCapture(video_path)
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+                    ret, frame = cap.read()
 
-                face_img = frame[y1:y2, x1:x2]
+                    if not ret:
+                        continue
 
-                if face_img.size == 0:
-                    continue
+                    crops = [self.crop_face(frame, face) for face in detection['faces']]
+
+                # Process each new face in the frame
+                for i in new_faces:
+                    if crops[i].size > 0 and keys[i] not in requested:
+                        requested[keys[i]] = len(requested)
+                        yield crops[i]
+
+        try:
+            # Crops are analyzed in batches as they are read
+            results = self.analyze_faces(face_crops(), batch_size, max_batch_bytes)
+        finally:
+            if cap is not None:
+                cap.release()
 
-                # Analyze emotion
-                result = self.analyze_face(face_img)
-                emotion_data.append(result)
+        # Every face appearance takes the result of its track window (or its own crop)
+        emotion_data = [results[requested[key]] for key in face_keys if key in requested]
 
-                if result['is_positive']:
-                    positive_emotion_count += 1
+        return self.summarize_emotions(emotion_data)
 
-                total_excitement += result['excitement_score']
+    def crop_face(self, frame: np.ndarray, face: np.ndarray) -> np.ndarray:
+        """Crop a detected face with padding for better emotion detection"""
+        return crop_face(frame, face)
 
-        cap.release()
+    def summarize_emotions(self, emotion_data: List[Dict]) -> Dict:
+        """
+        Summarize per-face emotion results into segment statistics
+
+        Args:
+            emotion_data: Results from analyze_face
 
-        # Calculate statistics
+        Returns:
+            Emotion statistics for the segment
+        """
+        positive_emotion_count = sum(1 for result in emotion_data if result['is_positive'])
+        total_excitement = sum(result['excitement_score'] for result in emotion_data)
         num_faces = len(emotion_data)
 
         return {
@@ -364,14 +596,20 @@ class AudioTranscriber:
     Memory: ~280 MB (base.en), ~140 MB with INT8 quantization
     """
 
-    def __init__(self, model_size: str = 'base.en', compute_type: str = 'int8'):
+    def __init__(self, model_size: str = 'base.en', compute_type: str = 'int8', cpu_threads: int = 4,
+                 keyword_locale: str = 'en'):
         """
         Initialize Whisper transcriber with faster-whisper
 
         Args:
             model_size: 'tiny.en', 'base.en', 'small.en', 'medium.en'
             compute_type: 'int8' (fast, 50% smaller), 'float16', 'float32'
+            cpu_threads: CTranslate2 intra-op threads
+            keyword_locale: Excitement keyword dictionary (see keyword_matcher.get_matcher)
         """
+        self._readers = threading.local()  # Per-thread PCMStreamReader
+        self.keyword_matcher = get_matcher(keyword_locale)  # Compiled once per process
+
         try:
             from faster_whisper import WhisperModel
 
@@ -380,30 +618,29 @@ class AudioTranscriber:
                 model_size,
                 device='cpu',
                 compute_type=compute_type,
-                cpu_threads=4,  # Optimize for M-series
+                cpu_threads=cpu_threads,
                 num_workers=1
             )
-            logger.info(f"✅ Whisper initialized: {model_size} ({compute_type})")
-
-            # Keywords that indicate exciting moments
-            self.excitement_keywords = {
-                'yes', 'yeah', 'wow', 'amazing', 'awesome', 'goal',
-                'beautiful', 'love', 'happy', 'birthday', 'congratulations',
-                'surprise', 'yay', 'woohoo', 'nice', 'incredible', 'perfect',
-                'fantastic', 'excellent', 'wonderful', 'spectacular', 'outstanding'
-            }
+            logger.info(f"✅ Whisper initialized: {model_size} ({compute_type}, {cpu_threads} threads)")
 
         except Exception as e:
             logger.error(f"❌ Failed to initialize Whisper: {e}")
             self.model = None
 
-    def transcribe_segment(self, video_path: str, start_time: float, end_time: float) -> Dict:
+    def transcribe_segment(self, video_path: str, start_time: float, end_time: float,
+                           audio_cache: Optional[AudioPCMCache] = None,
+                           voiced_regions: Optional[List[Tuple[float, float]]] = None) -> Dict:
         """
         Transcribe audio from video segment
 
         Args:
             video_path: Path to video
             start_time, end_time: Segment boundaries in seconds
+            audio_cache: Job-wide decoded audio; the 16 kHz slice is passed to
+                         Whisper directly instead of extracting a temp WAV
+            voiced_regions: Speech regions inside the segment from a VAD pre-pass.
+                            Empty = skip Whisper; mostly silent segments only
+                            transcribe these regions
 
         Returns:
             Dictionary with transcription and excitement analysis
@@ -411,117 +648,148 @@ class AudioTranscriber:
         if self.model is None:
             return self._empty_result()
 
-        # Extract audio segment using ffmpeg
-        audio_path = self._extract_audio_segment(video_path, start_time, end_time)
+        if voiced_regions is not None:
+            if not voiced_regions:
+                return self._empty_result()
+
+            voiced = sum(end - start for start, end in voiced_regions)
+            if (audio_cache is not None and audio_cache.supports(16000)
+                    and voiced < 0.5 * (end_time - start_time)):
+                return self._transcribe_regions(start_time, voiced_regions, audio_cache)
 
-        if audio_path is None:
+        if audio_cache is not None:
+            if not audio_cache.supports(16000):
+                return self._empty_result()
+            audio_input = audio_cache.segment_float(start_time, end_time, 16000)
+        else:
+            # Stream the segment from ffmpeg straight into memory
+            audio_input = self._extract_audio_segment(video_path, start_time, end_time)
+
+        if audio_input is None or len(audio_input) == 0:
             return self._empty_result()
 
         try:
-            # Transcribe with faster-whisper
-            segments, info = self.model.transcribe(
-                audio_path,
-                language='en',
-                vad_filter=True,  # Voice Activity Detection
-                vad_parameters=dict(min_silence_duration_ms=500)
-            )
+            info = {}
+            word_timestamps = list(self.transcribe(audio_input, info=info))
+            return self.build_result(word_timestamps, **info)
 
-            # Collect transcription
-            full_text = []
-            word_timestamps = []
-
-            for segment in segments:
-                full_text.append(segment.text)
-                word_timestamps.append({
-                    'start': segment.start,
-                    'end': segment.end,
-                    'text': segment.text
-                })
-
-            text = ' '.join(full_text).strip()
-
-            # Analyze for excitement
-            excitement_analysis = self._analyze_excitement(text, word_timestamps)
-
-            return {
-                'text': text,
-                'language': info.language,
-                'language_probability': info.language_probability,
-                'segments': word_timestamps,
-                'has_speech': len(text) > 0,
-                'excitement_score': excitement_analysis['score'],
-                'keywords_found': excitement_analysis['keywords'],
-                'num_words': len(text.split())
-            }
+        except Exception as e:
+            logger.warning(f"Transcription failed: {e}")
+            return self._empty_result()
+
+    def _transcribe_regions(self, start_time: float, regions: List[Tuple[float, float]],
+                            audio_cache: AudioPCMCache) -> Dict:
+        """Transcribe only the voiced regions of a segment (times relative to start_time)"""
+        try:
+            info = {}
+            segments = []
+            for region_start, region_end in regions:
+                audio_input = audio_cache.segment_float(region_start, region_end, 16000)
+                if len(audio_input) == 0:
+                    continue
+                segments.extend(self.transcribe(audio_input, offset=region_start - start_time, info=info))
+            return self.build_result(segments, **info)
 
         except Exception as e:
             logger.warning(f"Transcription failed: {e}")
             return self._empty_result()
-        finally:
-            # Clean up temp audio file
-            if audio_path and os.path.exists(audio_path):
-                os.remove(audio_path)
 
-    def _extract_audio_segment(self, video_path: str, start_time: float, end_time: float) -> Optional[str]:
-        """Extract audio segment to temporary WAV file"""
-        duration = end_time - start_time
+    def transcribe(self, audio_input, offset: float = 0.0, info: Optional[Dict] = None,
+                   stop_event: Optional[threading.Event] = None) -> Iterator[Dict]:
+        """
+        Transcribe audio, yielding timestamped segments as Whisper produces them
 
-        # Create temp file
-        temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-        temp_path = temp_file.name
-        temp_file.close()
+        Args:
+            audio_input: 16 kHz float32 samples, or a path to any audio/video file
+            offset: Added to segment times (start of audio_input in the video)
+            info: Receives 'language' and 'language_probability' when given
+            stop_event: Stops transcription between segments when set
 
-        try:
-            # Extract audio with ffmpeg
-            cmd = [
-                'ffmpeg',
-                '-i', video_path,
-                '-ss', str(start_time),
-                '-t', str(duration),
-                '-vn',  # No video
-                '-acodec', 'pcm_s16le',  # WAV format
-                '-ar', '16000',  # 16kHz sample rate (Whisper optimal)
-                '-ac', '1',  # Mono
-                '-y',  # Overwrite
-                temp_path
-            ]
-
-            result = subprocess.run(cmd, capture_output=True, check=True, timeout=30)
-            return temp_path
-
-        except subprocess.TimeoutExpired:
-            logger.error("Audio extraction timed out")
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-            return None
-        except Exception as e:
-            logger.warning(f"Audio extraction failed: {e}")
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-            return None
+        Yields:
+            {'start', 'end', 'text'} dicts in time order
+        """
+        # Transcribe with faster-whisper
+        segments, whisper_info = self.model.transcribe(
+            audio_input,
+            language='en',
+            vad_filter=True,  # Voice Activity Detection
+            vad_parameters=dict(min_silence_duration_ms=500)
+        )
+
+        if info is not None:
+            info['language'] = whisper_info.language
+            info['language_probability'] = whisper_info.language_probability
+
+        for segment in segments:
+            if stop_event is not None and stop_event.is_set():
+                return
+            yield {
+                'start': segment.start + offset,
+                'end': segment.end + offset,
+                'text': segment.text
+            }
+
+    def build_result(self, segments: List[Dict], language: str = 'en',
+                     language_probability: float = 0.0) -> Dict:
+        """
+        Transcription result for a list of timestamped segments
+
+        Args:
+            segments: {'start', 'end', 'text'} dicts
+
+        Returns:
+            Dictionary with transcription and excitement analysis
+        """
+        # Collect transcription
+        text = ' '.join(segment['text'] for segment in segments).strip()
+
+        # Analyze for excitement
+        excitement_analysis = self._analyze_excitement(text, segments)
+
+        return {
+            'text': text,
+            'language': language,
+            'language_probability': language_probability,
+            'segments': segments,
+            'has_speech': len(text) > 0,
+            'excitement_score': excitement_analysis['score'],
+            'keywords_found': excitement_analysis['keywords'],
+            'num_words': len(text.split())
+        }
+
+    def _extract_audio_segment(self, video_path: str, start_time: float, end_time: float) -> Optional[np.ndarray]:
+        """
+        Decode a segment to 16 kHz float32 samples in memory
+
+        The transcriber is shared between jobs, so each thread streams into
+        its own reusable buffer; the result is valid until that thread's
+        next extraction.
+        """
+        reader = getattr(self._readers, 'reader', None)
+        if reader is None:
+            reader = self._readers.reader = PCMStreamReader(16000)
+        return reader.read(video_path, start_time, end_time)
 
     def _analyze_excitement(self, text: str, segments: List[Dict]) -> Dict:
         """Analyze transcription for exciting keywords"""
-        text_lower = text.lower()
-        words = text_lower.split()
+        matches = self.keyword_matcher.find(text)
 
-        # Find matching keywords
-        keywords_found = [w for w in words if w in self.excitement_keywords]
+        # Find matching keywords and phrases (weighted; "happy birthday" counts once, x2)
+        keywords_found = [m.phrase for m in matches if m.category == 'excitement']
+        keyword_weight = sum(m.weight for m in matches if m.category == 'excitement')
 
         # Calculate excitement score
-        keyword_score = min(len(keywords_found) * 0.3, 1.0)
+        keyword_score = min(keyword_weight * 0.3, 1.0)
 
         # Check for exclamation marks (enthusiasm)
         exclamation_score = min(text.count('!') * 0.2, 0.5)
 
         # Check for laughter transcriptions
-        laughter_keywords = ['laugh', 'haha', 'hehe', 'lol']
-        has_laughter = any(word in text_lower for word in laughter_keywords)
+        has_laughter = any(m.category == 'laughter' for m in matches)
         laughter_score = 0.3 if has_laughter else 0
 
         # Check for intensity words (very, really, so, super)
-        intensity_words = ['very', 'really', 'so', 'super', 'extremely', 'totally']
-        has_intensity = any(word in text_lower for word in intensity_words)
+        has_intensity = any(m.category == 'intensity' for m in matches)
         intensity_score = 0.2 if has_intensity else 0
 
         total_score = min(keyword_score + exclamation_score + laughter_score + intensity_score, 1.0)
@@ -547,50 +815,342 @@ class AudioTranscriber:
         }
 
 
+class FaceEmotionConsumer(FrameConsumer):
+    """
+    Face detection and emotion recognition fed by SharedFrameDecoder
+
+    Faces are detected ~6 times per second (same sampling as process_video_segment)
+    and emotions are read from crops of the frame already in memory, so the
+    video is never reopened or seeked for per-scene face analysis. In
+    detect-then-track mode, emotion runs once per track per window.
+    """
+
+    request = FrameRequest(interval=1 / 6)
+
+    def __init__(self, face_detector: YuNetFaceDetector, emotion_analyzer: EmotionAnalyzer,
+                 detect_every: int = 1, emotion_window: float = 1.0,
+                 batch_size: Optional[int] = None, max_batch_bytes: Optional[int] = None):
+        self.face_detector = face_detector
+        self.emotion_analyzer = emotion_analyzer
+        self.detect_every = detect_every
+        self.emotion_window = emotion_window
+        self.batch_size = batch_size or emotion_analyzer.batch_size
+        self.max_batch_bytes = max_batch_bytes or emotion_analyzer.max_batch_bytes
+        self.tracker = face_detector.create_tracker(detect_every)
+
+        self.detections: List[Dict] = []
+        self.timestamps: List[float] = []
+        self.emotion_results: Dict[Tuple, Dict] = {}
+
+        # Crops waiting for a batched emotion pass, keyed like emotion_results
+        self._pending: Dict[Tuple, np.ndarray] = {}
+        self._pending_bytes = 0
+
+    def consume(self, frame_idx: int, timestamp: float, frame: np.ndarray):
+        detection = {'frame': frame_idx, 'timestamp': timestamp}
+        detection.update(self.face_detector.detect_or_track(
+            frame, len(self.detections), self.tracker, self.detect_every
+        ))
+        detection['emotion_keys'] = emotion_keys(detection, self.emotion_window)
+
+        if detection['num_faces'] > 0 and self.emotion_analyzer.recognizer is not None:
+            for key, face in zip(detection['emotion_keys'], detection['faces']):
+                if key in self.emotion_results or key in self._pending:
+                    continue
+
+                face_img = self.emotion_analyzer.crop_face(frame, face)
+                if face_img.size > 0:
+                    # Copy: the decoder may reuse the frame buffer
+                    self._pending[key] = face_img.copy()
+                    self._pending_bytes += face_img.nbytes
+
+            if len(self._pending) >= self.batch_size or self._pending_bytes >= self.max_batch_bytes:
+                self._flush()
+
+        self.detections.append(detection)
+        self.timestamps.append(timestamp)
+
+    def _flush(self):
+        """Run the emotion model on pending crops"""
+        if not self._pending:
+            return
+
+        results = self.emotion_analyzer.analyze_faces(
+            list(self._pending.values()), self.batch_size, self.max_batch_bytes
+        )
+        self.emotion_results.update(zip(self._pending.keys(), results))
+
+        self._pending = {}
+        self._pending_bytes = 0
+
+    def finish(self):
+        self._flush()
+
+    def segment_data(self, start_time: float, end_time: float) -> Tuple[Dict, Dict]:
+        """
+        Face and emotion statistics for a segment
+
+        Returns:
+            Tuple of (face_data, emotion_data) shaped like the per-segment analyzers
+        """
+        lo = bisect.bisect_left(self.timestamps, start_time)
+        hi = bisect.bisect_left(self.timestamps, end_time)
+        detections = self.detections[lo:hi]
+
+        face_data = self.face_detector.summarize_detections(detections)
+        emotion_data = self.emotion_analyzer.summarize_emotions([
+            self.emotion_results[key]
+            for d in detections for key in d['emotion_keys']
+            if key in self.emotion_results
+        ])
+
+        return face_data, emotion_data
+
+
+# Registry keys and factories of the models AIVideoAnalyzer borrows
+def transcriber_factory(choice: WhisperChoice):
+    """Registry factory for a Whisper variant (loaded with the choice's thread count)"""
+    return lambda: AudioTranscriber(
+        model_size=choice.model_size,
+        compute_type=choice.compute_type,
+        cpu_threads=choice.cpu_threads
+    )
+
+
+# Whisper variants are registered on demand by AIVideoAnalyzer.transcriber
+MODEL_FACTORIES = {
+    'yunet': YuNetFaceDetector,
+    'hsemotion': EmotionAnalyzer,
+}
+
+
+def register_models(registry: Optional[ModelRegistry] = None) -> ModelRegistry:
+    """Register the AI models with a registry (the process-wide one by default)"""
+    registry = registry or get_registry()
+    for key, factory in MODEL_FACTORIES.items():
+        registry.register(key, factory)
+    return registry
+
+
+def warmup_models(registry: Optional[ModelRegistry] = None, active_jobs: int = 1):
+    """
+    Load the AI models now so the first job does not pay for it
+
+    Args:
+        registry: Registry to load into (the process-wide one by default)
+        active_jobs: Current queue depth; picks the Whisper variant the
+                     adaptive policy will choose for the next job
+    """
+    registry = register_models(registry)
+    whisper = WhisperPolicy().choose(active_jobs)
+    registry.register(whisper.key, transcriber_factory(whisper))
+    registry.warmup(list(MODEL_FACTORIES) + [whisper.key])
+
+
+def evict_idle_models(registry: Optional[ModelRegistry] = None, active_jobs: int = 1) -> int:
+    """
+    Free models no job is using, except the ones the next job will want
+
+    Keeps the face and emotion models and the Whisper variant the adaptive
+    policy picks for `active_jobs`; idle Whisper variants chosen under
+    other loads are dropped, so a long-lived worker holds at most one idle
+    Whisper model.
+
+    Returns:
+        Number of models evicted
+    """
+    registry = registry or get_registry()
+    keep = list(MODEL_FACTORIES) + [WhisperPolicy().choose(active_jobs).key]
+    return registry.evict_idle(keep=keep)
+
+
 class AIVideoAnalyzer:
     """
     Unified AI analyzer combining face detection, emotion recognition, and speech transcription
+
+    Models are borrowed from a process-wide ModelRegistry, so constructing an
+    analyzer per job is cheap once the models are loaded. Call close() to
+    return them. The Whisper variant can be switched per job with
+    use_whisper(); it is only borrowed (and loaded) on first use.
     """
 
-    def __init__(self):
-        """Initialize all AI components"""
+    def __init__(self, registry: Optional[ModelRegistry] = None,
+                 face_detect_every: int = 1, emotion_window: float = 1.0,
+                 whisper: Optional[WhisperChoice] = None,
+                 emotion_batch_size: Optional[int] = None,
+                 emotion_batch_bytes: Optional[int] = None):
+        """
+        Initialize all AI components
+
+        Args:
+            registry: Model registry to borrow from (the process-wide one by default)
+            face_detect_every: Run face detection every N sampled frames and track
+                               faces in between (1 = detect on every sampled frame)
+            emotion_window: Seconds per emotion result for a tracked face
+            whisper: Whisper variant to use (base.en, 4 threads by default)
+            emotion_batch_size: Faces per emotion forward pass (None = EmotionAnalyzer default)
+            emotion_batch_bytes: Memory budget per emotion batch (None = EmotionAnalyzer default)
+        """
         logger.info("Initializing AI Video Analyzer...")
 
-        self.face_detector = YuNetFaceDetector()
-        self.emotion_analyzer = EmotionAnalyzer()
-        self.transcriber = AudioTranscriber(model_size='base.en', compute_type='int8')
+        self.face_detect_every = face_detect_every
+        self.emotion_window = emotion_window
+        self.emotion_batch_size = emotion_batch_size
+        self.emotion_batch_bytes = emotion_batch_bytes
+
+        self.registry = register_models(registry)
+        self._models = ExitStack()   # Face/emotion borrows, returned by close()
+        self._whisper = ExitStack()  # Whisper borrow, returned on a variant switch too
+
+        self.face_detector = self._models.enter_context(self.registry.borrow('yunet'))
+        self.emotion_analyzer = self._models.enter_context(self.registry.borrow('hsemotion'))
+        self.whisper = whisper or WhisperChoice()
+        self._transcriber: Optional[AudioTranscriber] = None
 
         logger.info("✅ AI Video Analyzer ready")
 
-    def analyze_segment(self, video_path: str, start_time: float, end_time: float) -> AIAnalysisResult:
+    @property
+    def transcriber(self) -> AudioTranscriber:
+        """The chosen Whisper variant, borrowed from the registry on first use"""
+        if self._transcriber is None:
+            self._transcriber = self._whisper.enter_context(
+                self.registry.borrow(self.whisper.key, transcriber_factory(self.whisper))
+            )
+        return self._transcriber
+
+    def use_whisper(self, choice: WhisperChoice):
+        """Switch the Whisper variant (the previous one stays cached until evicted)"""
+        if choice.key != self.whisper.key:
+            self._whisper.close()
+            self._transcriber = None
+        self.whisper = choice
+
+    def close(self):
+        """Return borrowed models to the registry"""
+        self._whisper.close()
+        self._models.close()
+        self._transcriber = None
+
+    def create_frame_consumer(self) -> FaceEmotionConsumer:
+        """Create a consumer that runs face and emotion analysis inside a shared decode pass"""
+        return FaceEmotionConsumer(
+            self.face_detector, self.emotion_analyzer,
+            detect_every=self.face_detect_every,
+            emotion_window=self.emotion_window,
+            batch_size=self.emotion_batch_size,
+            max_batch_bytes=self.emotion_batch_bytes
+        )
+
+    def start_transcription(self, video_path: str,
+                            audio_cache: Optional[AudioPCMCache] = None,
+                            regions: Optional[List[Tuple[float, float]]] = None) -> Optional[BackgroundTranscription]:
+        """
+        Transcribe the job's audio once in a background thread
+
+        Args:
+            video_path: Original video (audio source when there is no cache)
+            audio_cache: Job-wide decoded audio
+            regions: Only transcribe these (start, end) spans
+
+        Returns:
+            Running BackgroundTranscription, or None if Whisper is unavailable
+        """
+        if self.transcriber.model is None:
+            return None
+        return BackgroundTranscription(self.transcriber, video_path, audio_cache, regions).start()
+
+    def analyze_segment(self, video_path: str, start_time: float, end_time: float,
+                        face_consumer: Optional[FaceEmotionConsumer] = None,
+                        audio_path: Optional[str] = None,
+                        audio_cache: Optional[AudioPCMCache] = None,
+                        transcript: Optional[BackgroundTranscription] = None,
+                        transcript_timeout: Optional[float] = None,
+                        vad: Optional[VoiceActivityDetector] = None,
+                        speech: bool = True) -> AIAnalysisResult:
         """
         Comprehensive AI analysis of a video segment
 
         Args:
-            video_path: Path to video file
+            video_path: Path to video file (or its analysis proxy)
             start_time, end_time: Segment boundaries in seconds
+            face_consumer: Face results from a shared decode pass (skips per-segment decoding)
+            audio_path: File to transcribe when video_path has no audio (defaults to video_path)
+            audio_cache: Job-wide decoded audio used instead of extracting per segment
+            transcript: Whole-file transcription to read speech from (no per-segment Whisper call)
+            transcript_timeout: Seconds to wait for the transcript to reach this segment
+            vad: Voice activity pre-pass; segments without speech skip Whisper
+            speech: False skips Whisper entirely (the job has no time or audio for it)
 
         Returns:
             AIAnalysisResult with all AI scores and metadata
         """
-        # Face detection
-        face_data = self.face_detector.process_video_segment(video_path, start_time, end_time)
+        face_data, emotion_data = self.analyze_visual(video_path, start_time, end_time, face_consumer)
+        speech_data = self.analyze_speech(
+            audio_path or video_path, start_time, end_time, audio_cache=audio_cache,
+            transcript=transcript, transcript_timeout=transcript_timeout, vad=vad, speech=speech
+        )
+        return self.combine(face_data, emotion_data, speech_data)
 
-        # Emotion recognition (only if faces detected)
+    def analyze_visual(self, video_path: str, start_time: float, end_time: float,
+                       face_consumer: Optional[FaceEmotionConsumer] = None) -> Tuple[Dict, Dict]:
+        """
+        Face and emotion analysis of a segment (no audio; safe to run in a worker process)
+
+        Returns:
+            (face_data, emotion_data)
+        """
         emotion_data = {'avg_excitement': 0, 'has_happy_moments': False, 'positive_emotion_ratio': 0}
-        if face_data['total_faces'] > 0:
-            emotion_data = self.emotion_analyzer.analyze_segment(
-                video_path, start_time, end_time, face_data['detections']
+
+        if face_consumer is not None:
+            # Face and emotion results were computed during the shared decode
+            face_data, segment_emotions = face_consumer.segment_data(start_time, end_time)
+            if face_data['total_faces'] > 0:
+                emotion_data = segment_emotions
+        else:
+            # Face detection keeps the crops so emotion recognition never re-decodes
+            crop_cache = FaceCropCache() if self.emotion_analyzer.recognizer is not None else None
+            face_data = self.face_detector.process_video_segment(
+                video_path, start_time, end_time, crop_cache=crop_cache,
+                detect_every=self.face_detect_every
             )
 
+            # Emotion recognition (only if faces detected)
+            if face_data['total_faces'] > 0:
+                emotion_data = self.emotion_analyzer.analyze_segment(
+                    video_path, start_time, end_time, face_data['detections'],
+                    crop_cache=crop_cache, window=self.emotion_window,
+                    batch_size=self.emotion_batch_size, max_batch_bytes=self.emotion_batch_bytes
+                )
+
+        return face_data, emotion_data
+
+    def analyze_speech(self, audio_path: str, start_time: float, end_time: float,
+                       audio_cache: Optional[AudioPCMCache] = None,
+                       transcript: Optional[BackgroundTranscription] = None,
+                       transcript_timeout: Optional[float] = None,
+                       vad: Optional[VoiceActivityDetector] = None,
+                       speech: bool = True) -> Dict:
+        """Speech transcription result for a segment (see analyze_segment for the arguments)"""
         # Speech transcription (only if segment is long enough)
         speech_data = {'excitement_score': 0, 'has_speech': False, 'text': ''}
-        if end_time - start_time >= 2.0:
+        voiced_regions = vad.regions_in(start_time, end_time) if vad is not None else None
+        if speech and end_time - start_time >= 2.0 and voiced_regions != []:
             try:
-                speech_data = self.transcriber.transcribe_segment(video_path, start_time, end_time)
+                if transcript is not None:
+                    speech_data = transcript.segment_result(start_time, end_time, transcript_timeout)
+                else:
+                    speech_data = self.transcriber.transcribe_segment(
+                        audio_path, start_time, end_time, audio_cache=audio_cache,
+                        voiced_regions=voiced_regions
+                    )
             except Exception as e:
                 logger.warning(f"Transcription failed for segment {start_time}-{end_time}: {e}")
 
+        return speech_data
+
+    @staticmethod
+    def combine(face_data: Dict, emotion_data: Dict, speech_data: Dict) -> AIAnalysisResult:
+        """AIAnalysisResult from the visual and speech halves of the analysis"""
         # Calculate normalized scores
         face_score = min(face_data['avg_faces_per_frame'] / 3.0, 1.0)  # 3+ faces = 1.0
         emotion_score = emotion_data['avg_excitement']
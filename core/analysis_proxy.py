@@ -0,0 +1,136 @@
+"""
+Analysis Proxy
+Transcodes a low-resolution, keyframe-dense copy of an upload for frame analysis
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import logging
+from typing import Optional
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisProxy:
+    """
+    Low-bitrate proxy of a video used by every frame analyzer
+
+    The original (often 4K HEVC) is decoded exactly once, to produce a small
+    H.264 file with a keyframe every second. Analyzers then decode and seek in
+    the proxy, which is both cheaper per frame and cheap to seek into. Only
+    the final composition reads the original.
+
+    Timestamps are preserved, so scene boundaries found on the proxy apply
+    directly to the original. The proxy has no audio track.
+    """
+
+    def __init__(
+        self,
+        video_path: str,
+        height: int = 480,
+        fps: float = 15.0,
+        keyframe_interval: float = 1.0,
+        crf: int = 28
+    ):
+        """
+        Initialize AnalysisProxy
+
+        Args:
+            video_path: Path to the original video
+            height: Short side of the proxy in pixels
+            fps: Proxy frame rate
+            keyframe_interval: Seconds between keyframes
+            crf: x264 quality (higher = smaller file)
+        """
+        self.video_path = video_path
+        self.height = height
+        self.fps = fps
+        self.keyframe_interval = keyframe_interval
+        self.crf = crf
+
+        self.temp_dir: Optional[str] = None
+        self.path: Optional[str] = None
+
+    def create(self) -> str:
+        """
+        Transcode the proxy
+
+        Returns:
+            Path to analyze: the proxy, or the original if it is already small
+            or the transcode fails
+        """
+        if not self._needs_proxy():
+            logger.info("Source is already at analysis resolution, skipping proxy")
+            self.path = self.video_path
+            return self.path
+
+        self.temp_dir = tempfile.mkdtemp(prefix='moments_proxy_')
+        proxy_path = os.path.join(self.temp_dir, 'analysis_proxy.mp4')
+
+        gop = max(1, int(round(self.fps * self.keyframe_interval)))
+
+        # Scale the short side to `height`, keeping aspect ratio (portrait or landscape)
+        scale = (
+            f"scale='if(gt(iw,ih),-2,{self.height})':'if(gt(iw,ih),{self.height},-2)'"
+        )
+
+        cmd = [
+            'ffmpeg', '-v', 'error', '-nostdin',
+            '-i', self.video_path,
+            '-map', '0:v:0',
+            '-an', '-sn',
+            '-vf', f"fps={self.fps},{scale}",
+            '-c:v', 'libx264',
+            '-preset', 'ultrafast',
+            '-tune', 'fastdecode',
+            '-crf', str(self.crf),
+            '-g', str(gop),
+            '-keyint_min', str(gop),
+            '-sc_threshold', '0',
+            '-pix_fmt', 'yuv420p',
+            '-y',
+            proxy_path
+        ]
+
+        try:
+            subprocess.run(cmd, capture_output=True, check=True, timeout=1800)
+            self.path = proxy_path
+            logger.info(f"Analysis proxy created: {self.height}p @ {self.fps} fps")
+        except subprocess.CalledProcessError as e:
+            logger.warning(f"Proxy transcode failed, analyzing original: {e.stderr}")
+            self.cleanup()
+            self.path = self.video_path
+        except Exception as e:
+            logger.warning(f"Proxy transcode failed, analyzing original: {e}")
+            self.cleanup()
+            self.path = self.video_path
+
+        return self.path
+
+    def _needs_proxy(self) -> bool:
+        """A proxy only pays off when the source is larger or faster than the target"""
+        cap = cv2.VideoCapture(self.video_path)
+        width = cap.get(cv2.CAP_PROP_FRAME_WIDTH)
+        height = cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        cap.release()
+
+        short_side = min(width, height)
+        return short_side > self.height or fps > self.fps * 1.5
+
+    def cleanup(self):
+        """Delete the proxy file"""
+        if self.temp_dir and os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.temp_dir = None
+
+    def __enter__(self) -> 'AnalysisProxy':
+        self.create()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cleanup()
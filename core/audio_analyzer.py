@@ -1,11 +1,10 @@
 import numpy as np
 import whisper
-from moviepy.editor import VideoFileClip
 from typing import Dict, List, Tuple
-import tempfile
-import os
 import logging
 
+from .audio_cache import PCMStreamReader
+
 logger = logging.getLogger(__name__)
 
 class AudioAnalyzer:
@@ -16,6 +15,9 @@ class AudioAnalyzer:
             logger.warning(f"Failed to load Whisper model: {e}. Speech detection disabled.")
             self.whisper_model = None
 
+        # 16 kHz mono is what Whisper expects; decoded straight into memory
+        self.reader = PCMStreamReader(16000)
+
     def analyze_segment(self, video_path: str,
                        start_time: float,
                        end_time: float) -> Dict:
@@ -37,57 +39,40 @@ class AudioAnalyzer:
             'silence_ratio': 1.0
         }
 
-        if self.whisper_model and audio_data.get('path'):
-            speech_analysis = self._analyze_speech(audio_data['path'])
+        if self.whisper_model and len(audio_data['signal']) > 0:
+            speech_analysis = self._analyze_speech(audio_data['signal'])
             analysis.update(speech_analysis)
 
-        if 'signal' in audio_data:
+        if len(audio_data['signal']) > 0:
             y = audio_data['signal']
 
             analysis['volume_mean'] = float(np.mean(np.abs(y)))
             analysis['volume_peak'] = float(np.max(np.abs(y)))
             analysis['silence_ratio'] = self._calculate_silence_ratio(y)
-            analysis['has_music'] = self._detect_music(y)
+            analysis['has_music'] = self._detect_music(y, audio_data['sample_rate'])
             analysis['excitement_level'] = self._calculate_excitement(y)
 
-        if audio_data.get('path') and os.path.exists(audio_data['path']):
-            os.remove(audio_data['path'])
-
         return analysis
 
     def _extract_audio_segment(self, video_path: str,
                               start_time: float,
                               end_time: float) -> Dict:
-        """Extract audio segment from video"""
-        try:
-            video = VideoFileClip(video_path).subclip(start_time, end_time)
-
-            if video.audio is None:
-                return None
-
-            temp_audio = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-            video.audio.write_audiofile(temp_audio.name, logger=None, verbose=False)
-
-            with open(temp_audio.name, 'rb') as f:
-                audio_bytes = f.read()
-
-            audio_array = np.frombuffer(audio_bytes[44:], dtype=np.int16).astype(np.float32) / 32768.0
+        """Extract audio segment from video (streamed from ffmpeg, no temp file)"""
+        audio_array = self.reader.read(video_path, start_time, end_time)
 
-            return {
-                'path': temp_audio.name,
-                'signal': audio_array,
-                'sample_rate': 44100
-            }
-
-        except Exception as e:
-            logger.error(f"Audio extraction failed: {e}")
+        if audio_array is None:
             return None
 
-    def _analyze_speech(self, audio_path: str) -> Dict:
-        """Detect and transcribe speech"""
+        return {
+            'signal': audio_array,
+            'sample_rate': self.reader.sample_rate
+        }
+
+    def _analyze_speech(self, audio: np.ndarray) -> Dict:
+        """Detect and transcribe speech (16 kHz float32 samples)"""
         try:
             result = self.whisper_model.transcribe(
-                audio_path,
+                audio,
                 language='en',
                 fp16=False
             )
@@ -109,14 +94,21 @@ class AudioAnalyzer:
         silence_samples = np.sum(np.abs(y) < threshold)
         return float(silence_samples / len(y)) if len(y) > 0 else 1.0
 
-    def _detect_music(self, y: np.ndarray) -> bool:
-        """Simple music detection using spectral features"""
+    def _detect_music(self, y: np.ndarray, sample_rate: int, split_hz: float = 5512.5) -> bool:
+        """
+        Simple music detection using spectral features
+
+        Compares spectral magnitude below and above `split_hz`. The split is a
+        fixed frequency (a quarter of the 44.1 kHz spectrum this was tuned
+        on), so it does not move with the decode rate.
+        """
         try:
             fft = np.fft.rfft(y)
             magnitude = np.abs(fft)
+            split = np.searchsorted(np.fft.rfftfreq(len(y), 1 / sample_rate), split_hz)
 
-            low_freq_energy = np.sum(magnitude[:len(magnitude)//4])
-            high_freq_energy = np.sum(magnitude[len(magnitude)//4:])
+            low_freq_energy = np.sum(magnitude[:split])
+            high_freq_energy = np.sum(magnitude[split:])
 
             ratio = low_freq_energy / (high_freq_energy + 1e-10)
 
@@ -0,0 +1,255 @@
+"""
+Audio PCM Cache
+Decodes a video's audio track once per job into memory-mapped PCM files
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import logging
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class AudioPCMCache:
+    """
+    Whole-track mono PCM at one or more sample rates, backed by np.memmap
+
+    A single ffmpeg run decodes the track once and writes one raw PCM file per
+    sample rate (16 kHz for Whisper, 22.05 kHz for volume analysis). Segment
+    lookups are zero-copy slices of the memory-mapped files, so per-scene
+    analysis no longer spawns ffmpeg or re-decodes audio from the start.
+    """
+
+    DTYPES = {
+        'float32': ('f32le', np.float32),
+        'int16': ('s16le', np.int16),
+    }
+
+    def __init__(
+        self,
+        video_path: str,
+        sample_rates: Sequence[int] = (16000, 22050),
+        dtype: str = 'float32'
+    ):
+        """
+        Initialize AudioPCMCache
+
+        Args:
+            video_path: Path to video file
+            sample_rates: Sample rates to decode (one PCM file each)
+            dtype: 'float32' (ready for analysis, [-1, 1]) or 'int16' (half the disk)
+        """
+        if dtype not in self.DTYPES:
+            raise ValueError(f"Unsupported PCM dtype: {dtype}")
+
+        self.video_path = video_path
+        self.sample_rates = tuple(sample_rates)
+        self.dtype = dtype
+
+        self.temp_dir: Optional[str] = None
+        self.has_audio = False
+        self._tracks: Dict[int, np.ndarray] = {}
+
+    def load(self) -> bool:
+        """
+        Decode the audio track
+
+        Returns:
+            True if the video has audio and it was decoded
+        """
+        ffmpeg_format, np_dtype = self.DTYPES[self.dtype]
+        self.temp_dir = tempfile.mkdtemp(prefix='moments_audio_')
+
+        cmd = ['ffmpeg', '-v', 'error', '-nostdin', '-i', self.video_path]
+        paths = {}
+        for sr in self.sample_rates:
+            paths[sr] = os.path.join(self.temp_dir, f"audio_{sr}.{ffmpeg_format}")
+            cmd += [
+                '-map', '0:a:0',
+                '-vn',
+                '-ac', '1',
+                '-ar', str(sr),
+                '-f', ffmpeg_format,
+                '-y', paths[sr]
+            ]
+
+        try:
+            subprocess.run(cmd, capture_output=True, check=True, timeout=600)
+        except subprocess.CalledProcessError as e:
+            logger.info(f"No decodable audio track: {e.stderr.decode(errors='ignore').strip()}")
+            self.cleanup()
+            return False
+        except Exception as e:
+            logger.warning(f"Audio decode failed: {e}")
+            self.cleanup()
+            return False
+
+        for sr, path in paths.items():
+            if os.path.getsize(path) == 0:
+                self._tracks[sr] = np.zeros(0, dtype=np_dtype)
+            else:
+                self._tracks[sr] = np.memmap(path, dtype=np_dtype, mode='r')
+
+        self.has_audio = True
+        logger.info(
+            f"Audio decoded once: {self.duration:.1f}s at "
+            f"{', '.join(str(sr) for sr in self.sample_rates)} Hz ({self.dtype})"
+        )
+        return True
+
+    @property
+    def duration(self) -> float:
+        """Track duration in seconds"""
+        if not self._tracks:
+            return 0.0
+        sr, samples = next(iter(self._tracks.items()))
+        return len(samples) / sr
+
+    def supports(self, sample_rate: int) -> bool:
+        return self.has_audio and sample_rate in self._tracks
+
+    def samples(self, sample_rate: int) -> np.ndarray:
+        """Whole track at a sample rate (memory-mapped, read-only)"""
+        if not self.supports(sample_rate):
+            raise KeyError(f"No cached audio at {sample_rate} Hz")
+        return self._tracks[sample_rate]
+
+    def segment(self, start_time: float, end_time: float, sample_rate: int) -> np.ndarray:
+        """
+        Zero-copy slice of the track
+
+        Args:
+            start_time, end_time: Segment boundaries in seconds
+            sample_rate: One of the cached sample rates
+
+        Returns:
+            Read-only view of the samples (raw int16 if the cache dtype is int16)
+        """
+        track = self.samples(sample_rate)
+        start = max(0, int(start_time * sample_rate))
+        end = min(len(track), int(end_time * sample_rate))
+        return track[start:max(start, end)]
+
+    def segment_float(self, start_time: float, end_time: float, sample_rate: int) -> np.ndarray:
+        """Slice as float32 in [-1, 1] (zero-copy for float32 caches)"""
+        audio = self.segment(start_time, end_time, sample_rate)
+        if audio.dtype == np.int16:
+            return audio.astype(np.float32) / 32768.0
+        return audio
+
+    def cleanup(self):
+        """Unmap and delete the PCM files"""
+        self._tracks = {}
+        self.has_audio = False
+        if self.temp_dir and os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.temp_dir = None
+
+    def __enter__(self) -> 'AudioPCMCache':
+        self.load()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cleanup()
+
+
+class PCMStreamReader:
+    """
+    Decodes audio segments from ffmpeg stdout into a reusable buffer
+
+    ffmpeg writes raw mono float32 PCM to a pipe, which is read straight into
+    a bytearray kept between calls (grown only when a longer segment comes
+    along), so per-segment extraction needs no temp WAV, no file read-back
+    and no unlink. The returned arrays are views of that buffer and are only
+    valid until the next read(); use one reader per thread.
+    """
+
+    CHUNK_BYTES = 1 << 16
+
+    def __init__(self, sample_rate: int = 16000, timeout: float = 30.0):
+        """
+        Initialize PCMStreamReader
+
+        Args:
+            sample_rate: Output sample rate (16 kHz is what Whisper expects)
+            timeout: Seconds before a stuck ffmpeg is killed
+        """
+        self.sample_rate = sample_rate
+        self.timeout = timeout
+        self._buffer = bytearray()
+
+    def _reserve(self, size: int, keep: int = 0):
+        """Make the buffer at least `size` bytes, preserving its first `keep` bytes"""
+        if len(self._buffer) < size:
+            # A new bytearray rather than extend(): arrays from an earlier
+            # read() may still export the old one, which blocks resizing
+            buffer = bytearray(size)
+            buffer[:keep] = self._buffer[:keep]
+            self._buffer = buffer
+
+    def read(self, video_path: str, start_time: float, end_time: float) -> Optional[np.ndarray]:
+        """
+        Decode [start_time, end_time) of the first audio stream
+
+        Args:
+            video_path: Path to video file
+            start_time, end_time: Segment boundaries in seconds
+
+        Returns:
+            float32 samples in [-1, 1] (a view of the shared buffer), or None on failure
+        """
+        duration = end_time - start_time
+        if duration <= 0:
+            return np.zeros(0, dtype=np.float32)
+
+        # Exact size plus slack for resampler rounding; grown below if exceeded
+        self._reserve((int(duration * self.sample_rate) + self.sample_rate // 10) * 4)
+
+        # -ss before -i seeks the input instead of decoding from t=0
+        cmd = [
+            'ffmpeg', '-v', 'error', '-nostdin',
+            '-ss', str(start_time),
+            '-i', video_path,
+            '-t', str(duration),
+            '-map', '0:a:0',
+            '-vn',
+            '-ac', '1',
+            '-ar', str(self.sample_rate),
+            '-f', 'f32le',
+            'pipe:1'
+        ]
+
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        except Exception as e:
+            logger.warning(f"Audio extraction failed: {e}")
+            return None
+
+        timer = threading.Timer(self.timeout, proc.kill)
+        timer.start()
+        try:
+            size = 0
+            while True:
+                if size + self.CHUNK_BYTES > len(self._buffer):
+                    self._reserve(len(self._buffer) * 2, keep=size)
+                with memoryview(self._buffer) as view:
+                    n = proc.stdout.readinto(view[size:size + self.CHUNK_BYTES])
+                if not n:
+                    break
+                size += n
+            proc.stdout.close()
+            returncode = proc.wait()
+        finally:
+            timer.cancel()
+
+        if returncode != 0:
+            logger.warning(f"Audio extraction failed (ffmpeg exit code {returncode})")
+            return None
+
+        return np.frombuffer(self._buffer, dtype=np.float32, count=size // 4)
@@ -9,6 +9,9 @@ import logging
 from typing import Dict, List, Tuple, Optional
 import tempfile
 import os
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .audio_cache import AudioPCMCache
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +40,8 @@ class AudioVolumeAnalyzer:
             self.librosa_available = False
             logger.warning("Librosa not available - using basic audio analysis")
 
-    def analyze_segment(self, video_path: str, start_time: float, end_time: float) -> Dict:
+    def analyze_segment(self, video_path: str, start_time: float, end_time: float,
+                        audio_cache: Optional[AudioPCMCache] = None) -> Dict:
         """
         Analyze audio volume features for a video segment
 
@@ -45,15 +49,17 @@ class AudioVolumeAnalyzer:
             video_path: Path to video file
             start_time: Segment start time in seconds
             end_time: Segment end time in seconds
+            audio_cache: Job-wide decoded audio (segment becomes a zero-copy slice)
 
         Returns:
             Dictionary with audio volume features
         """
         # Always use NumPy-based analysis for compatibility
         # Librosa has architecture issues with soxr dependency
-        return self._analyze_with_numpy(video_path, start_time, end_time)
+        return self._analyze_with_numpy(video_path, start_time, end_time, audio_cache)
 
-    def _analyze_with_numpy(self, video_path: str, start_time: float, end_time: float) -> Dict:
+    def _analyze_with_numpy(self, video_path: str, start_time: float, end_time: float,
+                            audio_cache: Optional[AudioPCMCache] = None) -> Dict:
         """
         Pure NumPy-based audio analysis (no librosa dependencies)
 
@@ -69,102 +75,78 @@ class AudioVolumeAnalyzer:
         """
         try:
             # Extract audio segment using ffmpeg (proven working)
-            audio_data = self._extract_audio_segment(video_path, start_time, end_time)
+            audio_data = self._extract_audio_segment(video_path, start_time, end_time, audio_cache)
 
             if audio_data is None or len(audio_data) == 0:
                 return self._empty_analysis()
 
-            y = audio_data
-            sr = self.sample_rate
-
-            # 1. RMS Energy Calculation (frame-based)
-            frame_length = 2048
-            hop_length = 512
-
-            # Calculate RMS for each frame
-            rms_frames = []
-            for i in range(0, len(y) - frame_length, hop_length):
-                frame = y[i:i + frame_length]
-                rms = np.sqrt(np.mean(frame ** 2))
-                rms_frames.append(rms)
-
-            rms = np.array(rms_frames)
-
-            if len(rms) == 0:
-                return self._empty_analysis()
+            return self._analyze_samples(audio_data, self.sample_rate)
 
-            # 2. Simple Onset Detection (peaks in RMS energy)
-            # Find frames with significantly higher energy than neighbors
-            onset_threshold = np.percentile(rms, 75)
-            onset_frames = []
+        except Exception as e:
+            logger.error(f"NumPy audio analysis failed: {e}")
+            return self._empty_analysis()
 
-            for i in range(1, len(rms) - 1):
-                # Peak if higher than both neighbors and above threshold
-                if rms[i] > onset_threshold and rms[i] > rms[i-1] and rms[i] > rms[i+1]:
-                    onset_frames.append(i)
+    def _analyze_samples(self, y: np.ndarray, sr: int,
+                         frame_length: int = 2048, hop_length: int = 512) -> Dict:
+        """
+        Volume features from decoded samples
 
-            # Convert frame indices to time
-            onset_times = [frame_idx * hop_length / sr for frame_idx in onset_frames]
+        Args:
+            y: Samples, mono (n,) or multi-channel (n, channels)
+            sr: Sample rate of y
+            frame_length: Analysis window in samples
+            hop_length: Hop between frames in samples
 
-            # 3. Energy-based Spectral Flux (rate of change in energy)
-            spectral_flux = np.abs(np.diff(rms))
-            if len(spectral_flux) == 0:
-                spectral_flux = np.array([0.0])
+        Returns:
+            Dictionary with audio volume features
+        """
+        # 1. RMS energy and 4. zero crossing rate, one strided pass over the frames
+        rms, zcr = frame_features(y, frame_length, hop_length)
 
-            # 4. Zero Crossing Rate (simple version)
-            # Count sign changes in audio signal
-            zcr_frames = []
-            for i in range(0, len(y) - frame_length, hop_length):
-                frame = y[i:i + frame_length]
-                # Count zero crossings
-                zero_crossings = np.sum(np.abs(np.diff(np.sign(frame)))) / 2
-                zcr = zero_crossings / frame_length
-                zcr_frames.append(zcr)
+        if len(rms) == 0:
+            return self._empty_analysis()
 
-            zcr = np.array(zcr_frames)
+        # 2. Simple onset detection (peaks in RMS energy above the 75th percentile)
+        threshold = np.percentile(rms, 75)
+        onset_frames = pick_peaks(rms, threshold)
+        onset_times = (onset_frames * hop_length / sr).tolist()
 
-            # Calculate statistics
-            rms_mean = float(np.mean(rms))
-            rms_max = float(np.max(rms))
-            rms_std = float(np.std(rms))
-            rms_min = float(np.min(rms))
+        # 3. Energy-based spectral flux (rate of change in energy)
+        spectral_flux = np.abs(np.diff(rms))
+        flux_mean = float(np.mean(spectral_flux)) if len(spectral_flux) > 0 else 0.0
 
-            # Identify volume spikes (above 75th percentile)
-            spike_threshold = np.percentile(rms, 75)
-            spike_frames = np.where(rms > spike_threshold)[0]
+        rms_mean = float(np.mean(rms))
+        rms_max = float(np.max(rms))
+        rms_std = float(np.std(rms))
+        rms_min = float(np.min(rms))
 
-            # Calculate excitement score
-            excitement_score = self._calculate_excitement_score(
-                rms_mean, rms_max, rms_std,
-                len(onset_frames), len(spike_frames),
-                float(np.mean(spectral_flux))
-            )
+        # Volume spikes share the onset threshold
+        num_spikes = int(np.count_nonzero(rms > threshold))
 
-            # Silence detection
-            silence_threshold = 0.01
-            silence_frames = np.sum(rms < silence_threshold)
-            silence_ratio = float(silence_frames / len(rms)) if len(rms) > 0 else 1.0
+        excitement_score = self._calculate_excitement_score(
+            rms_mean, rms_max, rms_std,
+            len(onset_frames), num_spikes,
+            flux_mean
+        )
 
-            return {
-                'volume_mean': rms_mean,
-                'volume_peak': rms_max,
-                'volume_std': rms_std,
-                'num_onsets': len(onset_frames),
-                'onset_times': onset_times,
-                'num_spikes': len(spike_frames),
-                'spike_ratio': float(len(spike_frames) / len(rms)) if len(rms) > 0 else 0.0,
-                'excitement_level': excitement_score,
-                'silence_ratio': silence_ratio,
-                'has_loud_moments': rms_max > 0.3,
-                'has_frequent_events': len(onset_frames) > 3,
-                'audio_dynamic_range': float(rms_max - rms_min),
-                'spectral_flux_mean': float(np.mean(spectral_flux)),
-                'zero_crossing_rate': float(np.mean(zcr)) if len(zcr) > 0 else 0.0
-            }
+        silence_ratio = float(np.count_nonzero(rms < 0.01) / len(rms))
 
-        except Exception as e:
-            logger.error(f"NumPy audio analysis failed: {e}")
-            return self._empty_analysis()
+        return {
+            'volume_mean': rms_mean,
+            'volume_peak': rms_max,
+            'volume_std': rms_std,
+            'num_onsets': len(onset_frames),
+            'onset_times': onset_times,
+            'num_spikes': num_spikes,
+            'spike_ratio': float(num_spikes / len(rms)),
+            'excitement_level': excitement_score,
+            'silence_ratio': silence_ratio,
+            'has_loud_moments': rms_max > 0.3,
+            'has_frequent_events': len(onset_frames) > 3,
+            'audio_dynamic_range': float(rms_max - rms_min),
+            'spectral_flux_mean': flux_mean,
+            'zero_crossing_rate': float(np.mean(zcr))
+        }
 
     def _analyze_with_librosa(self, video_path: str, start_time: float, end_time: float) -> Dict:
         """
@@ -277,57 +259,24 @@ class AudioVolumeAnalyzer:
             if video.audio is None:
                 return self._empty_analysis()
 
-            # Get audio array
+            # Get audio array (frames x channels; framing downmixes)
             audio_array = video.audio.to_soundarray(fps=self.sample_rate)
 
-            # Convert to mono if stereo
-            if len(audio_array.shape) > 1:
-                audio_array = np.mean(audio_array, axis=1)
-
             video.close()
 
-            # Basic RMS calculation
-            rms = np.sqrt(np.mean(audio_array**2))
-            peak = np.max(np.abs(audio_array))
-
-            # Simple spike detection
-            threshold = np.percentile(np.abs(audio_array), 75)
-            spikes = np.sum(np.abs(audio_array) > threshold)
-            spike_ratio = float(spikes / len(audio_array)) if len(audio_array) > 0 else 0.0
-
-            # Silence detection
-            silence_threshold = 0.01
-            silence_ratio = float(np.sum(np.abs(audio_array) < silence_threshold) / len(audio_array))
-
-            # Basic excitement score
-            excitement = min(1.0, rms * 5 + spike_ratio * 0.5)
-
-            return {
-                'volume_mean': float(rms),
-                'volume_peak': float(peak),
-                'volume_std': float(np.std(audio_array)),
-                'num_onsets': 0,  # Not available
-                'onset_times': [],
-                'num_spikes': int(spikes),
-                'spike_ratio': spike_ratio,
-                'excitement_level': float(excitement),
-                'silence_ratio': silence_ratio,
-                'has_loud_moments': peak > 0.3,
-                'has_frequent_events': spike_ratio > 0.2,
-                'audio_dynamic_range': float(peak - np.min(np.abs(audio_array))),
-                'spectral_flux_mean': 0.0,  # Not available
-                'zero_crossing_rate': 0.0   # Not available
-            }
+            return self._analyze_samples(audio_array, self.sample_rate)
 
         except Exception as e:
             logger.error(f"Basic audio analysis failed: {e}")
             return self._empty_analysis()
 
-    def _extract_audio_segment(self, video_path: str, start_time: float, end_time: float) -> Optional[np.ndarray]:
+    def _extract_audio_segment(self, video_path: str, start_time: float, end_time: float,
+                               audio_cache: Optional[AudioPCMCache] = None) -> Optional[np.ndarray]:
         """
         Extract audio segment from video using multiple methods with fallbacks
 
         Priority:
+        0. Slice of the job's decoded audio cache (no decoding at all)
         1. Direct librosa load from video (if supported)
         2. FFmpeg extraction to temp file
         3. MoviePy extraction (fallback)
@@ -336,11 +285,19 @@ class AudioVolumeAnalyzer:
             video_path: Path to video file
             start_time: Start time in seconds
             end_time: End time in seconds
+            audio_cache: Job-wide decoded audio, if available
 
         Returns:
             Audio array or None if extraction fails
         """
 
+        # Method 0: The whole track was already decoded once for this job
+        if audio_cache is not None:
+            if not audio_cache.has_audio:
+                return None
+            if audio_cache.supports(self.sample_rate):
+                return audio_cache.segment_float(start_time, end_time, self.sample_rate)
+
         # Method 1: Try direct librosa load with offset/duration
         if self.librosa_available:
             try:
@@ -392,10 +349,11 @@ class AudioVolumeAnalyzer:
             duration = end_time - start_time
 
             # FFmpeg command to extract audio segment
+            # (-ss before -i seeks the input instead of decoding from t=0)
             command = [
                 'ffmpeg',
-                '-i', video_path,
                 '-ss', str(start_time),
+                '-i', video_path,
                 '-t', str(duration),
                 '-vn',  # No video
                 '-acodec', 'pcm_s16le',  # PCM 16-bit little-endian
@@ -497,8 +455,8 @@ class AudioVolumeAnalyzer:
             logger.error(f"MoviePy audio extraction failed: {e}")
             return None
 
+    @staticmethod
     def _calculate_excitement_score(
-        self,
         rms_mean: float,
         rms_max: float,
         rms_std: float,
@@ -536,22 +494,58 @@ class AudioVolumeAnalyzer:
 
         return float(excitement)
 
-    def detect_exciting_moments(self, video_path: str, duration: float) -> List[Tuple[float, float]]:
+    def build_timeline(self, video_path: str,
+                       audio_cache: Optional[AudioPCMCache] = None) -> Optional['AudioFeatureTimeline']:
+        """
+        Compute frame-level features for the whole audio track once
+
+        Args:
+            video_path: Path to video file
+            audio_cache: Job-wide decoded audio (decoded here if not given)
+
+        Returns:
+            AudioFeatureTimeline, or None if the video has no audio
+        """
+        owns_cache = audio_cache is None or not audio_cache.supports(self.sample_rate)
+        if owns_cache:
+            audio_cache = AudioPCMCache(video_path, sample_rates=(self.sample_rate,))
+            audio_cache.load()
+
+        try:
+            if not audio_cache.has_audio:
+                return None
+
+            timeline = AudioFeatureTimeline(audio_cache.samples(self.sample_rate), self.sample_rate)
+            logger.info(f"Audio feature timeline: {timeline.num_frames} frames")
+            return timeline
+
+        except Exception as e:
+            logger.error(f"Audio timeline computation failed: {e}")
+            return None
+
+        finally:
+            if owns_cache:
+                audio_cache.cleanup()
+
+    def detect_exciting_moments(self, video_path: str, duration: float,
+                                timeline: Optional['AudioFeatureTimeline'] = None) -> List[Tuple[float, float]]:
         """
         Detect exciting audio moments in entire video
 
         Args:
             video_path: Path to video file
             duration: Total video duration in seconds
+            timeline: Precomputed feature timeline (built here if not given)
 
         Returns:
             List of (start_time, end_time) tuples for exciting moments
         """
-        if not self.librosa_available:
-            logger.warning("Librosa not available - cannot detect exciting moments")
-            return []
-
         try:
+            if timeline is None:
+                timeline = self.build_timeline(video_path)
+            if timeline is None:
+                return []
+
             # Analyze in 5-second chunks
             chunk_duration = 5.0
             exciting_moments = []
@@ -560,7 +554,7 @@ class AudioVolumeAnalyzer:
             while current_time < duration:
                 end_time = min(current_time + chunk_duration, duration)
 
-                analysis = self.analyze_segment(video_path, current_time, end_time)
+                analysis = timeline.analyze_segment(current_time, end_time)
 
                 # Mark as exciting if excitement level > 0.6
                 if analysis['excitement_level'] > 0.6:
@@ -574,7 +568,8 @@ class AudioVolumeAnalyzer:
             logger.error(f"Exciting moment detection failed: {e}")
             return []
 
-    def _empty_analysis(self) -> Dict:
+    @staticmethod
+    def _empty_analysis() -> Dict:
         """
         Return empty analysis structure when audio is unavailable
         """
@@ -594,3 +589,214 @@ class AudioVolumeAnalyzer:
             'spectral_flux_mean': 0.0,
             'zero_crossing_rate': 0.0
         }
+
+
+def frame_features(y: np.ndarray, frame_length: int = 2048, hop_length: int = 512,
+                   chunk_frames: int = 256) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Frame-level RMS and zero-crossing rate
+
+    Frames are strided views of the signal (no copies); work is done in
+    chunks of frames, in float32 with int8 signs, so the temporaries of one
+    step stay around 2 MB whatever the track length.
+    Frame positions match range(0, len(y) - frame_length, hop_length).
+
+    Args:
+        y: Samples, mono (n,) or multi-channel (n, channels); channels are averaged
+        frame_length: Analysis window in samples
+        hop_length: Hop between frames in samples (any positive value)
+        chunk_frames: Frames processed per vectorized step
+
+    Returns:
+        (rms, zcr) float32 arrays with one value per frame
+    """
+    if hop_length < 1:
+        raise ValueError(f"Invalid hop length: {hop_length}")
+
+    if y.ndim > 1:
+        y = y.mean(axis=1, dtype=np.float32) if y.shape[1] > 1 else y[:, 0]
+
+    num_frames = len(range(0, len(y) - frame_length, hop_length))
+    rms = np.zeros(num_frames, dtype=np.float32)
+    zcr = np.zeros(num_frames, dtype=np.float32)
+
+    if num_frames == 0:
+        return rms, zcr
+
+    frames = sliding_window_view(y, frame_length)[::hop_length][:num_frames]
+
+    for start in range(0, num_frames, chunk_frames):
+        chunk = frames[start:start + chunk_frames].astype(np.float32, copy=False)
+
+        # Sum of squares accumulated in float64, one value per frame
+        energy = np.einsum('ij,ij->i', chunk, chunk, dtype=np.float64)
+        rms[start:start + len(chunk)] = np.sqrt(energy / frame_length)
+
+        # Sign changes inside each frame (|diff(sign)| / 2)
+        sign = (chunk > 0).view(np.int8) - (chunk < 0).view(np.int8)
+        crossings = np.abs(np.diff(sign, axis=1)).sum(axis=1, dtype=np.int32) / 2
+        zcr[start:start + len(chunk)] = crossings / frame_length
+
+    return rms, zcr
+
+
+def pick_peaks(x: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    Indices of strict local maxima above a threshold
+
+    The first and last elements are never peaks (they lack a neighbour).
+    """
+    if len(x) < 3:
+        return np.zeros(0, dtype=np.intp)
+
+    interior = x[1:-1]
+    is_peak = (interior > threshold) & (interior > x[:-2]) & (interior > x[2:])
+    return np.flatnonzero(is_peak) + 1
+
+
+class AudioFeatureTimeline:
+    """
+    Frame-level audio features for a whole track, queried per segment without recomputation
+
+    RMS, zero-crossing rate, spectral flux and silence are computed once
+    (hop 512, frame 2048). Sums and counts are stored as prefix sums, two lookups per segment; range max/min combine
+    per-block extremes with the partial blocks at the segment's ends, which
+    reads about 1/64 of the segment's frames. Storage stays linear in the
+    frame count (under 10 MB per hour of audio).
+
+    Onset and spike thresholds are the 75th percentile of each segment's own
+    frames, as in a per-segment analysis. A percentile is not
+    prefix-summable, so those two counts scan the segment's RMS frames.
+    """
+
+    SILENCE_THRESHOLD = 0.01
+    BLOCK_FRAMES = 64  # Frames per block of the range max/min tables
+
+    def __init__(self, y: np.ndarray, sample_rate: int, frame_length: int = 2048, hop_length: int = 512):
+        """
+        Initialize AudioFeatureTimeline
+
+        Args:
+            y: Mono audio samples for the whole track
+            sample_rate: Sample rate of y
+            frame_length: Analysis window in samples
+            hop_length: Hop between frames in samples
+        """
+        self.sample_rate = sample_rate
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+
+        rms, zcr = frame_features(y, frame_length, hop_length)
+        self.num_frames = len(rms)
+
+        if self.num_frames == 0:
+            return
+
+        flux = np.abs(np.diff(rms))
+
+        self._rms_sum = self._prefix_sum(rms)
+        self._rms_sq_sum = self._prefix_sum(rms.astype(np.float64) ** 2)
+        self._zcr_sum = self._prefix_sum(zcr)
+        self._flux_sum = self._prefix_sum(flux)
+        self._silence_count = self._prefix_count(rms < self.SILENCE_THRESHOLD)
+
+        self._rms = rms
+        block_starts = np.arange(0, self.num_frames, self.BLOCK_FRAMES)
+        self._block_max = np.maximum.reduceat(rms, block_starts)
+        self._block_min = np.minimum.reduceat(rms, block_starts)
+
+    @staticmethod
+    def _prefix_sum(x: np.ndarray) -> np.ndarray:
+        out = np.zeros(len(x) + 1, dtype=np.float64)
+        np.cumsum(x, out=out[1:])
+        return out
+
+    @staticmethod
+    def _prefix_count(flags: np.ndarray) -> np.ndarray:
+        out = np.zeros(len(flags) + 1, dtype=np.int32)
+        np.cumsum(flags, out=out[1:])
+        return out
+
+    def _range_extreme(self, blocks: np.ndarray, op, lo: int, hi: int) -> float:
+        """op over rms[lo:hi]: whole blocks from the block table, partial blocks from the frames"""
+        first = -(-lo // self.BLOCK_FRAMES)  # First block starting at or after lo
+        last = hi // self.BLOCK_FRAMES       # Block containing hi (exclusive)
+
+        if first >= last:
+            return float(op.reduce(self._rms[lo:hi]))
+
+        parts = [blocks[first:last]]
+        if lo < first * self.BLOCK_FRAMES:
+            parts.append(self._rms[lo:first * self.BLOCK_FRAMES])
+        if last * self.BLOCK_FRAMES < hi:
+            parts.append(self._rms[last * self.BLOCK_FRAMES:hi])
+        return float(op.reduce([op.reduce(part) for part in parts]))
+
+    def frame_range(self, start_time: float, end_time: float) -> Tuple[int, int]:
+        """Indices [lo, hi) of frames lying entirely inside the segment"""
+        if self.num_frames == 0:
+            return 0, 0
+        lo = int(np.ceil(start_time * self.sample_rate / self.hop_length))
+        hi = int(np.floor((end_time * self.sample_rate - self.frame_length) / self.hop_length)) + 1
+        lo = min(max(lo, 0), self.num_frames)
+        hi = min(max(hi, lo), self.num_frames)
+        return lo, hi
+
+    def analyze_segment(self, start_time: float, end_time: float) -> Dict:
+        """
+        Audio volume features for a segment, shaped like AudioVolumeAnalyzer.analyze_segment
+
+        Args:
+            start_time, end_time: Segment boundaries in seconds
+
+        Returns:
+            Dictionary with audio volume features
+        """
+        lo, hi = self.frame_range(start_time, end_time)
+        count = hi - lo
+
+        if count <= 0:
+            return AudioVolumeAnalyzer._empty_analysis()
+
+        rms_mean = (self._rms_sum[hi] - self._rms_sum[lo]) / count
+        rms_sq_mean = (self._rms_sq_sum[hi] - self._rms_sq_sum[lo]) / count
+        rms_std = float(np.sqrt(max(rms_sq_mean - rms_mean ** 2, 0.0)))
+        rms_max = self._range_extreme(self._block_max, np.maximum, lo, hi)
+        rms_min = self._range_extreme(self._block_min, np.minimum, lo, hi)
+
+        # Flux between consecutive frames inside the segment
+        flux_mean = (self._flux_sum[hi - 1] - self._flux_sum[lo]) / (count - 1) if count > 1 else 0.0
+
+        # Onsets (peaks above the segment's 75th percentile) and spikes share one threshold
+        segment = self._rms[lo:hi]
+        threshold = np.percentile(segment, 75)
+        onset_frames = pick_peaks(segment, threshold)
+        num_onsets = len(onset_frames)
+        onset_times = (onset_frames * self.hop_length / self.sample_rate).tolist()
+
+        num_spikes = int(np.count_nonzero(segment > threshold))
+        silence_ratio = float((self._silence_count[hi] - self._silence_count[lo]) / count)
+        zcr_mean = float((self._zcr_sum[hi] - self._zcr_sum[lo]) / count)
+
+        excitement_score = AudioVolumeAnalyzer._calculate_excitement_score(
+            rms_mean, rms_max, rms_std,
+            num_onsets, num_spikes,
+            flux_mean
+        )
+
+        return {
+            'volume_mean': float(rms_mean),
+            'volume_peak': rms_max,
+            'volume_std': rms_std,
+            'num_onsets': num_onsets,
+            'onset_times': onset_times,
+            'num_spikes': num_spikes,
+            'spike_ratio': float(num_spikes / count),
+            'excitement_level': excitement_score,
+            'silence_ratio': silence_ratio,
+            'has_loud_moments': rms_max > 0.3,
+            'has_frequent_events': num_onsets > 3,
+            'audio_dynamic_range': float(rms_max - rms_min),
+            'spectral_flux_mean': float(flux_mean),
+            'zero_crossing_rate': zcr_mean
+        }
@@ -0,0 +1,203 @@
+"""
+Chunked Scene Detection
+Splits scene detection over processes on keyframe-aligned chunks and reconciles the cuts
+"""
+
+import shutil
+import subprocess
+import logging
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from .frame_sampler import FrameSampler, FrameSchedule
+from .frame_source import FrameRequest, prepare_frame
+
+logger = logging.getLogger(__name__)
+
+
+def probe_keyframes(video_path: str, timeout: float = 120.0) -> List[float]:
+    """
+    Keyframe timestamps of the first video stream, read from packet flags
+
+    Only the container index is read (no decoding), so this is fast even for
+    multi-hour files.
+
+    Returns:
+        Sorted timestamps in seconds ([] if ffprobe is unavailable or fails)
+    """
+    if shutil.which('ffprobe') is None:
+        return []
+
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'packet=pts_time,flags',
+        '-of', 'csv=p=0',
+        video_path
+    ]
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=timeout)
+    except Exception as e:
+        logger.warning(f"Keyframe probe failed: {e}")
+        return []
+
+    keyframes = []
+    for line in result.stdout.splitlines():
+        pts, _, flags = line.partition(',')
+        if 'K' in flags and pts not in ('', 'N/A'):
+            keyframes.append(float(pts))
+
+    return sorted(keyframes)
+
+
+def plan_chunks(duration: float, n_chunks: int,
+                keyframes: Optional[Sequence[float]] = None) -> List[Tuple[float, float]]:
+    """
+    Split [0, duration) into contiguous chunks
+
+    Boundaries start evenly spaced and are snapped to the nearest keyframe,
+    so each worker starts decoding at a keyframe instead of decoding from an
+    earlier one just to reach its chunk.
+
+    Args:
+        duration: Video duration in seconds
+        n_chunks: Chunks wanted
+        keyframes: Keyframe timestamps (None/empty = keep the even split)
+    """
+    boundaries = []
+    for i in range(1, n_chunks):
+        t = duration * i / n_chunks
+        if keyframes:
+            idx = int(np.argmin(np.abs(np.asarray(keyframes) - t)))
+            t = keyframes[idx]
+        if 0 < t < duration and (not boundaries or t > boundaries[-1]):
+            boundaries.append(t)
+
+    edges = [0.0] + boundaries + [duration]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+class AbsoluteSchedule:
+    """
+    A schedule evaluated on absolute frame indices
+
+    FrameSampler passes indices relative to its first frame; a chunk that
+    starts at `start_frame` would otherwise sample a different grid than a
+    whole-video pass.
+    """
+
+    def __init__(self, schedule: FrameSchedule, start_frame: int):
+        self.schedule = schedule
+        self.start_frame = start_frame
+
+    def wants(self, frame_idx: int, fps: float) -> bool:
+        return self.schedule.wants(frame_idx + self.start_frame, fps)
+
+
+def frame_diff_candidates(video_path: str, start: float, end: float,
+                          request: FrameRequest, threshold: float = 30.0,
+                          overlap: Optional[float] = None) -> List[float]:
+    """
+    Timestamps in [start, end) where consecutive samples differ by more than threshold
+
+    Decoding starts `overlap` seconds early (one sampling interval by
+    default) so the first sample of the chunk has a predecessor. Samples sit
+    on the same absolute grid as a whole-video pass, so the candidates of all
+    chunks together equal the single-pass candidates exactly.
+    """
+    interval = request.interval if request.interval is not None else 1.0
+    scan_start = max(0.0, start - (overlap if overlap is not None else interval))
+
+    sampler = FrameSampler.for_segment(video_path, request.schedule, scan_start, end)
+    sampler.schedule = AbsoluteSchedule(request.schedule, sampler.start_frame)
+
+    candidates = []
+    prev_frame = None
+    for frame_idx, timestamp, frame in sampler:
+        frame = prepare_frame(frame, request)
+        if prev_frame is not None and timestamp >= start:
+            if np.mean(cv2.absdiff(prev_frame, frame)) > threshold:
+                candidates.append(timestamp)
+        prev_frame = frame
+
+    return candidates
+
+
+def adaptive_detector_cuts(video_path: str, start: float, end: float,
+                           adaptive_threshold: float = 3.0, min_scene_len: int = 15,
+                           overlap: float = 5.0) -> List[float]:
+    """
+    PySceneDetect AdaptiveDetector cuts in [start, end)
+
+    The detector runs from `overlap` seconds before the chunk to `overlap`
+    seconds after it, so its rolling window is warmed up at the chunk start
+    and has look-ahead at the chunk end.
+    """
+    from scenedetect import open_video, SceneManager, AdaptiveDetector
+
+    video = open_video(video_path)
+    scan_start = max(0.0, start - overlap)
+    if scan_start > 0:
+        video.seek(scan_start)
+
+    manager = SceneManager()
+    manager.add_detector(AdaptiveDetector(adaptive_threshold=adaptive_threshold, min_scene_len=min_scene_len))
+    manager.detect_scenes(video, end_time=end + overlap)
+
+    return [
+        cut.get_seconds() for cut in manager.get_cut_list()
+        if start <= cut.get_seconds() < end
+    ]
+
+
+def merge_cuts(chunk_cuts: Sequence[Sequence[float]], tolerance: float = 0.0,
+               min_gap: float = 0.0) -> List[float]:
+    """
+    Reconcile per-chunk cut lists
+
+    Each chunk only reports cuts inside its own range, but a cut right at a
+    boundary can be reported by both neighbors with slightly different
+    timestamps; cuts within `tolerance` of the previous one are merged, and
+    cuts closer than `min_gap` to the previous kept cut are dropped.
+    """
+    merged: List[float] = []
+    for cut in sorted(c for cuts in chunk_cuts for c in cuts):
+        if merged and cut - merged[-1] <= max(tolerance, min_gap):
+            continue
+        merged.append(cut)
+    return merged
+
+
+def cuts_to_scenes(cuts: Sequence[float], duration: float) -> List[Tuple[float, float]]:
+    """(start, end) scenes between consecutive cuts, covering [0, duration)"""
+    edges = [0.0] + [c for c in cuts if 0 < c < duration] + [duration]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def detect_chunked(video_path: str, duration: float, task: Callable, executor,
+                   min_chunk_seconds: float = 120.0) -> Optional[List[List[float]]]:
+    """
+    Run a per-chunk detector over keyframe-aligned chunks in a worker pool
+
+    Args:
+        video_path: Video to scan
+        duration: Its duration in seconds
+        task: Picklable task(video_path, start, end) -> cuts inside [start, end)
+        executor: parallel_analysis.SceneExecutor
+        min_chunk_seconds: Shortest chunk worth a process of its own
+
+    Returns:
+        One cut list per chunk in time order, or None if the video is too
+        short to split (the caller runs a single pass)
+    """
+    n_chunks = min(executor.workers * executor.chunks_per_worker, int(duration // min_chunk_seconds))
+    if n_chunks < 2:
+        return None
+
+    chunks = plan_chunks(duration, n_chunks, probe_keyframes(video_path))
+    logger.info(f"⚡ Scene detection: {len(chunks)} chunks on {executor.workers} workers")
+
+    return executor.map(task, video_path, chunks)
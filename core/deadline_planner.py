@@ -0,0 +1,196 @@
+"""
+Deadline Planner
+Chooses analysis stages and sample rates so a job finishes within a time budget
+"""
+
+import time
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Processing seconds per second of source video (CPU, 1080p source); the
+# 'ai_scene' cost is per second of analyzed scene and 'composition' per
+# second of output. Per-sample costs shrink with the plan's sample_scale.
+DEFAULT_STAGE_COSTS = {
+    'analysis_proxy': 0.08,
+    'frame_decode_proxy': 0.02,
+    'frame_decode_original': 0.10,
+    'frame_samples': 0.02,
+    'audio': 0.01,
+    'ai_scene': 0.40,
+    'diversity': 0.005,
+    'composition': 0.30,
+}
+
+
+@dataclass
+class ProcessingPlan:
+    """Stages and sample rates chosen for a job"""
+    analysis_proxy: bool = True
+    frame_pass: bool = True
+    sample_scale: int = 1  # Multiplies frame sampling intervals (1 = configured rates)
+    audio: bool = True
+    diversity: bool = True
+    skipped_stages: List[str] = field(default_factory=list)
+
+
+class DeadlinePlanner:
+    """
+    Plans a job against a deadline and tracks the remaining budget
+
+    Stages are planned in pipeline order from per-stage cost estimates,
+    always reserving time for the final composition so a highlight is
+    produced by the deadline. Cheap stages are planned up front; AI
+    analysis is admitted scene by scene (best candidates first) while
+    time remains, with its cost estimate updated from measured scenes.
+    """
+
+    SAMPLE_SCALES = (1, 2, 4)
+
+    def __init__(self, deadline: float, costs: Optional[Dict[str, float]] = None,
+                 safety: float = 0.85):
+        """
+        Initialize DeadlinePlanner
+
+        Args:
+            deadline: Seconds the whole job may take, from now (0 = already spent:
+                      every optional stage is skipped)
+            costs: Overrides for DEFAULT_STAGE_COSTS
+            safety: Fraction of the deadline the plan may use (the rest absorbs estimate error)
+        """
+        if deadline < 0:
+            raise ValueError(f"Invalid deadline: {deadline}")
+
+        self.deadline = deadline
+        self.costs = dict(DEFAULT_STAGE_COSTS)
+        self.costs.update(costs or {})
+        self.safety = safety
+
+        self.started = time.monotonic()
+        self.skipped_stages: List[str] = []
+        self.ai_scenes_done = 0
+        self.ai_seconds_done = 0.0
+        self.ai_elapsed = 0.0
+        self.diversity_reserve = 0.0
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining(self) -> float:
+        """Seconds left in the usable (safety-scaled) budget"""
+        return self.deadline * self.safety - self.elapsed()
+
+    def composition_reserve(self, target_duration: float) -> float:
+        return target_duration * self.costs['composition']
+
+    def frame_pass_cost(self, duration: float, proxy: bool, sample_scale: int) -> float:
+        decode = self.costs['frame_decode_proxy' if proxy else 'frame_decode_original']
+        return duration * (decode + self.costs['frame_samples'] / sample_scale)
+
+    def plan(self, duration: float, target_duration: float,
+             analysis_proxy: bool = True, diversity: bool = True) -> ProcessingPlan:
+        """
+        Choose stages for a video
+
+        Args:
+            duration: Source duration in seconds
+            target_duration: Highlight length in seconds (sizes the composition reserve)
+            analysis_proxy: Whether the config asks for an analysis proxy
+            diversity: Whether diversity scoring is available
+
+        Returns:
+            ProcessingPlan; skipped stages are also recorded on the planner
+        """
+        plan = ProcessingPlan(analysis_proxy=analysis_proxy, diversity=diversity)
+        budget = self.remaining() - self.composition_reserve(target_duration)
+
+        # Audio is cheap and feeds every score; keep it whenever possible
+        audio_cost = duration * self.costs['audio']
+        if audio_cost <= budget:
+            budget -= audio_cost
+        else:
+            plan.audio = False
+
+        # Frame pass: prefer proxy + full sample rates, then coarser sampling, then the original
+        options = []
+        for scale in self.SAMPLE_SCALES:
+            if analysis_proxy:
+                options.append((True, scale, duration * self.costs['analysis_proxy'] +
+                                self.frame_pass_cost(duration, True, scale)))
+            options.append((False, scale, self.frame_pass_cost(duration, False, scale)))
+
+        for proxy, scale, cost in options:
+            if cost <= budget:
+                plan.analysis_proxy = proxy
+                plan.sample_scale = scale
+                budget -= cost
+                break
+        else:
+            plan.frame_pass = False
+            plan.analysis_proxy = False
+
+        diversity_cost = duration * self.costs['diversity']
+        if plan.diversity and (not plan.frame_pass or diversity_cost > budget):
+            plan.diversity = False
+
+        if analysis_proxy and not plan.analysis_proxy:
+            plan.skipped_stages.append('analysis_proxy')
+        if not plan.frame_pass:
+            plan.skipped_stages.append('scene_detection')
+            plan.skipped_stages.append('motion')
+        elif plan.sample_scale > 1:
+            plan.skipped_stages.append('full_rate_sampling')
+        if not plan.audio:
+            plan.skipped_stages.append('audio')
+        if diversity and not plan.diversity:
+            plan.skipped_stages.append('diversity')
+
+        self.skipped_stages.extend(plan.skipped_stages)
+
+        logger.info(
+            f"⏱️ Deadline plan ({self.deadline:.0f}s): proxy={plan.analysis_proxy}, "
+            f"frames={plan.frame_pass} (x{plan.sample_scale}), audio={plan.audio}, "
+            f"diversity={plan.diversity}"
+        )
+
+        return plan
+
+    def ai_scene_cost(self, scene_duration: float) -> float:
+        """Estimated AI cost of a scene, learned from scenes already analyzed"""
+        if self.ai_seconds_done > 0:
+            return scene_duration * self.ai_elapsed / self.ai_seconds_done
+        return scene_duration * self.costs['ai_scene']
+
+    def can_afford_ai(self, scene_duration: float, target_duration: float) -> bool:
+        """Whether another scene's AI analysis fits before the composition reserve"""
+        reserve = self.composition_reserve(target_duration) + self.diversity_reserve
+        return self.ai_scene_cost(scene_duration) <= self.remaining() - reserve
+
+    def record_ai_scene(self, scene_duration: float, elapsed: float):
+        """Update the AI cost estimate with a measured scene"""
+        self.ai_scenes_done += 1
+        self.ai_seconds_done += scene_duration
+        self.ai_elapsed += elapsed
+
+    def reserve_diversity(self, duration: float):
+        """Hold back time for diversity scoring after AI analysis"""
+        self.diversity_reserve = duration * self.costs['diversity']
+
+    def skip(self, stage: str):
+        """Record a stage dropped at run time"""
+        if stage not in self.skipped_stages:
+            self.skipped_stages.append(stage)
+            logger.info(f"⏱️ Deadline: skipping {stage}")
+
+    def report(self) -> Dict:
+        """Summary for job metadata"""
+        return {
+            'deadline': self.deadline,
+            'elapsed': self.elapsed(),
+            'met': self.elapsed() <= self.deadline,
+            'ai_scenes_analyzed': self.ai_scenes_done,
+            'skipped_stages': list(self.skipped_stages)
+        }
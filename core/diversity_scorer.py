@@ -7,9 +7,12 @@ Uses perceptual hashing and histogram comparison
 import cv2
 import numpy as np
 import logging
-from typing import List, Dict, Tuple
+import bisect
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
+from .frame_source import FrameConsumer, FrameRequest
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,6 +24,39 @@ class FrameSample:
     frame: np.ndarray
 
 
+class ThumbnailConsumer(FrameConsumer):
+    """
+    Keeps one small thumbnail per second from a shared decode pass
+
+    Lets diversity scoring pick representative frames without seeking
+    back into the video once highlights have been selected.
+    """
+
+    # 1 frame per second; small frames keep a 30 minute video under 40 MB
+    request = FrameRequest(interval=1.0, size=(96, 72))
+
+    def __init__(self):
+        self.timestamps: List[float] = []
+        self.frames: List[np.ndarray] = []
+
+    def consume(self, frame_idx: int, timestamp: float, frame: np.ndarray):
+        self.timestamps.append(timestamp)
+        self.frames.append(frame)
+
+    def nearest(self, timestamp: float) -> Optional[np.ndarray]:
+        """Return the thumbnail closest to a timestamp"""
+        if not self.frames:
+            return None
+
+        idx = bisect.bisect_left(self.timestamps, timestamp)
+        if idx == len(self.timestamps) or (
+            idx > 0 and timestamp - self.timestamps[idx - 1] < self.timestamps[idx] - timestamp
+        ):
+            idx -= 1
+
+        return self.frames[idx]
+
+
 class DiversityScorer:
     """
     Measures visual diversity between video segments to avoid repetitive content
@@ -52,7 +88,8 @@ class DiversityScorer:
     def calculate_diversity_penalty(
         self,
         video_path: str,
-        selected_segments: List[Dict]
+        selected_segments: List[Dict],
+        thumbnails: Optional[ThumbnailConsumer] = None
     ) -> List[Dict]:
         """
         Calculate diversity penalty for selected segments
@@ -60,6 +97,7 @@ class DiversityScorer:
         Args:
             video_path: Path to video file
             selected_segments: List of segment dictionaries with 'start' and 'end' times
+            thumbnails: Thumbnails from a shared decode pass (avoids reopening the video)
 
         Returns:
             Updated segments with 'diversity_penalty' field added
@@ -71,7 +109,9 @@ class DiversityScorer:
             return selected_segments
 
         # Extract representative frames from each segment
-        frame_samples = self._extract_representative_frames(video_path, selected_segments)
+        frame_samples = self._extract_representative_frames(
+            video_path, selected_segments, thumbnails
+        )
 
         # Calculate pairwise similarities
         similarities = self._calculate_pairwise_similarities(frame_samples)
@@ -154,7 +194,8 @@ class DiversityScorer:
     def _extract_representative_frames(
         self,
         video_path: str,
-        segments: List[Dict]
+        segments: List[Dict],
+        thumbnails: Optional[ThumbnailConsumer] = None
     ) -> List[FrameSample]:
         """
         Extract one representative frame from each segment
@@ -162,10 +203,22 @@ class DiversityScorer:
         Args:
             video_path: Path to video file
             segments: List of segments
+            thumbnails: Thumbnails from a shared decode pass, used instead of seeking
 
         Returns:
             List of FrameSample objects
         """
+        if thumbnails is not None and thumbnails.frames:
+            frame_samples = []
+            for i, segment in enumerate(segments):
+                mid_time = (segment['start'] + segment['end']) / 2
+                frame_samples.append(FrameSample(
+                    segment_index=i,
+                    timestamp=mid_time,
+                    frame=thumbnails.nearest(mid_time)
+                ))
+            return frame_samples
+
         cap = cv2.VideoCapture(video_path)
         fps = cap.get(cv2.CAP_PROP_FPS)
 
@@ -0,0 +1,166 @@
+"""
+Face Tracker
+Propagates YuNet detections between detection frames with sparse optical flow
+"""
+
+import cv2
+import numpy as np
+import logging
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def box_iou(a: np.ndarray, b: np.ndarray) -> float:
+    """Intersection over union of two [x, y, w, h, ...] boxes"""
+    ax2, ay2 = a[0] + a[2], a[1] + a[3]
+    bx2, by2 = b[0] + b[2], b[1] + b[3]
+
+    iw = max(0.0, min(ax2, bx2) - max(a[0], b[0]))
+    ih = max(0.0, min(ay2, by2) - max(a[1], b[1]))
+    inter = iw * ih
+    union = a[2] * a[3] + b[2] * b[3] - inter
+
+    return float(inter / union) if union > 0 else 0.0
+
+
+class FaceTracker:
+    """
+    Detect-then-track bookkeeping for face detections
+
+    On detection frames, new detections are matched to existing tracks by
+    IoU (greedy, best overlap first) so a face keeps its track ID across the
+    video. Between detection frames, each track is moved by the median
+    Lucas-Kanade displacement of its five landmarks and box center. Tracks
+    whose points are lost are dropped until the next detection.
+
+    Faces use YuNet's layout: [x, y, w, h, 10 landmark coordinates, score].
+    """
+
+    # Lucas-Kanade parameters: small window, 3 pyramid levels
+    LK_PARAMS = dict(
+        winSize=(15, 15),
+        maxLevel=3,
+        criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03)
+    )
+
+    def __init__(self, iou_threshold: float = 0.3, max_side: Optional[int] = 640, min_points: int = 3):
+        """
+        Initialize FaceTracker
+
+        Args:
+            iou_threshold: Minimum IoU to continue a track at a detection frame
+            max_side: Optical flow runs on a copy downscaled to this long side
+            min_points: Points that must be tracked for a track to survive
+        """
+        self.iou_threshold = iou_threshold
+        self.max_side = max_side
+        self.min_points = min_points
+
+        self.tracks: List[Tuple[int, np.ndarray]] = []
+        self.next_id = 0
+        self.prev_gray: Optional[np.ndarray] = None
+        self.scale = 1.0
+
+    def _prepare(self, frame: np.ndarray) -> np.ndarray:
+        """Grayscale, downscaled copy of a frame for optical flow"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        h, w = gray.shape[:2]
+
+        self.scale = 1.0
+        if self.max_side and max(h, w) > self.max_side:
+            self.scale = self.max_side / max(h, w)
+            gray = cv2.resize(gray, (round(w * self.scale), round(h * self.scale)),
+                              interpolation=cv2.INTER_AREA)
+
+        return gray
+
+    def update(self, frame: np.ndarray, faces=None) -> List[Tuple[int, np.ndarray]]:
+        """
+        Advance the tracker by one sampled frame
+
+        Args:
+            frame: Current frame (BGR or grayscale)
+            faces: Fresh detections for this frame, or None to propagate tracks
+
+        Returns:
+            List of (track_id, face) for the faces present in the frame
+        """
+        gray = self._prepare(frame)
+
+        if faces is not None:
+            self.tracks = self._match(faces)
+        elif self.tracks and self.prev_gray is not None and self.prev_gray.shape == gray.shape:
+            self.tracks = self._propagate(self.prev_gray, gray, frame.shape[:2])
+        else:
+            self.tracks = []
+
+        self.prev_gray = gray
+        return list(self.tracks)
+
+    def _match(self, faces) -> List[Tuple[int, np.ndarray]]:
+        """Assign track IDs to detections, continuing the best-overlapping tracks"""
+        pairs = []
+        for ti, (_, track_face) in enumerate(self.tracks):
+            for fi, face in enumerate(faces):
+                iou = box_iou(track_face, face)
+                if iou >= self.iou_threshold:
+                    pairs.append((iou, ti, fi))
+
+        assigned = {}
+        used_tracks = set()
+        for _, ti, fi in sorted(pairs, reverse=True):
+            if ti in used_tracks or fi in assigned:
+                continue
+            assigned[fi] = self.tracks[ti][0]
+            used_tracks.add(ti)
+
+        tracks = []
+        for fi, face in enumerate(faces):
+            track_id = assigned.get(fi)
+            if track_id is None:
+                track_id = self.next_id
+                self.next_id += 1
+            tracks.append((track_id, np.array(face, dtype=np.float32)))
+
+        return tracks
+
+    def _points(self, face: np.ndarray) -> np.ndarray:
+        """Five landmarks and the box center, in flow (downscaled) coordinates"""
+        landmarks = face[4:14].reshape(5, 2)
+        center = np.array([[face[0] + face[2] / 2, face[1] + face[3] / 2]], dtype=np.float32)
+        return (np.vstack([landmarks, center]) * self.scale).astype(np.float32)
+
+    def _propagate(self, prev_gray: np.ndarray, gray: np.ndarray,
+                   frame_shape: Tuple[int, int]) -> List[Tuple[int, np.ndarray]]:
+        """Move every track by the median optical-flow displacement of its points"""
+        points = np.vstack([self._points(face) for _, face in self.tracks]).reshape(-1, 1, 2)
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(prev_gray, gray, points, None, **self.LK_PARAMS)
+
+        points = points.reshape(len(self.tracks), -1, 2)
+        moved = moved.reshape(len(self.tracks), -1, 2)
+        status = status.reshape(len(self.tracks), -1).astype(bool)
+
+        height, width = frame_shape
+        tracks = []
+
+        for (track_id, face), p0, p1, ok in zip(self.tracks, points, moved, status):
+            if ok.sum() < self.min_points:
+                continue
+
+            dx, dy = np.median(p1[ok] - p0[ok], axis=0) / self.scale
+
+            face = face.copy()
+            face[0] += dx
+            face[1] += dy
+            face[4:14:2] += dx  # landmark x coordinates
+            face[5:14:2] += dy  # landmark y coordinates
+
+            # Drop tracks whose center left the frame
+            cx, cy = face[0] + face[2] / 2, face[1] + face[3] / 2
+            if not (0 <= cx < width and 0 <= cy < height):
+                continue
+
+            tracks.append((track_id, face))
+
+        return tracks
@@ -0,0 +1,187 @@
+"""
+FFmpeg Frame Source
+Streams frames from an ffmpeg rawvideo pipe, scaled and sampled inside ffmpeg
+"""
+
+import cv2
+import subprocess
+import numpy as np
+import logging
+from typing import Iterator, Optional, Tuple
+
+from .frame_sampler import FrameSchedule
+
+logger = logging.getLogger(__name__)
+
+
+class FFmpegFrameSource:
+    """
+    Frame source backed by `ffmpeg -f rawvideo` on stdout
+
+    ffmpeg selects, scales and converts frames inside its threaded decoder, so
+    Python only ever sees analysis-resolution pixels. Frames are read with
+    readinto() into two preallocated buffers that are reused for the whole
+    stream; a yielded frame stays valid until two more frames have been read,
+    which is enough for consecutive-frame comparisons. Copy a frame to keep it
+    longer.
+
+    Yields (frame_idx, timestamp, frame) tuples like FrameSampler, with frame
+    indices and timestamps expressed in the source video's frame numbering.
+    """
+
+    def __init__(
+        self,
+        video_path: str,
+        schedule: FrameSchedule,
+        size: Optional[Tuple[int, int]] = None,
+        grayscale: bool = True,
+        start_time: float = 0.0,
+        end_time: Optional[float] = None
+    ):
+        """
+        Initialize FFmpegFrameSource
+
+        Args:
+            video_path: Path to video file
+            schedule: Mapped to an ffmpeg select expression that mirrors
+                      FrameSchedule.wants, so labels match FrameSampler
+            size: Output (width, height), None = native resolution
+            grayscale: Output gray (1 byte/pixel) instead of bgr24
+            start_time: Segment start in seconds
+            end_time: Segment end in seconds (None = end of video)
+        """
+        self.video_path = video_path
+        self.schedule = schedule
+        self.grayscale = grayscale
+
+        # Source geometry and frame rate for index/timestamp mapping
+        cap = cv2.VideoCapture(video_path)
+        self.fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        native_size = (
+            int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        )
+        cap.release()
+
+        self.size = size or native_size
+        self.start_frame = int(start_time * self.fps)
+        self.end_frame = int(end_time * self.fps) if end_time is not None else None
+        self.frames_read = 0
+
+        width, height = self.size
+        self.shape = (height, width) if grayscale else (height, width, 3)
+        self.frame_bytes = int(np.prod(self.shape))
+
+        self.process = None
+
+    def _build_filter(self) -> str:
+        """Build the -vf chain: sampling, then scaling, then pixel format"""
+        filters = []
+
+        if self.schedule.interval is not None or self.schedule.stride > 1 or self.schedule.lead:
+            terms = '+'.join(self._sample_expr(k) for k in range(self.schedule.lead + 1))
+            filters.append(f"select='{terms}'")
+
+        filters.append(f"scale={self.size[0]}:{self.size[1]}")
+        filters.append(f"format={'gray' if self.grayscale else 'bgr24'}")
+
+        return ','.join(filters)
+
+    def _sample_expr(self, k: int) -> str:
+        """select expression for FrameSchedule.is_sample(n + k), n = frame number after the seek"""
+        if self.schedule.stride is not None:
+            return f"not(mod(n+{k}\\,{self.schedule.stride}))"
+
+        # First frame of each interval bucket, with the same arithmetic and epsilon
+        # as is_sample; the fps filter would instead pick the frame nearest each
+        # output slot, about half an interval later than the label
+        bucket = f"floor((n+{k})/{self.fps!r}/{self.schedule.interval!r}+1e-9)"
+        prev_bucket = f"floor((n+{k}-1)/{self.fps!r}/{self.schedule.interval!r}+1e-9)"
+        return f"(eq(n+{k}\\,0)+gt({bucket}\\,{prev_bucket}))"
+
+    def _build_command(self) -> list:
+        cmd = ['ffmpeg', '-v', 'error', '-nostdin']
+
+        if self.start_frame > 0:
+            # Input seeking: jump to the nearest keyframe, then decode forward
+            cmd += ['-ss', f"{self.start_frame / self.fps:.6f}"]
+
+        cmd += ['-i', self.video_path]
+
+        if self.end_frame is not None:
+            cmd += ['-frames:v', str(self._max_output_frames())]
+
+        cmd += [
+            '-an', '-sn',
+            '-vf', self._build_filter(),
+            '-vsync', 'passthrough',
+            '-f', 'rawvideo',
+            'pipe:1'
+        ]
+
+        return cmd
+
+    def _max_output_frames(self) -> int:
+        """Number of output frames that fall inside [start_frame, end_frame)"""
+        return sum(1 for _ in self._source_indices())
+
+    def _source_indices(self) -> Iterator[int]:
+        """Source frame index of each output frame, in output order"""
+        n = 0
+        while self.end_frame is None or self.start_frame + n < self.end_frame:
+            if self.schedule.wants(n, self.fps):
+                yield self.start_frame + n
+            n += 1
+
+    def __iter__(self) -> Iterator[Tuple[int, float, np.ndarray]]:
+        buffers = [bytearray(self.frame_bytes) for _ in range(2)]
+        frames = [np.frombuffer(buf, dtype=np.uint8).reshape(self.shape) for buf in buffers]
+
+        self.process = subprocess.Popen(
+            self._build_command(),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0
+        )
+
+        try:
+            for i, frame_idx in enumerate(self._source_indices()):
+                slot = i % 2
+                if not self._read_frame(buffers[slot]):
+                    break
+
+                self.frames_read += 1
+                yield frame_idx, frame_idx / self.fps, frames[slot]
+        finally:
+            self.close()
+
+    def _read_frame(self, buffer: bytearray) -> bool:
+        """Fill a buffer with exactly one frame from the pipe"""
+        view = memoryview(buffer)
+        filled = 0
+
+        while filled < self.frame_bytes:
+            n = self.process.stdout.readinto(view[filled:])
+            if not n:
+                return False
+            filled += n
+
+        return True
+
+    def close(self):
+        """Stop ffmpeg and release the pipe"""
+        if self.process is None:
+            return
+
+        self.process.stdout.close()
+        if self.process.poll() is None:
+            self.process.terminate()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+        if self.process.returncode not in (0, None, -15):
+            logger.debug(f"ffmpeg frame source exited with code {self.process.returncode}")
+
+        self.process = None
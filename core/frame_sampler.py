@@ -0,0 +1,170 @@
+"""
+Frame Sampler
+Walks a video with grab() and only retrieves the frames a schedule asks for
+"""
+
+import cv2
+import math
+import numpy as np
+import logging
+from typing import Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class FrameSchedule:
+    """
+    Decides which frames a FrameSampler retrieves
+
+    Frame indices passed to `wants` are relative to the first frame the
+    sampler visits, so a stride of 10 starting at frame 95 yields 95, 105, ...
+    """
+
+    def __init__(self, stride: Optional[int] = None, interval: Optional[float] = None, lead: int = 0):
+        """
+        Initialize FrameSchedule
+
+        Args:
+            stride: Retrieve every Nth frame (exact-stride schedule)
+            interval: Retrieve the first frame of every `interval` seconds (time-based schedule)
+            lead: Also retrieve the N frames preceding each sample (for frame-pair comparisons)
+        """
+        if (stride is None) == (interval is None):
+            raise ValueError("Specify exactly one of stride or interval")
+        if stride is not None and stride < 1:
+            raise ValueError(f"Invalid frame stride: {stride}")
+        if interval is not None and interval <= 0:
+            raise ValueError(f"Invalid sampling interval: {interval}")
+
+        self.stride = stride
+        self.interval = interval
+        self.lead = lead
+
+    @classmethod
+    def every(cls, stride: int, lead: int = 0) -> 'FrameSchedule':
+        """Exact-stride schedule: every Nth frame"""
+        return cls(stride=stride, lead=lead)
+
+    @classmethod
+    def every_seconds(cls, interval: float, lead: int = 0) -> 'FrameSchedule':
+        """Time-based schedule: one frame per `interval` seconds, independent of FPS"""
+        return cls(interval=interval, lead=lead)
+
+    @staticmethod
+    def union(schedules: List['FrameSchedule']) -> 'UnionSchedule':
+        """Schedule that wants a frame if any of the given schedules does"""
+        return UnionSchedule(schedules)
+
+    def is_sample(self, frame_idx: int, fps: float) -> bool:
+        """Whether a frame is one of the schedule's samples"""
+        if frame_idx < 0:
+            return False
+
+        if self.stride is not None:
+            return frame_idx % self.stride == 0
+
+        if frame_idx == 0:
+            return True
+
+        # First frame of each interval bucket (epsilon absorbs float error in idx / fps)
+        bucket = math.floor(frame_idx / fps / self.interval + 1e-9)
+        prev_bucket = math.floor((frame_idx - 1) / fps / self.interval + 1e-9)
+        return bucket != prev_bucket
+
+    def wants(self, frame_idx: int, fps: float) -> bool:
+        """Whether a frame must be retrieved (a sample or one of its lead frames)"""
+        return any(self.is_sample(frame_idx + k, fps) for k in range(self.lead + 1))
+
+
+class UnionSchedule:
+    """Combination of several schedules, used when one pass serves many consumers"""
+
+    def __init__(self, schedules: List[FrameSchedule]):
+        self.schedules = schedules
+
+    def wants(self, frame_idx: int, fps: float) -> bool:
+        return any(schedule.wants(frame_idx, fps) for schedule in self.schedules)
+
+
+class FrameSampler:
+    """
+    Iterate over the frames of a video that a schedule asks for
+
+    Frames outside the schedule are skipped with grab(), which advances the
+    decoder without converting the frame to a BGR array. Only scheduled frames
+    pay for retrieve().
+
+    Yields (frame_idx, timestamp, frame) tuples. Usable as a context manager;
+    the capture is released when iteration finishes.
+    """
+
+    def __init__(self, video_path: str, schedule, start_frame: int = 0, end_frame: Optional[int] = None):
+        """
+        Initialize FrameSampler
+
+        Args:
+            video_path: Path to video file
+            schedule: FrameSchedule (or UnionSchedule) selecting frames to retrieve
+            start_frame: First frame to visit (seeks if > 0)
+            end_frame: Stop before this frame (None = end of video)
+        """
+        self.video_path = video_path
+        self.schedule = schedule
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+
+        self.cap = cv2.VideoCapture(video_path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Could not open video: {video_path}")
+
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.frames_visited = 0
+        self.frames_retrieved = 0
+
+        if start_frame > 0:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+
+    @classmethod
+    def for_segment(cls, video_path: str, schedule, start_time: float,
+                    end_time: Optional[float] = None) -> 'FrameSampler':
+        """Create a sampler covering [start_time, end_time) in seconds"""
+        sampler = cls(video_path, schedule)
+        sampler.start_frame = int(start_time * sampler.fps)
+        sampler.end_frame = int(end_time * sampler.fps) if end_time is not None else None
+        if sampler.start_frame > 0:
+            sampler.cap.set(cv2.CAP_PROP_POS_FRAMES, sampler.start_frame)
+        return sampler
+
+    def __iter__(self) -> Iterator[Tuple[int, float, np.ndarray]]:
+        frame_idx = self.start_frame
+
+        try:
+            while self.end_frame is None or frame_idx < self.end_frame:
+                if not self.cap.grab():
+                    break
+
+                self.frames_visited += 1
+
+                if self.schedule.wants(frame_idx - self.start_frame, self.fps):
+                    ret, frame = self.cap.retrieve()
+                    if not ret:
+                        break
+
+                    self.frames_retrieved += 1
+                    yield frame_idx, frame_idx / self.fps, frame
+
+                frame_idx += 1
+        finally:
+            self.release()
+
+    def release(self):
+        """Release the underlying capture"""
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+    def __enter__(self) -> 'FrameSampler':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
@@ -0,0 +1,287 @@
+"""
+Shared Frame Source
+Decodes a video once, in order, and fans sampled frames out to registered analyzers
+"""
+
+import cv2
+import numpy as np
+import queue
+import threading
+import logging
+from typing import Dict, Iterator, List, Optional, Tuple
+from dataclasses import dataclass
+
+from .frame_sampler import FrameSampler, FrameSchedule
+from .ffmpeg_frame_source import FFmpegFrameSource
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FrameRequest:
+    """Sampling requirements declared by a frame consumer"""
+    stride: int = 1                          # Deliver every Nth frame
+    interval: Optional[float] = None         # Or one frame per N seconds (overrides stride)
+    size: Optional[Tuple[int, int]] = None   # (width, height), None = native resolution
+    grayscale: bool = False
+    lead: int = 0                            # Also deliver the N frames before each sample
+
+    @property
+    def schedule(self) -> FrameSchedule:
+        if self.interval is not None:
+            return FrameSchedule.every_seconds(self.interval, lead=self.lead)
+        return FrameSchedule.every(self.stride, lead=self.lead)
+
+
+FRAME_BACKENDS = ('opencv', 'ffmpeg')
+
+
+def iter_frames(
+    video_path: str,
+    request: FrameRequest,
+    start_time: float = 0.0,
+    end_time: Optional[float] = None,
+    backend: str = 'opencv'
+) -> Iterator[Tuple[int, float, np.ndarray]]:
+    """
+    Iterate over the frames a single request asks for, already in its variant
+
+    Args:
+        video_path: Path to video file
+        request: Sampling, size and color requirements
+        start_time, end_time: Segment boundaries in seconds (end None = end of video)
+        backend: 'opencv' (grab()/retrieve() + cv2 resize) or 'ffmpeg'
+                 (rawvideo pipe, scaled and sampled inside ffmpeg)
+
+    Yields:
+        (frame_idx, timestamp, frame) tuples. With the ffmpeg backend frames live in
+        reused buffers and stay valid for one further iteration only.
+    """
+    if backend not in FRAME_BACKENDS:
+        raise ValueError(f"Unknown frame backend: {backend}")
+
+    if backend == 'ffmpeg':
+        yield from FFmpegFrameSource(
+            video_path,
+            request.schedule,
+            size=request.size,
+            grayscale=request.grayscale,
+            start_time=start_time,
+            end_time=end_time
+        )
+        return
+
+    sampler = FrameSampler.for_segment(video_path, request.schedule, start_time, end_time)
+
+    for frame_idx, timestamp, frame in sampler:
+        yield frame_idx, timestamp, prepare_frame(frame, request)
+
+
+def prepare_frame(frame: np.ndarray, request: FrameRequest) -> np.ndarray:
+    """Convert a decoded BGR frame to the requested variant"""
+    if request.grayscale:
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    if request.size is not None:
+        frame = cv2.resize(frame, request.size)
+    return frame
+
+
+class FrameConsumer:
+    """
+    Base class for analyzers fed by SharedFrameDecoder
+
+    Subclasses set `request` to declare the frames they need and implement
+    `consume`, which is called once per sampled frame in decode order.
+    Frames may be shared between consumers and must not be modified in place.
+    """
+
+    request: FrameRequest = FrameRequest()
+
+    def consume(self, frame_idx: int, timestamp: float, frame: np.ndarray):
+        raise NotImplementedError
+
+    def finish(self):
+        """Called once after the last frame has been delivered"""
+        pass
+
+
+class _ConsumerThread(threading.Thread):
+    """Feeds one consumer from a bounded queue and tracks how far it got"""
+
+    def __init__(self, consumer: FrameConsumer, queue_size: int):
+        super().__init__(name=f"consumer-{type(consumer).__name__}", daemon=True)
+        self.consumer = consumer
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.error: Optional[Exception] = None
+        self.progress = float('-inf')  # Timestamp of the last frame consumed
+        self.condition = threading.Condition()
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            if self.error is not None:
+                continue  # Keep draining so the decoder never blocks on a dead consumer
+            try:
+                self.consumer.consume(*item)
+            except Exception as e:
+                logger.error(f"{type(self.consumer).__name__} failed: {e}")
+                self.error = e
+            self._advance(item[1])
+
+        if self.error is None:
+            try:
+                self.consumer.finish()
+            except Exception as e:
+                self.error = e
+        self._advance(float('inf'))
+
+    def _advance(self, timestamp: float):
+        with self.condition:
+            self.progress = timestamp
+            self.condition.notify_all()
+
+
+class SharedFrameDecoder:
+    """
+    Single-pass video decoder
+
+    Walks the video once from the first frame to the last with a FrameSampler.
+    Frames nobody asked for are skipped with grab(), and each requested
+    (size, grayscale) variant is produced at most once per frame no matter how
+    many consumers share it.
+
+    With a `queue_size`, decoding and analysis are pipelined: a decoder
+    thread puts frames on one bounded queue per consumer and each consumer
+    runs in its own thread. A full queue blocks the decoder (backpressure),
+    so at most `queue_size` frames per consumer are in flight however long
+    the video is. OpenCV releases the GIL while decoding and analyzing, so
+    the stages overlap on separate cores.
+    """
+
+    def __init__(self, video_path: str, queue_size: Optional[int] = None):
+        """
+        Initialize SharedFrameDecoder
+
+        Args:
+            video_path: Path to video file
+            queue_size: Frames buffered per consumer in pipelined mode (None = decode and
+                        analyze in the calling thread)
+        """
+        self.video_path = video_path
+        self.queue_size = queue_size
+        self.consumers: List[FrameConsumer] = []
+        self.fps = 0.0
+        self.frames_decoded = 0
+
+        self._threads: Dict[int, _ConsumerThread] = {}
+        self._decoder_thread: Optional[threading.Thread] = None
+        self._decoder_error: Optional[Exception] = None
+
+    def register(self, consumer: FrameConsumer) -> FrameConsumer:
+        """Register a consumer and return it for convenience"""
+        consumer.request.schedule  # Validates stride/interval
+        self.consumers.append(consumer)
+        return consumer
+
+    def _decode(self, deliver) -> int:
+        """Walk the video, calling deliver(consumer_index, frame_idx, timestamp, frame)"""
+        schedules = [consumer.request.schedule for consumer in self.consumers]
+        sampler = FrameSampler(self.video_path, FrameSchedule.union(schedules))
+        self.fps = sampler.fps
+
+        for frame_idx, timestamp, frame in sampler:
+            variants: Dict[Tuple, np.ndarray] = {}
+
+            for i, (consumer, schedule) in enumerate(zip(self.consumers, schedules)):
+                if not schedule.wants(frame_idx, self.fps):
+                    continue
+
+                key = (consumer.request.size, consumer.request.grayscale)
+                if key not in variants:
+                    variants[key] = prepare_frame(frame, consumer.request)
+                deliver(i, frame_idx, timestamp, variants[key])
+
+        self.frames_decoded = sampler.frames_retrieved
+
+        logger.info(
+            f"Shared decode: walked {sampler.frames_visited} frames, decoded {self.frames_decoded} "
+            f"for {len(self.consumers)} consumers"
+        )
+
+        return sampler.frames_visited
+
+    def run(self) -> int:
+        """
+        Decode the video and deliver frames to all registered consumers
+
+        Returns:
+            Number of frames decoded (pipelined) or walked (in-thread)
+        """
+        if self.queue_size:
+            self.start()
+            self.join()
+            return self.frames_decoded
+
+        frames_visited = self._decode(
+            lambda i, frame_idx, timestamp, frame: self.consumers[i].consume(frame_idx, timestamp, frame)
+        )
+
+        for consumer in self.consumers:
+            consumer.finish()
+
+        return frames_visited
+
+    def start(self):
+        """Start the decoder and consumer threads (pipelined mode)"""
+        if not self.queue_size:
+            raise ValueError("start() needs a queue_size")
+
+        self._threads = {
+            i: _ConsumerThread(consumer, self.queue_size)
+            for i, consumer in enumerate(self.consumers)
+        }
+        for thread in self._threads.values():
+            thread.start()
+
+        self._decoder_thread = threading.Thread(target=self._decode_pipelined, name='decoder', daemon=True)
+        self._decoder_thread.start()
+
+    def _decode_pipelined(self):
+        try:
+            self._decode(lambda i, *item: self._threads[i].queue.put(item))
+        except Exception as e:
+            logger.error(f"Shared decode failed: {e}")
+            self._decoder_error = e
+        finally:
+            for thread in self._threads.values():
+                thread.queue.put(None)
+
+    def done(self) -> bool:
+        """Whether decoding and every consumer have finished"""
+        return all(not t.is_alive() for t in [self._decoder_thread, *self._threads.values()] if t)
+
+    def wait_for(self, consumer: FrameConsumer, timestamp: float, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a consumer has seen every frame before `timestamp`
+
+        Returns:
+            False if the timeout expired first
+        """
+        thread = next(t for t in self._threads.values() if t.consumer is consumer)
+        with thread.condition:
+            return thread.condition.wait_for(lambda: thread.progress >= timestamp, timeout)
+
+    def join(self):
+        """Wait for the pipeline to drain; re-raises the first decoder or consumer error"""
+        if self._decoder_thread is not None:
+            self._decoder_thread.join()
+        for thread in self._threads.values():
+            thread.join()
+
+        if self._decoder_error is not None:
+            raise self._decoder_error
+        for thread in self._threads.values():
+            if thread.error is not None:
+                raise thread.error
@@ -0,0 +1,313 @@
+"""
+Hierarchical Scene Detection
+Coarse low-rate pass with an adaptive threshold, then a binary search for each exact cut frame
+
+The coarse pass still walks every frame (OpenCV's grab() and ffmpeg both
+decode frames they do not return); what it saves is converting, resizing and
+comparing them. Each bisection step seeks, which decodes forward from the
+preceding keyframe.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from .chunked_scene_detection import AbsoluteSchedule
+from .frame_sampler import FrameSampler
+from .frame_source import FrameRequest, iter_frames, prepare_frame
+
+logger = logging.getLogger(__name__)
+
+
+# Coarse pass: two small grayscale samples per second
+COARSE_REQUEST = FrameRequest(interval=0.5, size=(80, 60), grayscale=True)
+
+
+def adaptive_cut_indices(diffs: Sequence[float], min_threshold: float = 10.0,
+                         ratio: float = 3.0, window: int = 4) -> List[int]:
+    """
+    Indices of differences that stand out from their neighborhood
+
+    A difference is a cut if it exceeds `min_threshold` and `ratio` times the
+    median of the `window` differences on each side of it. Sustained motion
+    raises the local median, so it does not produce cuts, while a cut in a
+    static shot is caught below the old fixed threshold.
+
+    Args:
+        diffs: Mean absolute differences between consecutive coarse samples
+        min_threshold: Floor below which nothing is a cut
+        ratio: How far above the local median a cut must be
+        window: Neighbors on each side used for the local median
+    """
+    return [i for i in range(len(diffs)) if is_adaptive_cut(diffs, i, min_threshold, ratio, window)]
+
+
+def is_adaptive_cut(diffs: Sequence[float], i: int, min_threshold: float = 10.0,
+                    ratio: float = 3.0, window: int = 4) -> bool:
+    """Whether diffs[i] is a cut by the rule of adaptive_cut_indices (neighbors past the ends are ignored)"""
+    diff = diffs[i]
+    if diff <= min_threshold:
+        return False
+    neighbors = list(diffs[max(0, i - window):i]) + list(diffs[i + 1:i + 1 + window])
+    return not neighbors or diff > ratio * float(np.median(neighbors))
+
+
+class AdaptiveCutStream:
+    """
+    adaptive_cut_indices over coarse samples that arrive one at a time
+
+    A span is decided once the `window` differences after it are known, so
+    it sees the same neighborhood as in a whole-video pass; finish() decides
+    the last few with the neighbors that exist. The spans therefore equal the
+    ones detect_coarse_to_fine flags on the same samples.
+    """
+
+    def __init__(self, min_threshold: float = 10.0, ratio: float = 3.0, window: int = 4):
+        self.min_threshold = min_threshold
+        self.ratio = ratio
+        self.window = window
+        self.timestamps: List[float] = []
+        self.diffs: List[float] = []
+        self._prev: Optional[np.ndarray] = None
+        self._decided = 0
+
+    def push(self, timestamp: float, frame: np.ndarray) -> List[Tuple[float, float]]:
+        """Add a coarse sample; returns the (start, end) spans decided to hold a cut"""
+        if self._prev is not None:
+            self.diffs.append(float(np.mean(cv2.absdiff(self._prev, frame))))
+        self.timestamps.append(timestamp)
+        self._prev = frame
+        return self._decide(len(self.diffs) - self.window)
+
+    def finish(self) -> List[Tuple[float, float]]:
+        """Decide the spans still waiting for later samples"""
+        return self._decide(len(self.diffs))
+
+    def _decide(self, upto: int) -> List[Tuple[float, float]]:
+        spans = []
+        while self._decided < upto:
+            i = self._decided
+            if is_adaptive_cut(self.diffs, i, self.min_threshold, self.ratio, self.window):
+                spans.append((self.timestamps[i], self.timestamps[i + 1]))
+            self._decided += 1
+        return spans
+
+
+class FrameProbe:
+    """
+    Random access to single frames by index, in a request's variant
+
+    Frames are cached, so the endpoints shared by successive bisection
+    steps are decoded once. `frames_decoded` counts seeks that returned a
+    frame.
+    """
+
+    def __init__(self, video_path: str, request: FrameRequest):
+        self.cap = cv2.VideoCapture(video_path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Could not open video: {video_path}")
+
+        self.request = request
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.frames_decoded = 0
+        self._cache: Dict[int, np.ndarray] = {}
+
+    def frame(self, frame_idx: int) -> Optional[np.ndarray]:
+        if frame_idx not in self._cache:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+            ret, frame = self.cap.read()
+            if not ret:
+                return None
+            self.frames_decoded += 1
+            self._cache[frame_idx] = prepare_frame(frame, self.request)
+        return self._cache[frame_idx]
+
+    def diff(self, a: int, b: int) -> Optional[float]:
+        frame_a, frame_b = self.frame(a), self.frame(b)
+        if frame_a is None or frame_b is None:
+            return None
+        return float(np.mean(cv2.absdiff(frame_a, frame_b)))
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+            self._cache.clear()
+
+    def __enter__(self) -> 'FrameProbe':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def bisect_cut(probe: FrameProbe, lo: int, hi: int) -> int:
+    """
+    First frame of the new shot between frames lo and hi
+
+    The interval is halved toward the side whose endpoints differ more, so
+    a cut is located in about log2(hi - lo) frame lookups (each a seek that
+    decodes from the preceding keyframe). For a gradual transition this
+    converges on its steepest step.
+
+    Returns:
+        Frame index in (lo, hi]
+    """
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        left, right = probe.diff(lo, mid), probe.diff(mid, hi)
+        if left is None or right is None:
+            break
+        if right >= left:
+            lo = mid
+        else:
+            hi = mid
+    return hi
+
+
+def climb_to_peak(probe: FrameProbe, cut: int, lo: int, hi: int) -> int:
+    """
+    Move a cut to the neighboring frame whose step difference is larger, until it is a local peak
+
+    Bisection assumes a single change inside the span; this makes sure the
+    returned frame is where consecutive frames differ most, not a point on
+    the slope of a nearby change.
+    """
+    def step(i: int) -> float:
+        d = probe.diff(i - 1, i) if lo < i <= hi else None
+        return d if d is not None else -1.0
+
+    here = step(cut)
+    while True:
+        left, right = step(cut - 1), step(cut + 1)
+        if max(left, right) <= here:
+            return cut
+        if right >= left:
+            cut, here = cut + 1, right
+        else:
+            cut, here = cut - 1, left
+
+
+def locate_cut(probe: FrameProbe, lo: int, hi: int, threshold: float) -> Optional[int]:
+    """
+    Frame-accurate cut inside frames lo..hi, or None if the span holds no cut
+
+    The span's endpoints must differ by more than `threshold`. If they do
+    not (the coarse samples were misplaced), the span is widened by its own
+    length on each side and checked once more before giving up.
+    """
+    width = hi - lo
+    last = probe.frame_count - 1 if probe.frame_count > 0 else hi
+
+    diff = probe.diff(lo, hi)
+    if diff is None or diff <= threshold:
+        lo, hi = max(0, lo - width), min(last, hi + width)
+        diff = probe.diff(lo, hi)
+        if diff is None or diff <= threshold:
+            return None
+
+    return climb_to_peak(probe, bisect_cut(probe, lo, hi), lo, hi)
+
+
+def refine_cuts(video_path: str, spans: Sequence[Tuple[float, float]],
+                size: Tuple[int, int] = (160, 120), threshold: float = 10.0) -> List[float]:
+    """
+    Exact cut times inside coarse spans flagged as containing a cut
+
+    Args:
+        video_path: Video the spans belong to
+        spans: (start, end) times of the coarse samples on either side of each cut
+        size: Resolution the frames are compared at
+        threshold: Endpoint difference a span needs to count as holding a cut
+
+    Returns:
+        Sorted frame-accurate cut timestamps (spans without a confirmed cut are dropped)
+    """
+    cuts = set()
+    with FrameProbe(video_path, FrameRequest(size=size, grayscale=True)) as probe:
+        for start, end in spans:
+            cut = locate_cut(probe, round(start * probe.fps), round(end * probe.fps), threshold)
+            if cut is not None:
+                cuts.add(cut / probe.fps)
+
+        logger.info(
+            f"🔎 Refined {len(cuts)} of {len(spans)} spans with {probe.frames_decoded} decoded frames"
+        )
+
+    return sorted(cuts)
+
+
+def coarse_differences(frames: Iterable[Tuple[int, float, np.ndarray]]) -> Tuple[List[float], List[float]]:
+    """Sample timestamps and the differences between consecutive samples (diffs[i]: samples i, i + 1)"""
+    timestamps: List[float] = []
+    diffs: List[float] = []
+
+    prev = None
+    for frame_idx, timestamp, frame in frames:
+        if prev is not None:
+            diffs.append(float(np.mean(cv2.absdiff(prev, frame))))
+        timestamps.append(timestamp)
+        prev = frame
+
+    return timestamps, diffs
+
+
+def detect_coarse_to_fine(video_path: str, backend: str = 'opencv',
+                          coarse: FrameRequest = COARSE_REQUEST,
+                          fine_size: Tuple[int, int] = (160, 120),
+                          min_threshold: float = 10.0, ratio: float = 3.0,
+                          window: int = 4) -> List[float]:
+    """
+    Frame-accurate cut timestamps from a coarse pass plus per-cut bisection
+
+    Args:
+        video_path: Video to scan
+        backend: Frame backend for the coarse pass ('opencv' or 'ffmpeg')
+        coarse: Sampling of the coarse pass
+        fine_size: Resolution the bisection compares frames at
+        min_threshold, ratio, window: See adaptive_cut_indices
+
+    Returns:
+        Sorted cut timestamps in seconds
+    """
+    timestamps, diffs = coarse_differences(iter_frames(video_path, coarse, backend=backend))
+
+    spans = [
+        (timestamps[i], timestamps[i + 1])
+        for i in adaptive_cut_indices(diffs, min_threshold=min_threshold, ratio=ratio, window=window)
+    ]
+    logger.info(f"🔎 Coarse pass: {len(timestamps)} samples, {len(spans)} spans with a cut")
+
+    return refine_cuts(video_path, spans, size=fine_size, threshold=min_threshold) if spans else []
+
+
+def coarse_to_fine_chunk(video_path: str, start: float, end: float,
+                         coarse: FrameRequest = COARSE_REQUEST,
+                         fine_size: Tuple[int, int] = (160, 120),
+                         min_threshold: float = 10.0, ratio: float = 3.0,
+                         window: int = 4) -> List[float]:
+    """
+    detect_coarse_to_fine restricted to cuts whose coarse span ends in [start, end)
+
+    Samples sit on the same absolute grid as a whole-video pass, and the scan
+    reaches `window` + 1 intervals past each side of the chunk, so every
+    flagged span sees the same neighbors as in the single pass. The cuts of
+    all chunks together therefore equal the single-pass cuts (OpenCV backend).
+    """
+    margin = (window + 1) * coarse.interval
+    with FrameSampler.for_segment(video_path, coarse.schedule, max(0.0, start - margin), end + margin) as sampler:
+        sampler.schedule = AbsoluteSchedule(coarse.schedule, sampler.start_frame)
+        timestamps, diffs = coarse_differences(
+            (frame_idx, timestamp, prepare_frame(frame, coarse)) for frame_idx, timestamp, frame in sampler
+        )
+
+    spans = [
+        (timestamps[i], timestamps[i + 1])
+        for i in adaptive_cut_indices(diffs, min_threshold=min_threshold, ratio=ratio, window=window)
+        if start <= timestamps[i + 1] < end
+    ]
+
+    return refine_cuts(video_path, spans, size=fine_size, threshold=min_threshold) if spans else []
@@ -0,0 +1,225 @@
+"""
+Keyword Matcher
+Token-level Aho-Corasick matching of weighted keywords and phrases in transcripts
+"""
+
+import os
+import re
+import json
+import threading
+import unicodedata
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# category -> {phrase: weight}; phrases may span several words
+DEFAULT_KEYWORDS: Dict[str, Dict[str, float]] = {
+    'excitement': {
+        'yes': 1.0, 'yeah': 1.0, 'wow': 1.0, 'amazing': 1.0, 'awesome': 1.0,
+        'goal': 1.0, 'beautiful': 1.0, 'love': 1.0, 'happy': 1.0, 'birthday': 1.0,
+        'congratulations': 1.0, 'surprise': 1.0, 'yay': 1.0, 'woohoo': 1.0,
+        'nice': 1.0, 'incredible': 1.0, 'perfect': 1.0, 'fantastic': 1.0,
+        'excellent': 1.0, 'wonderful': 1.0, 'spectacular': 1.0, 'outstanding': 1.0,
+        'happy birthday': 2.0, 'oh my god': 1.5, 'oh my gosh': 1.5,
+        'let\'s go': 1.5, 'no way': 1.0, 'well done': 1.0, 'i love you': 2.0,
+    },
+    'laughter': {
+        'laugh': 1.0, 'laughs': 1.0, 'laughing': 1.0, 'laughter': 1.0,
+        'haha': 1.0, 'hehe': 1.0, 'lol': 1.0,
+    },
+    'intensity': {
+        'very': 1.0, 'really': 1.0, 'so': 1.0, 'super': 1.0,
+        'extremely': 1.0, 'totally': 1.0,
+    },
+}
+
+# Directory searched for '<locale>.json' dictionaries (same layout as DEFAULT_KEYWORDS)
+KEYWORD_DIR = os.path.join(os.path.dirname(__file__), 'keywords')
+
+_TOKEN_RE = re.compile(r"[\w']+")
+_REPEAT_RE = re.compile(r'(.)\1{2,}')          # "wooow" -> "wow", "yesss" -> "yes"
+_LAUGH_RE = re.compile(r'^(ha|he|hi)(?:\1)+h?$')  # "hahaha" -> "haha"
+
+
+def normalize_token(token: str) -> str:
+    """Case-fold, strip accents and squash elongated spellings of one word"""
+    token = unicodedata.normalize('NFKD', token.casefold())
+    token = ''.join(c for c in token if not unicodedata.combining(c))
+    token = token.replace('’', "'").strip("'")
+    token = _REPEAT_RE.sub(r'\1', token)
+    laugh = _LAUGH_RE.match(token)
+    if laugh:
+        token = laugh.group(1) * 2
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalized word tokens of a text (punctuation dropped)"""
+    tokens = []
+    for raw in _TOKEN_RE.findall(text.replace('’', "'")):
+        token = normalize_token(raw)
+        if token:
+            tokens.append(token)
+    return tokens
+
+
+@dataclass
+class KeywordMatch:
+    """One phrase occurrence; start/end are token indices (end exclusive)"""
+    phrase: str
+    category: str
+    weight: float
+    start: int
+    end: int
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over word tokens
+
+    Phrases are normalized into token sequences and compiled into a trie
+    with failure links, so a transcript is matched in one pass whose cost
+    depends on its length and the number of matches, not on the size of
+    the dictionary. Matching works on whole tokens: "so" never matches
+    inside "also", and "wow!" matches "wow".
+    """
+
+    def __init__(self, keywords: Dict[str, Dict[str, float]]):
+        """
+        Compile a matcher
+
+        Args:
+            keywords: category -> {phrase: weight}
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[int]] = [[]]
+        self._patterns: List[Tuple[str, str, float, int]] = []  # (phrase, category, weight, length)
+
+        for category, phrases in keywords.items():
+            for phrase, weight in phrases.items():
+                self._add(phrase, category, float(weight))
+
+        self._build_failure_links()
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def _add(self, phrase: str, category: str, weight: float):
+        tokens = tokenize(phrase)
+        if not tokens:
+            return
+
+        node = 0
+        for token in tokens:
+            nxt = self._goto[node].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][token] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            node = nxt
+
+        self._outputs[node].append(len(self._patterns))
+        self._patterns.append((' '.join(tokens), category, weight, len(tokens)))
+
+    def _build_failure_links(self):
+        """Breadth-first failure links; each node inherits its fallback's outputs"""
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                fallback = self._fail[node]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[child] = target if target != child else 0
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+                queue.append(child)
+
+    def find_tokens(self, tokens: Sequence[str], overlapping: bool = False) -> List[KeywordMatch]:
+        """
+        Match normalized tokens
+
+        Args:
+            tokens: Output of tokenize()
+            overlapping: Return every match; otherwise leftmost-longest
+                         matches only ("happy birthday" does not also
+                         count "happy" and "birthday")
+
+        Returns:
+            Matches in token order
+        """
+        matches = []
+        node = 0
+
+        for i, token in enumerate(tokens):
+            while node and token not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(token, 0)
+
+            for pattern_id in self._outputs[node]:
+                phrase, category, weight, length = self._patterns[pattern_id]
+                matches.append(KeywordMatch(phrase, category, weight, i + 1 - length, i + 1))
+
+        matches.sort(key=lambda m: (m.start, -(m.end - m.start)))
+        if overlapping:
+            return matches
+
+        selected = []
+        covered = 0
+        for match in matches:
+            if match.start >= covered:
+                selected.append(match)
+                covered = match.end
+        return selected
+
+    def find(self, text: str, overlapping: bool = False) -> List[KeywordMatch]:
+        """Match a raw text (see find_tokens)"""
+        return self.find_tokens(tokenize(text), overlapping)
+
+
+def load_keywords(path: str) -> Dict[str, Dict[str, float]]:
+    """Read a JSON dictionary of category -> {phrase: weight}"""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+_matchers: Dict[Tuple[str, Optional[str]], KeywordMatcher] = {}
+_matchers_lock = threading.Lock()
+
+
+def get_matcher(locale: str = 'en', path: Optional[str] = None) -> KeywordMatcher:
+    """
+    Compiled matcher for a locale, shared by every job in the process
+
+    Args:
+        locale: Looks for KEYWORD_DIR/<locale>.json; 'en' falls back to DEFAULT_KEYWORDS
+        path: Explicit dictionary file (overrides the locale lookup)
+
+    Returns:
+        KeywordMatcher (compiled once per locale/path)
+    """
+    key = (locale, path)
+    with _matchers_lock:
+        matcher = _matchers.get(key)
+        if matcher is not None:
+            return matcher
+
+        path = path or os.path.join(KEYWORD_DIR, f"{locale}.json")
+        if os.path.exists(path):
+            keywords = load_keywords(path)
+        elif locale == 'en':
+            keywords = DEFAULT_KEYWORDS
+        else:
+            raise FileNotFoundError(f"No keyword dictionary for locale '{locale}': {path}")
+
+        matcher = _matchers[key] = KeywordMatcher(keywords)
+        logger.info(f"Compiled {len(matcher)} keywords for '{locale}'")
+        return matcher
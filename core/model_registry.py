@@ -0,0 +1,161 @@
+"""
+Model Registry
+Process-wide cache of loaded AI models shared by every processing job
+"""
+
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry:
+    """A registered model: its factory, the loaded instance and its borrowers"""
+
+    def __init__(self, factory: Callable[[], Any]):
+        self.factory = factory
+        self.model: Any = None
+        self.loaded = False
+        self.refcount = 0
+        self.lock = threading.Lock()
+
+
+class ModelRegistry:
+    """
+    Thread-safe registry of lazily loaded models
+
+    Models are registered by key with a zero-argument factory. The first
+    acquire() loads the model (under a per-key lock, so concurrent jobs
+    wait for one load instead of racing), later calls return the same
+    instance. Reference counts track borrowers (borrow() scopes one);
+    models stay loaded when the count drops to zero and are only dropped
+    by evict_idle(), which the backend worker calls after each job.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def register(self, key: str, factory: Callable[[], Any]):
+        """Register a factory (no-op if the key is already registered)"""
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = _Entry(factory)
+
+    def _entry(self, key: str, factory: Optional[Callable[[], Any]]) -> _Entry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if factory is None:
+                    raise KeyError(f"No model registered for '{key}'")
+                entry = self._entries[key] = _Entry(factory)
+            return entry
+
+    def _load(self, key: str, entry: _Entry):
+        """Load a model if needed (caller holds entry.lock)"""
+        if not entry.loaded:
+            logger.info(f"Loading model '{key}'...")
+            entry.model = entry.factory()
+            entry.loaded = True
+
+    def acquire(self, key: str, factory: Optional[Callable[[], Any]] = None) -> Any:
+        """
+        Borrow a model, loading it on first use
+
+        Args:
+            key: Model key
+            factory: Registers the key on the fly if it is unknown
+
+        Returns:
+            The shared model instance
+        """
+        entry = self._entry(key, factory)
+        with entry.lock:
+            self._load(key, entry)
+            entry.refcount += 1
+            return entry.model
+
+    def release(self, key: str):
+        """Return a borrowed model"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return
+        with entry.lock:
+            entry.refcount = max(0, entry.refcount - 1)
+
+    @contextmanager
+    def borrow(self, key: str, factory: Optional[Callable[[], Any]] = None) -> Iterator[Any]:
+        """Context manager pairing acquire() and release()"""
+        model = self.acquire(key, factory)
+        try:
+            yield model
+        finally:
+            self.release(key)
+
+    def warmup(self, keys: Optional[Iterable[str]] = None):
+        """
+        Load models ahead of the first job
+
+        Args:
+            keys: Models to load (None = every registered model)
+        """
+        with self._lock:
+            keys = list(keys) if keys is not None else list(self._entries)
+
+        for key in keys:
+            entry = self._entry(key, None)
+            try:
+                with entry.lock:
+                    self._load(key, entry)
+            except Exception as e:
+                logger.warning(f"Warmup failed for model '{key}': {e}")
+
+    def evict_idle(self, keep: Iterable[str] = ()) -> int:
+        """
+        Drop loaded models that nobody is borrowing
+
+        Args:
+            keep: Keys to leave loaded even when idle
+
+        Returns:
+            Number of models evicted
+        """
+        keep = set(keep)
+        with self._lock:
+            entries = [(key, entry) for key, entry in self._entries.items() if key not in keep]
+
+        evicted = 0
+        for key, entry in entries:
+            with entry.lock:
+                if entry.loaded and entry.refcount == 0:
+                    entry.model = None
+                    entry.loaded = False
+                    evicted += 1
+                    logger.info(f"Evicted idle model '{key}'")
+
+        return evicted
+
+    def stats(self) -> Dict[str, Dict]:
+        """Load state and borrower count per model"""
+        with self._lock:
+            entries = list(self._entries.items())
+        return {
+            key: {'loaded': entry.loaded, 'refcount': entry.refcount}
+            for key, entry in entries
+        }
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ModelRegistry:
+    """The process-wide registry"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
@@ -3,11 +3,22 @@ import numpy as np
 from typing import Dict, List, Tuple
 import logging
 
+from .frame_source import FrameRequest, iter_frames
+from .motion_vectors import vector_motion_scores
+
 logger = logging.getLogger(__name__)
 
+MOTION_BACKENDS = ('vectors', 'flow')
+
 class MotionAnalyzer:
-    def __init__(self):
+    def __init__(self, frame_backend: str = 'opencv', motion_backend: str = 'vectors'):
+        if motion_backend not in MOTION_BACKENDS:
+            raise ValueError(f"Unknown motion backend: {motion_backend}")
+
         self.optical_flow = None
+        self.frame_backend = frame_backend  # 'opencv' or 'ffmpeg'
+        self.motion_backend = motion_backend  # 'vectors' = codec motion vectors, falling back to 'flow' (Farneback)
+        self._vectors_warned = False
 
     def analyze_segment(self, video_path: str,
                        start_time: float,
@@ -15,25 +26,38 @@ class MotionAnalyzer:
                        sample_rate: int = 5) -> Dict:
         """Analyze motion in video segment"""
 
-        cap = cv2.VideoCapture(video_path)
-        fps = cap.get(cv2.CAP_PROP_FPS)
+        scores = None
+        if self.motion_backend == 'vectors':
+            scores = vector_motion_scores(video_path, start_time, end_time, sample_rate)
+            if scores is None and not self._vectors_warned:
+                logger.warning("Motion vectors unavailable, using optical flow")
+                self._vectors_warned = True
+
+        if scores is None:
+            scores = self._flow_scores(video_path, start_time, end_time, sample_rate)
+        motion_scores, camera_movement = scores
+
+        return {
+            'motion_intensity': np.mean(motion_scores) if motion_scores else 0,
+            'motion_variance': np.std(motion_scores) if motion_scores else 0,
+            'peak_motion': np.max(motion_scores) if motion_scores else 0,
+            'camera_movement': np.mean(camera_movement) if camera_movement else 0,
+            'has_significant_motion': np.mean(motion_scores) > 2.0 if motion_scores else False
+        }
 
-        start_frame = int(start_time * fps)
-        end_frame = int(end_time * fps)
-        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+    def _flow_scores(self, video_path: str, start_time: float, end_time: float,
+                     sample_rate: int) -> Tuple[List[float], List[float]]:
+        """Motion and camera scores from dense Farneback flow between sampled frames"""
 
         motion_scores = []
         camera_movement = []
         prev_gray = None
 
-        for frame_idx in range(start_frame, end_frame, sample_rate):
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            gray = cv2.resize(gray, (640, 480))
+        request = FrameRequest(stride=sample_rate, size=(640, 480), grayscale=True)
 
+        for frame_idx, timestamp, gray in iter_frames(
+            video_path, request, start_time, end_time, backend=self.frame_backend
+        ):
             if prev_gray is not None:
                 flow = cv2.calcOpticalFlowFarneback(
                     prev_gray, gray, None,
@@ -50,15 +74,7 @@ class MotionAnalyzer:
 
             prev_gray = gray
 
-        cap.release()
-
-        return {
-            'motion_intensity': np.mean(motion_scores) if motion_scores else 0,
-            'motion_variance': np.std(motion_scores) if motion_scores else 0,
-            'peak_motion': np.max(motion_scores) if motion_scores else 0,
-            'camera_movement': np.mean(camera_movement) if camera_movement else 0,
-            'has_significant_motion': np.mean(motion_scores) > 2.0 if motion_scores else False
-        }
+        return motion_scores, camera_movement
 
     def _detect_camera_movement(self, flow: np.ndarray) -> float:
         """Detect global camera movement"""
@@ -69,23 +85,17 @@ class MotionAnalyzer:
     def detect_action_moments(self, video_path: str,
                             threshold: float = 5.0) -> List[Tuple[float, float]]:
         """Detect high-action moments in video"""
-        cap = cv2.VideoCapture(video_path)
-        fps = cap.get(cv2.CAP_PROP_FPS)
+        # Flow is measured between each 5th frame and the frame before it,
+        # so only those pairs are retrieved and converted
+        request = FrameRequest(stride=5, lead=1, size=(320, 240), grayscale=True)
 
         action_moments = []
         current_action_start = None
         prev_gray = None
-        frame_idx = 0
-
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            gray = cv2.resize(gray, (320, 240))
+        prev_idx = None
 
-            if prev_gray is not None and frame_idx % 5 == 0:
+        for frame_idx, timestamp, gray in iter_frames(video_path, request, backend=self.frame_backend):
+            if prev_gray is not None and prev_idx == frame_idx - 1 and frame_idx % 5 == 0:
                 flow = cv2.calcOpticalFlowFarneback(
                     prev_gray, gray, None, 0.5, 3, 15, 3, 5, 1.2, 0
                 )
@@ -93,13 +103,12 @@ class MotionAnalyzer:
 
                 if magnitude > threshold:
                     if current_action_start is None:
-                        current_action_start = frame_idx / fps
+                        current_action_start = timestamp
                 elif current_action_start is not None:
-                    action_moments.append((current_action_start, frame_idx / fps))
+                    action_moments.append((current_action_start, timestamp))
                     current_action_start = None
 
             prev_gray = gray
-            frame_idx += 1
+            prev_idx = frame_idx
 
-        cap.release()
         return action_moments
\ No newline at end of file
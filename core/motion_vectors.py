@@ -0,0 +1,141 @@
+"""
+Motion Vectors
+Reads the motion vectors the encoder already computed instead of estimating dense optical flow
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import av
+    AV_AVAILABLE = True
+except ImportError:
+    AV_AVAILABLE = False
+
+
+@dataclass
+class FrameMotion:
+    """Motion of one decoded frame relative to its reference, in pixels per frame"""
+    timestamp: float
+    magnitude: float  # Mean vector length over the frame (intra/uncovered area counts as 0)
+    mean_x: float     # Mean horizontal component (global/camera motion)
+    mean_y: float
+
+
+def frame_motion(vectors: np.ndarray, width: int, height: int,
+                 ref_size: Tuple[int, int] = (640, 480)) -> Tuple[float, float, float]:
+    """
+    Area-weighted mean motion of a frame from its exported motion vectors
+
+    Args:
+        vectors: Structured array from PyAV's MOTION_VECTORS side data
+        width, height: Coded frame size the vectors refer to
+        ref_size: Resolution the result is expressed in (the flow backend's frame size)
+
+    Returns:
+        (magnitude, mean_x, mean_y) in ref_size pixels per frame
+    """
+    scale = vectors['motion_scale'].astype(np.float64)
+    scale[scale == 0] = 1.0
+
+    # src = dst + motion / scale: content from a past reference moved src -> dst,
+    # a future reference points the other way
+    direction = np.where(vectors['source'] < 0, -1.0, 1.0)
+    dx = direction * vectors['motion_x'] / scale * (ref_size[0] / width)
+    dy = direction * vectors['motion_y'] / scale * (ref_size[1] / height)
+
+    area = vectors['w'].astype(np.float64) * vectors['h']
+    covered = area.sum()
+    if covered == 0:
+        return 0.0, 0.0, 0.0
+
+    # Bi-predicted blocks carry two vectors; averaging over covered area keeps
+    # them from counting twice, and intra blocks dilute the mean as zero motion
+    coverage = min(1.0, covered / (width * height))
+    magnitude = float(np.sum(area * np.hypot(dx, dy)) / covered * coverage)
+    mean_x = float(np.sum(area * dx) / covered * coverage)
+    mean_y = float(np.sum(area * dy) / covered * coverage)
+    return magnitude, mean_x, mean_y
+
+
+def iter_frame_motion(video_path: str, start_time: float, end_time: float,
+                      ref_size: Tuple[int, int] = (640, 480)) -> Iterator[Optional[FrameMotion]]:
+    """
+    Per-frame motion in [start_time, end_time) from codec motion vectors
+
+    Frames are decoded (the vectors are only exported during decoding) but
+    never converted to pixels. Yields None for frames without vectors
+    (keyframes, or codecs that do not export them).
+    """
+    with av.open(video_path) as container:
+        stream = container.streams.video[0]
+        stream.codec_context.options = {'flags2': '+export_mvs'}
+        stream.thread_type = 'AUTO'
+
+        if start_time > 0:
+            container.seek(int(start_time / stream.time_base), stream=stream)
+
+        for frame in container.decode(stream):
+            if frame.time is None or frame.time < start_time:
+                continue
+            if frame.time >= end_time:
+                break
+
+            side_data = frame.side_data.get('MOTION_VECTORS')
+            if side_data is None:
+                yield None
+                continue
+
+            magnitude, mean_x, mean_y = frame_motion(side_data.to_ndarray(), frame.width, frame.height, ref_size)
+            yield FrameMotion(frame.time, magnitude, mean_x, mean_y)
+
+
+def vector_motion_scores(video_path: str, start_time: float, end_time: float,
+                         sample_rate: int = 5) -> Optional[Tuple[List[float], List[float]]]:
+    """
+    Motion and camera scores per sampling step, on the dense flow backend's scale
+
+    The flow backend compares 640x480 frames `sample_rate` frames apart; here
+    each step is the mean per-frame motion of its frames times `sample_rate`.
+    Frames without vectors inside a step are skipped.
+
+    Returns:
+        (motion_scores, camera_scores), or None if PyAV is missing or the
+        stream exported no vectors (the caller falls back to optical flow)
+    """
+    if not AV_AVAILABLE:
+        return None
+
+    steps: List[List[FrameMotion]] = []
+    step: List[FrameMotion] = []
+
+    try:
+        # The first frame only anchors the first step, as in the flow backend
+        for i, motion in enumerate(iter_frame_motion(video_path, start_time, end_time)):
+            if i == 0:
+                continue
+            if motion is not None:
+                step.append(motion)
+            if i % sample_rate == 0:
+                if step:
+                    steps.append(step)
+                step = []
+    except Exception as e:
+        logger.warning(f"Motion vector extraction failed: {e}")
+        return None
+
+    motion_scores = [sample_rate * float(np.mean([m.magnitude for m in frames])) for frames in steps]
+    camera_scores = [
+        sample_rate * float(np.hypot(np.mean([m.mean_x for m in frames]), np.mean([m.mean_y for m in frames])))
+        for frames in steps
+    ]
+
+    if not motion_scores:
+        return None
+
+    return motion_scores, camera_scores
@@ -0,0 +1,215 @@
+"""
+Parallel Scene Analysis
+Process pool that analyzes independent scenes in contiguous chunks
+"""
+
+import os
+import atexit
+import threading
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Per-process state set up by a worker initializer (models, analyzers)
+_worker: Dict[str, Any] = {}
+
+# Native thread pools sized by configure_threads (set before they are first used)
+THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+
+def configure_threads(threads: int):
+    """Cap OpenCV, torch and BLAS threads in this process"""
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+
+    import cv2
+    cv2.setNumThreads(threads)
+
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+
+def contiguous_chunks(items: Sequence, n_chunks: int) -> List[List]:
+    """Split items into at most n_chunks contiguous, near-equal runs"""
+    n_chunks = max(1, min(n_chunks, len(items)))
+    size, extra = divmod(len(items), n_chunks)
+
+    chunks = []
+    start = 0
+    for i in range(n_chunks):
+        end = start + size + (1 if i < extra else 0)
+        chunks.append(list(items[start:end]))
+        start = end
+    return chunks
+
+
+def _init_worker(threads: int, initializer: Optional[Callable], initargs: Tuple):
+    configure_threads(threads)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def _run_chunk(task: Callable, video_path: str, scenes: List[Tuple[float, float]]) -> List:
+    """Run a per-scene task over a chunk, in order (one worker, local seeks)"""
+    return [task(video_path, start, end) for start, end in scenes]
+
+
+class SceneExecutor:
+    """
+    Runs a per-scene task over a video's scenes in a process pool
+
+    Workers are spawned once and keep whatever their initializer loads (AI
+    models, analyzers) for the executor's lifetime. Scenes are split into
+    contiguous chunks, a few per worker, so each worker seeks forward through
+    one region of the file; results come back in scene order. Each worker's
+    OpenCV/torch/BLAS thread pools are capped at its share of the cores so
+    the pool does not oversubscribe the machine.
+    """
+
+    def __init__(self, workers: int, initializer: Optional[Callable] = None,
+                 initargs: Tuple = (), threads_per_worker: Optional[int] = None,
+                 chunks_per_worker: int = 2):
+        """
+        Initialize SceneExecutor
+
+        Args:
+            workers: Worker processes
+            initializer: Module-level function run once in each worker
+            initargs: Arguments for initializer (must be picklable)
+            threads_per_worker: Native threads per worker (None = cores / workers)
+            chunks_per_worker: Chunks per worker (more balances uneven scenes better)
+        """
+        if workers < 1:
+            raise ValueError(f"Invalid worker count: {workers}")
+
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // workers)
+        self.chunks_per_worker = chunks_per_worker
+
+        # spawn, not fork: the parent runs threads (transcription, decoders)
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.threads_per_worker, initializer, initargs)
+        )
+        logger.info(f"⚡ Scene analysis pool: {workers} workers x {self.threads_per_worker} threads")
+
+    def map(self, task: Callable, video_path: str,
+            scenes: Sequence[Tuple[float, float]]) -> List:
+        """
+        Run task(video_path, start, end) for every scene
+
+        Args:
+            task: Module-level function executed in the workers
+            video_path: Video the scenes belong to
+            scenes: (start, end) pairs
+
+        Returns:
+            One result per scene, in scene order
+        """
+        if not scenes:
+            return []
+
+        chunks = contiguous_chunks(list(scenes), self.workers * self.chunks_per_worker)
+        futures = [self._pool.submit(_run_chunk, task, video_path, chunk) for chunk in chunks]
+
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+_executors: Dict[Tuple, SceneExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(workers: int, initializer: Optional[Callable] = None,
+                 initargs: Tuple = ()) -> SceneExecutor:
+    """
+    Process-wide executor for a worker setup, so jobs reuse warm workers
+
+    Args:
+        workers: Worker processes
+        initializer, initargs: Worker setup (part of the cache key)
+    """
+    key = (workers, initializer, initargs)
+    with _executors_lock:
+        executor = _executors.get(key)
+        if executor is None:
+            executor = _executors[key] = SceneExecutor(workers, initializer, initargs)
+        return executor
+
+
+@atexit.register
+def shutdown_executors():
+    """Stop every cached executor"""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown()
+
+
+# SimpleVideoProcessor workers
+
+def init_simple_worker(frame_backend: str, ai_options: Optional[Tuple] = None):
+    """Load the AI models once per worker (ai_options: AIVideoAnalyzer keyword pairs, None = motion only)"""
+    _worker['frame_backend'] = frame_backend
+    _worker['ai'] = None
+
+    if ai_options is not None:
+        try:
+            from .ai_analyzers import AIVideoAnalyzer
+            _worker['ai'] = AIVideoAnalyzer(**dict(ai_options))
+        except ImportError as e:
+            logger.warning(f"AI analyzers not available in worker: {e}")
+
+
+def simple_motion_task(video_path: str, start: float, end: float) -> Dict:
+    """Frame-difference motion stats of a scene"""
+    from .simple_processor import segment_motion
+    return segment_motion(video_path, start, end, _worker['frame_backend'])
+
+
+def simple_visual_task(video_path: str, start: float, end: float) -> Optional[Tuple[Dict, Dict]]:
+    """Face and emotion analysis of a scene, or None if unavailable or failed"""
+    analyzer = _worker.get('ai')
+    if analyzer is None:
+        return None
+    try:
+        return analyzer.analyze_visual(video_path, start, end)
+    except Exception as e:
+        logger.warning(f"  ⚠️ AI analysis failed for scene {start:.1f}s-{end:.1f}s: {e}")
+        return None
+
+
+# VideoProcessor workers
+
+def init_video_processor_worker(frame_backend: str, speech: bool, motion_backend: str = 'vectors'):
+    """Load the motion and audio analyzers (and Whisper) once per worker"""
+    from .motion_analyzer import MotionAnalyzer
+    _worker['motion'] = MotionAnalyzer(frame_backend=frame_backend, motion_backend=motion_backend)
+    _worker['audio'] = None
+
+    if speech:
+        from .audio_analyzer import AudioAnalyzer
+        _worker['audio'] = AudioAnalyzer()
+
+
+def video_processor_scene_task(video_path: str, start: float, end: float) -> Tuple[Dict, Dict]:
+    """(motion_data, audio_data) of a scene"""
+    motion_data = _worker['motion'].analyze_segment(video_path, start, end)
+    audio = _worker['audio']
+    audio_data = audio.analyze_segment(video_path, start, end) if audio is not None else {}
+    return motion_data, audio_data
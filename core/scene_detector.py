@@ -1,17 +1,39 @@
+import cv2
 import numpy as np
+from functools import partial
 from scenedetect import detect, ContentDetector, AdaptiveDetector
-from typing import List, Tuple, Optional
+from typing import Callable, List, Tuple, Optional
 import logging
 
+from .chunked_scene_detection import adaptive_detector_cuts, cuts_to_scenes, detect_chunked, merge_cuts
+from .parallel_analysis import SceneExecutor, get_executor
+from .shot_prefilter import DIFF_THRESHOLD, prefilter_cuts
+
 logger = logging.getLogger(__name__)
 
 class SceneDetector:
-    def __init__(self, threshold: float = 30.0, min_scene_len: int = 15):
+    def __init__(self, threshold: float = 30.0, min_scene_len: int = 15, workers: int = 1,
+                 prefilter: bool = False, executor: Optional[Callable[[], SceneExecutor]] = None,
+                 prefilter_threshold: float = DIFF_THRESHOLD):
         self.threshold = threshold
         self.min_scene_len = min_scene_len
+        self.workers = workers  # > 1: long videos are split into keyframe-aligned chunks across processes
+        self.executor = executor  # Returns the pool to run chunks on (None = a plain pool of `workers`)
+        self.prefilter = prefilter  # Decode only around cut candidates found in packet metadata
+        self.prefilter_threshold = prefilter_threshold  # Mean grayscale frame difference, not a ContentDetector score
 
     def detect_scenes(self, video_path: str) -> List[Tuple[float, float]]:
         """Detect scene boundaries in video"""
+        if self.prefilter:
+            scene_list = self._detect_scenes_prefiltered(video_path)
+            if scene_list is not None:
+                return scene_list
+
+        if self.workers > 1:
+            scene_list = self._detect_scenes_chunked(video_path)
+            if scene_list is not None:
+                return scene_list
+
         try:
             scenes = detect(
                 video_path,
@@ -33,6 +55,62 @@ class SceneDetector:
             logger.error(f"Scene detection failed: {e}")
             return []
 
+    def _detect_scenes_prefiltered(self, video_path: str) -> Optional[List[Tuple[float, float]]]:
+        """
+        Frame-difference cuts confirmed only around packet-metadata candidates
+
+        Returns:
+            Scene list, or None to fall back to a full pass (no packet metadata or failure)
+        """
+        try:
+            cap = cv2.VideoCapture(video_path)
+            fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+            duration = cap.get(cv2.CAP_PROP_FRAME_COUNT) / fps
+            cap.release()
+
+            cuts = prefilter_cuts(video_path, threshold=self.prefilter_threshold)
+            if cuts is None:
+                return None
+
+            scene_list = cuts_to_scenes(merge_cuts([cuts], min_gap=self.min_scene_len / fps), duration)
+
+            logger.info(f"Detected {len(scene_list)} scenes")
+            return scene_list
+
+        except Exception as e:
+            logger.warning(f"Prefiltered scene detection failed: {e}, scanning every frame")
+            return None
+
+    def _detect_scenes_chunked(self, video_path: str) -> Optional[List[Tuple[float, float]]]:
+        """
+        AdaptiveDetector over chunks in parallel, cuts reconciled at chunk edges
+
+        Returns:
+            Scene list, or None to fall back to a single pass (short video or failure)
+        """
+        try:
+            cap = cv2.VideoCapture(video_path)
+            fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+            duration = cap.get(cv2.CAP_PROP_FRAME_COUNT) / fps
+            cap.release()
+
+            task = partial(adaptive_detector_cuts, adaptive_threshold=3.0, min_scene_len=self.min_scene_len)
+            executor = self.executor() if self.executor else get_executor(self.workers)
+            chunk_cuts = detect_chunked(video_path, duration, task, executor)
+            if chunk_cuts is None:
+                return None
+
+            # Neighbors may both report a boundary cut a frame or two apart
+            cuts = merge_cuts(chunk_cuts, tolerance=2 / fps, min_gap=self.min_scene_len / fps)
+            scene_list = cuts_to_scenes(cuts, duration)
+
+            logger.info(f"Detected {len(scene_list)} scenes")
+            return scene_list
+
+        except Exception as e:
+            logger.warning(f"Chunked scene detection failed: {e}, scanning in one pass")
+            return None
+
     def merge_short_scenes(self, scenes: List[Tuple[float, float]],
                           min_duration: float = 1.0) -> List[Tuple[float, float]]:
         """Merge scenes shorter than minimum duration"""
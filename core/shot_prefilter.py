@@ -0,0 +1,233 @@
+"""
+Shot Boundary Prefilter
+Finds candidate cuts from packet metadata and keyframes, verifies them on a few decoded frames
+"""
+
+import shutil
+import subprocess
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from .frame_sampler import FrameSampler, FrameSchedule
+
+logger = logging.getLogger(__name__)
+
+try:
+    import av
+    AV_AVAILABLE = True
+except ImportError:
+    AV_AVAILABLE = False
+
+
+# Mean grayscale difference (0-255) between 160x120 frames that counts as a cut.
+# This is its own scale, not a ContentDetector threshold: hard cuts between
+# similar shots measure ~12, motion inside a shot stays under ~5.
+DIFF_THRESHOLD = 10.0
+
+
+@dataclass
+class PacketInfo:
+    """Compressed size and keyframe flag of one video packet"""
+    timestamp: float
+    size: int
+    keyframe: bool
+
+
+def read_packets(video_path: str, timeout: float = 120.0) -> List[PacketInfo]:
+    """
+    Video packet metadata in presentation order, without decoding any pixels
+
+    Uses PyAV's demuxer when installed, otherwise ffprobe's packet listing.
+    Picture types would need a decode, so keyframe flags stand in for I-frames.
+
+    Returns:
+        Packets sorted by timestamp ([] if neither reader is available)
+    """
+    packets = []
+
+    if AV_AVAILABLE:
+        try:
+            with av.open(video_path) as container:
+                stream = container.streams.video[0]
+                for packet in container.demux(stream):
+                    if packet.pts is None or packet.size == 0:
+                        continue
+                    packets.append(PacketInfo(float(packet.pts * stream.time_base), packet.size, packet.is_keyframe))
+        except Exception as e:
+            logger.warning(f"PyAV packet scan failed: {e}")
+            packets = []
+
+    if not packets and shutil.which('ffprobe'):
+        cmd = [
+            'ffprobe', '-v', 'error',
+            '-select_streams', 'v:0',
+            '-show_entries', 'packet=pts_time,size,flags',
+            '-of', 'csv=p=0',
+            video_path
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=timeout)
+            for line in result.stdout.splitlines():
+                fields = line.split(',')
+                if len(fields) < 3 or fields[0] in ('', 'N/A'):
+                    continue
+                packets.append(PacketInfo(float(fields[0]), int(fields[1]), 'K' in fields[2]))
+        except Exception as e:
+            logger.warning(f"ffprobe packet scan failed: {e}")
+            packets = []
+
+    # Packets arrive in decode order; B-frames make that differ from display order
+    packets.sort(key=lambda p: p.timestamp)
+    return packets
+
+
+def candidate_cuts(packets: Sequence[PacketInfo], size_ratio: float = 3.0,
+                   window: int = 15, min_gap: float = 0.5) -> List[float]:
+    """
+    Timestamps where packet metadata alone suggests a cut
+
+    A cut coded as a P/B-frame is mostly intra blocks, so its packet is far
+    larger than its neighbors: non-keyframes larger than `size_ratio` times
+    the median of the surrounding `window` non-keyframes on each side are
+    candidates. Encoders with scene-cut detection also insert keyframes off
+    their regular GOP cadence; those are candidates too. Keyframes on the
+    cadence say nothing by themselves (see keyframe_windows).
+
+    Args:
+        packets: Output of read_packets()
+        size_ratio: Size spike that makes a non-keyframe a candidate
+        window: Neighbors on each side used for the local median
+        min_gap: Candidates closer than this (seconds) are merged
+    """
+    candidates = []
+
+    inter = [p for p in packets if not p.keyframe]
+    if len(inter) > 1:
+        sizes = np.array([p.size for p in inter], dtype=np.float64)
+        padded = np.pad(sizes, window, mode='edge')
+        medians = np.median(np.lib.stride_tricks.sliding_window_view(padded, 2 * window + 1), axis=1)
+        candidates += [p.timestamp for p, size, median in zip(inter, sizes, medians) if size > size_ratio * median]
+
+    keyframes = [p.timestamp for p in packets if p.keyframe]
+    if len(keyframes) > 2:
+        gop = float(np.median(np.diff(keyframes)))
+        candidates += [t for prev, t in zip(keyframes, keyframes[1:]) if t - prev < 0.9 * gop]
+
+    merged: List[float] = []
+    for t in sorted(candidates):
+        if not merged or t - merged[-1] >= min_gap:
+            merged.append(t)
+    return merged
+
+
+def keyframe_windows(video_path: str, keyframes: Sequence[float], threshold: float = DIFF_THRESHOLD,
+                     size: Tuple[int, int] = (160, 120)) -> List[Tuple[float, float]]:
+    """
+    GOPs whose bounding keyframes look different
+
+    A cut that lands on a scheduled keyframe of a fixed-GOP encode leaves no
+    trace in packet sizes. Decoding only keyframes is cheap (no reference
+    chain), so consecutive keyframe images are compared and every GOP whose
+    ends differ by more than `threshold` becomes a window to verify.
+
+    Returns:
+        (start, end) windows, one per changed GOP
+    """
+    windows = []
+    cap = cv2.VideoCapture(video_path)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        prev, prev_t = None, 0.0
+        for t in keyframes:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, round(t * fps))
+            ret, frame = cap.read()
+            if not ret:
+                continue
+            gray = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), size)
+            if prev is not None and np.mean(cv2.absdiff(prev, gray)) > threshold:
+                # One frame of margin so the first frame of the GOP is compared too
+                windows.append((max(0.0, prev_t - 1 / fps), t + 1 / fps))
+            prev, prev_t = gray, t
+    finally:
+        cap.release()
+
+    return windows
+
+
+def verify_cuts(video_path: str, windows: Sequence[Tuple[float, float]], threshold: float = DIFF_THRESHOLD,
+                size: Tuple[int, int] = (160, 120)) -> List[float]:
+    """
+    Confirm cuts on decoded frames, only inside the candidate windows
+
+    Consecutive small grayscale frames are compared inside each window; a cut
+    is confirmed at every local peak of the difference above `threshold`
+    (see DIFF_THRESHOLD), so boundaries are frame-accurate.
+
+    Returns:
+        Confirmed cut timestamps
+    """
+    # Overlapping windows are decoded once
+    spans: List[List[float]] = []
+    for start, end in sorted(windows):
+        if spans and start <= spans[-1][1]:
+            spans[-1][1] = max(spans[-1][1], end)
+        else:
+            spans.append([start, end])
+
+    cuts = []
+    for start, end in spans:
+        prev = None
+        diffs: List[Tuple[float, float]] = []
+        with FrameSampler.for_segment(video_path, FrameSchedule.every(1), start, end) as sampler:
+            for frame_idx, timestamp, frame in sampler:
+                gray = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), size)
+                if prev is not None:
+                    diffs.append((float(np.mean(cv2.absdiff(prev, gray))), timestamp))
+                prev = gray
+
+        for i, (diff, timestamp) in enumerate(diffs):
+            if diff <= threshold:
+                continue
+            if (i > 0 and diffs[i - 1][0] > diff) or (i + 1 < len(diffs) and diffs[i + 1][0] >= diff):
+                continue
+            cuts.append(timestamp)
+
+    return cuts
+
+
+def prefilter_cuts(video_path: str, threshold: float = DIFF_THRESHOLD, window: float = 0.5,
+                   check_keyframes: bool = True) -> Optional[List[float]]:
+    """
+    Cut detection that decodes only around candidates
+
+    Args:
+        video_path: Video to scan
+        threshold: Mean grayscale difference that counts as a cut (see DIFF_THRESHOLD)
+        window: Seconds decoded on each side of a metadata candidate
+        check_keyframes: Also compare keyframe images (catches cuts on scheduled keyframes)
+
+    Returns:
+        Confirmed cuts, or None when packet metadata is unavailable (the
+        caller should fall back to a full decode pass)
+    """
+    packets = read_packets(video_path)
+    if not packets:
+        return None
+
+    candidates = candidate_cuts(packets)
+    windows = [(max(0.0, t - window), t + window) for t in candidates]
+    if check_keyframes:
+        windows += keyframe_windows(video_path, [p.timestamp for p in packets if p.keyframe], threshold)
+
+    cuts = verify_cuts(video_path, windows, threshold=threshold)
+
+    logger.info(
+        f"✂️ Shot prefilter: {len(candidates)} metadata candidates and "
+        f"{len(windows) - len(candidates)} changed GOPs from {len(packets)} packets, "
+        f"{len(cuts)} cuts confirmed"
+    )
+    return cuts
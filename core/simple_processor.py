@@ -3,20 +3,37 @@ import time
 import logging
 import cv2
 import numpy as np
-from typing import Dict, List, Tuple
-from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, replace
 import json
+import queue
 import subprocess
-
-from .audio_volume_analyzer import AudioVolumeAnalyzer
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+
+from .analysis_proxy import AnalysisProxy
+from .audio_cache import AudioPCMCache
+from .audio_volume_analyzer import AudioFeatureTimeline, AudioVolumeAnalyzer
+from .deadline_planner import DeadlinePlanner
+from .chunked_scene_detection import detect_chunked, frame_diff_candidates, merge_cuts
+from .frame_source import FrameConsumer, FrameRequest, SharedFrameDecoder, iter_frames
+from .parallel_analysis import get_executor, init_simple_worker, simple_motion_task, simple_visual_task
+from .shot_prefilter import prefilter_cuts
+from .hierarchical_scene_detection import (
+    COARSE_REQUEST, AdaptiveCutStream, FrameProbe, coarse_to_fine_chunk, detect_coarse_to_fine, locate_cut
+)
+from .transcription import BackgroundTranscription
+from .voice_activity import VoiceActivityDetector
+from .whisper_policy import WhisperChoice, WhisperPolicy
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 try:
-    from .diversity_scorer import DiversityScorer
+    from .diversity_scorer import DiversityScorer, ThumbnailConsumer
 except ImportError:
     DiversityScorer = None
+    ThumbnailConsumer = None
     logger.warning("DiversityScorer not available")
 
 # NEW: AI-powered analyzers
@@ -30,10 +47,244 @@ except ImportError as e:
 
 @dataclass
 class SimpleConfig:
+    """
+    Settings of SimpleVideoProcessor
+
+    Scene detection runs in one of two places. With shared_decode (the
+    default) scene cuts come from the shared decode pass, which also feeds
+    motion, faces and thumbnails; scene_detection picks the cut detector
+    there as well. scene_prefilter and chunked detection on
+    analysis_workers only apply with shared_decode=False, where scene
+    detection is a pass of its own.
+    """
     target_duration: int = 180  # 3 minutes default
     min_segment_duration: float = 1.0
     max_segment_duration: float = 10.0
     output_quality: str = 'high'
+    shared_decode: bool = True  # Decode the video once for all frame analyzers
+    frame_backend: str = 'opencv'  # 'opencv' or 'ffmpeg' for single-purpose frame loops
+    analysis_proxy: bool = True  # Analyze a low-res proxy; only composition reads the original
+    proxy_height: int = 480
+    proxy_fps: float = 15.0
+    cache_audio: bool = True  # Decode the audio track once per job into memory-mapped PCM
+    audio_timeline: bool = True  # Compute audio features once per job; scenes query ranges of it
+    face_detect_every: int = 6  # Full face detection every N sampled frames, optical-flow tracking between
+    emotion_window: float = 1.0  # Seconds per emotion result for a tracked face
+    emotion_batch_size: int = 16  # Faces per batched emotion forward pass
+    emotion_batch_bytes: int = 64 * 1024 * 1024  # Memory budget per emotion batch (crops plus model input)
+    ai_top_k: Optional[int] = None  # Cascade: run AI models on at most K cheap-ranked scenes
+    transcription_mode: str = 'whole'  # 'whole' = one background Whisper pass per job, 'scene' = per-scene calls
+    voice_activity: bool = True  # Energy/ZCR VAD pre-pass; Whisper only sees voiced audio
+    ai_coverage_multiple: Optional[float] = None  # Cascade (opt-in): AI candidates cover this many x target_duration (None + no top_k = AI on every scene)
+    whisper_policy: str = 'adaptive'  # 'adaptive' = model size/threads from load and deadline, 'fixed' = base.en x4
+    analysis_workers: int = 1  # Worker processes for per-scene analysis and (shared_decode=False) chunked scene detection (1 = in-process)
+    pipeline: bool = True  # Shared decode in its own thread with per-analyzer queues; audio and scene scoring run alongside
+    pipeline_queue_size: int = 8  # Frames buffered per analyzer (bounds memory; the decoder waits when full)
+    scene_prefilter: bool = False  # shared_decode=False only: packet-metadata candidates, frames decoded only around them
+    scene_detection: str = 'coarse_to_fine'  # 'coarse_to_fine' = 2 fps adaptive pass + per-cut bisection, 'fixed' = 1 s samples, threshold 30
+
+
+class SceneChangeConsumer(FrameConsumer):
+    """Frame-difference scene cut detector fed by SharedFrameDecoder"""
+
+    # Sample once per second (every 30 frames at 30 fps), small grayscale for speed
+    request = FrameRequest(interval=1.0, size=(160, 120), grayscale=True)
+
+    def __init__(self, threshold: float = 30.0, min_scene_length: float = 2.0, interval_scale: int = 1,
+                 on_scene: Optional[Callable[[Tuple[float, float]], None]] = None):
+        if interval_scale > 1:
+            self.request = replace(self.request, interval=self.request.interval * interval_scale)
+        self.threshold = threshold
+        self.min_scene_length = min_scene_length
+        self.on_scene = on_scene  # Called with each scene as its closing cut is found
+        self.scenes: List[Tuple[float, float]] = []
+        self.scene_start = 0.0
+        self.prev_frame = None
+
+    def consume(self, frame_idx: int, timestamp: float, frame: np.ndarray):
+        if self.prev_frame is not None:
+            diff = cv2.absdiff(self.prev_frame, frame)
+            mean_diff = np.mean(diff)
+
+            # Scene change detected
+            if mean_diff > self.threshold:
+                self.add_cut(timestamp)
+
+        self.prev_frame = frame
+
+    def add_cut(self, timestamp: float):
+        """Close the current scene at a detected change (ignored if the scene is too short)"""
+        if timestamp - self.scene_start >= self.min_scene_length:
+            self.scenes.append((self.scene_start, timestamp))
+            self.scene_start = timestamp
+            if self.on_scene:
+                self.on_scene(self.scenes[-1])
+
+    def get_scenes(self, duration: float) -> List[Tuple[float, float]]:
+        """Close the final scene and return the scene list"""
+        scenes = list(self.scenes)
+
+        # Add final scene
+        if duration - self.scene_start >= self.min_scene_length:
+            scenes.append((self.scene_start, duration))
+
+        # If no scenes detected, create segments every 5 seconds
+        if not scenes:
+            t = 0
+            while t < duration:
+                end_t = min(t + 5, duration)
+                scenes.append((t, end_t))
+                t = end_t
+
+        return scenes
+
+
+class CoarseToFineSceneConsumer(SceneChangeConsumer):
+    """
+    Adaptive, frame-accurate scene cut detector fed by SharedFrameDecoder
+
+    Coarse samples flag spans whose difference stands out from the
+    neighboring ones (see adaptive_cut_indices); each span is bisected on
+    seeked frames as soon as it is decided, so scenes still close while the
+    decode runs, only a few samples later than with the fixed detector.
+    """
+
+    request = COARSE_REQUEST
+
+    def __init__(self, video_path: str, threshold: float = 10.0, min_scene_length: float = 2.0,
+                 interval_scale: int = 1, on_scene: Optional[Callable[[Tuple[float, float]], None]] = None,
+                 fine_size: Tuple[int, int] = (160, 120)):
+        super().__init__(threshold, min_scene_length, interval_scale, on_scene)
+        self.stream = AdaptiveCutStream(min_threshold=threshold)
+        self.probe = FrameProbe(video_path, FrameRequest(size=fine_size, grayscale=True))
+
+    def consume(self, frame_idx: int, timestamp: float, frame: np.ndarray):
+        self._refine(self.stream.push(timestamp, frame))
+
+    def finish(self):
+        try:
+            self._refine(self.stream.finish())
+            logger.info(
+                f"🔎 Scene cuts: {len(self.scenes)} from {len(self.stream.timestamps)} coarse samples, "
+                f"{self.probe.frames_decoded} frames seeked"
+            )
+        finally:
+            self.probe.release()
+
+    def _refine(self, spans: List[Tuple[float, float]]):
+        for start, end in spans:
+            cut = locate_cut(self.probe, round(start * self.probe.fps), round(end * self.probe.fps), self.threshold)
+            if cut is not None:
+                self.add_cut(cut / self.probe.fps)
+
+
+class MotionTimelineConsumer(FrameConsumer):
+    """Whole-video frame-difference motion timeline fed by SharedFrameDecoder"""
+
+    # Sample 3 times per second (every 10 frames at 30 fps) at 320x240 grayscale
+    request = FrameRequest(interval=1 / 3, size=(320, 240), grayscale=True)
+
+    def __init__(self, interval_scale: int = 1):
+        if interval_scale > 1:
+            self.request = replace(self.request, interval=self.request.interval * interval_scale)
+        self.prev_gray = None
+        self.prev_timestamp = 0.0
+        self._starts: List[float] = []
+        self._ends: List[float] = []
+        self._scores: List[float] = []
+
+    def consume(self, frame_idx: int, timestamp: float, frame: np.ndarray):
+        if self.prev_gray is not None:
+            diff = cv2.absdiff(self.prev_gray, frame)
+            self._starts.append(self.prev_timestamp)
+            self._ends.append(timestamp)
+            self._scores.append(float(np.mean(diff)))
+
+        self.prev_gray = frame
+        self.prev_timestamp = timestamp
+
+    def finish(self):
+        self.starts = np.array(self._starts)
+        self.ends = np.array(self._ends)
+        self.scores = np.array(self._scores)
+
+    def segment_stats(self, start_time: float, end_time: float) -> Dict:
+        """
+        Motion statistics for frame pairs that lie entirely inside the segment
+
+        Also usable while a pipelined decode is still feeding the consumer,
+        for segments that end before the frames consumed so far.
+        """
+        if hasattr(self, 'scores'):
+            starts, ends, scores = self.starts, self.ends, self.scores
+        else:
+            n = len(self._scores)  # Scores are appended last, so all three lists hold n pairs
+            starts, ends, scores = (np.array(values[:n]) for values in (self._starts, self._ends, self._scores))
+
+        lo = np.searchsorted(starts, start_time, side='left')
+        hi = np.searchsorted(ends, end_time, side='left')
+        motion_scores = scores[lo:hi]
+
+        motion_intensity = float(np.mean(motion_scores)) if len(motion_scores) else 0
+        peak_motion = float(np.max(motion_scores)) if len(motion_scores) else 0
+
+        return {
+            'motion_intensity': motion_intensity,
+            'peak_motion': peak_motion,
+            'has_significant_motion': motion_intensity > 5.0
+        }
+
+
+@dataclass
+class FrameFeatures:
+    """Frame analysis gathered for a whole video in one shared decode pass"""
+    scene_cuts: SceneChangeConsumer
+    motion: MotionTimelineConsumer
+    faces: Optional[FrameConsumer] = None
+    thumbnails: Optional[FrameConsumer] = None
+
+
+@dataclass
+class AudioFeatures:
+    """Audio analysis prepared for a whole video (filled in as each step completes)"""
+    cache: Optional[AudioPCMCache] = None
+    vad: Optional[VoiceActivityDetector] = None
+    transcript: Optional[BackgroundTranscription] = None
+    timeline: Optional[AudioFeatureTimeline] = None
+    whisper_choice: Optional[WhisperChoice] = None
+    speech: bool = False  # Whisper runs for this job (the plan keeps audio and the deadline covers it)
+
+
+def segment_motion(video_path: str, start_time: float, end_time: float,
+                   frame_backend: str = 'opencv') -> Dict:
+    """Analyze motion in video segment"""
+
+    motion_scores = []
+    prev_gray = None
+
+    # Sample 3 times per second for speed, decoded straight to 320x240 grayscale
+    request = MotionTimelineConsumer.request
+
+    for frame_idx, timestamp, gray in iter_frames(
+        video_path, request, start_time, end_time, backend=frame_backend
+    ):
+        if prev_gray is not None:
+            # Simple motion detection using frame difference
+            diff = cv2.absdiff(prev_gray, gray)
+            motion_score = np.mean(diff)
+            motion_scores.append(motion_score)
+
+        prev_gray = gray
+
+    motion_intensity = np.mean(motion_scores) if motion_scores else 0
+    peak_motion = np.max(motion_scores) if motion_scores else 0
+
+    return {
+        'motion_intensity': motion_intensity,
+        'peak_motion': peak_motion,
+        'has_significant_motion': motion_intensity > 5.0
+    }
+
 
 class SimpleVideoProcessor:
     """Simplified video processor without complex dependencies"""
@@ -41,17 +292,38 @@ class SimpleVideoProcessor:
     def __init__(self, config: SimpleConfig = None):
         self.config = config or SimpleConfig()
         self.audio_analyzer = AudioVolumeAnalyzer()
+
+        if self.config.shared_decode and self.config.scene_prefilter:
+            logger.warning("scene_prefilter only applies with shared_decode=False; scenes come from the shared decode")
         self.diversity_scorer = DiversityScorer() if DiversityScorer else None
 
         # NEW: Initialize AI analyzer if available
-        self.ai_analyzer = AIVideoAnalyzer() if AI_AVAILABLE else None
+        self.ai_analyzer = AIVideoAnalyzer(**self._ai_options()) if AI_AVAILABLE else None
         if self.ai_analyzer:
             logger.info("🧠 AI-powered analysis enabled")
         else:
             logger.info("📊 Using basic analysis (AI not available)")
 
-    def process_video(self, input_path: str, output_path: str = None) -> Dict:
-        """Main processing pipeline"""
+    def close(self):
+        """Return borrowed AI models to the process-wide registry"""
+        if self.ai_analyzer:
+            self.ai_analyzer.close()
+
+    def process_video(self, input_path: str, output_path: str = None,
+                      deadline: Optional[float] = None, active_jobs: int = 1) -> Dict:
+        """
+        Main processing pipeline
+
+        Args:
+            input_path: Video to process
+            output_path: Highlight file (defaults next to the input)
+            deadline: Seconds the job may take. Stages and sample rates are
+                      planned to fit, AI analysis is added to the best
+                      candidates while time remains, and stages that did not
+                      fit are listed in the metadata's 'skipped_stages'.
+            active_jobs: Jobs queued or running on this worker, including this
+                         one (sizes the Whisper model and its threads)
+        """
 
         start_time = time.time()
 
@@ -64,6 +336,10 @@ class SimpleVideoProcessor:
 
         logger.info(f"Processing video: {input_path}")
 
+        proxy = None
+        audio = AudioFeatures()
+        audio_branch = None
+
         try:
             # Get video info
             cap = cv2.VideoCapture(input_path)
@@ -74,23 +350,91 @@ class SimpleVideoProcessor:
 
             logger.info(f"Video duration: {video_duration:.1f}s, FPS: {fps}")
 
-            # Simple scene detection
-            logger.info("Detecting scenes...")
-            scenes = self._detect_scenes(input_path, video_duration)
+            planner = None
+            plan = None
+            if deadline is not None:
+                # Probing may already have used the whole budget; plan the cheapest tier then
+                planner = DeadlinePlanner(max(0.0, deadline - (time.time() - start_time)))
+                plan = planner.plan(
+                    video_duration, self.config.target_duration,
+                    analysis_proxy=self.config.analysis_proxy,
+                    diversity=self.diversity_scorer is not None
+                )
+
+            # Frame analyzers read a small keyframe-dense proxy instead of the original
+            analysis_path = input_path
+            use_proxy = plan.analysis_proxy if plan else self.config.analysis_proxy
+            if use_proxy:
+                logger.info("Creating analysis proxy...")
+                proxy = AnalysisProxy(
+                    input_path,
+                    height=self.config.proxy_height,
+                    fps=self.config.proxy_fps
+                )
+                analysis_path = proxy.create()
+
+            frame_features = None
+            cheap = None
+            sample_scale = plan.sample_scale if plan else 1
+            use_audio = plan.audio if plan else True
+
+            if plan and not plan.frame_pass:
+                # No time to decode frames: fixed-length scenes, no motion
+                frame_features = self._empty_frame_features()
+                scenes = self._fixed_scenes(video_duration)
+            elif self.config.shared_decode and self.config.pipeline:
+                # Decoder thread -> bounded queues -> analyzer threads, with the audio
+                # branch running alongside and scenes scored as their cuts close
+                logger.info("Decoding video once, pipelined with audio and scene scoring...")
+                audio_branch = ThreadPoolExecutor(max_workers=1, thread_name_prefix='audio')
+                audio_future = audio_branch.submit(
+                    self._prepare_audio, audio, input_path, video_duration, use_audio, active_jobs, planner
+                )
+                frame_features, scenes, cheap = self._run_pipeline(
+                    input_path, analysis_path, video_duration, sample_scale,
+                    faces=planner is None, audio_future=audio_future, audio=audio, analyze_audio=use_audio
+                )
+                audio_future.result()
+            elif self.config.shared_decode:
+                # Single decode pass feeding scene, motion, face and thumbnail analyzers
+                logger.info("Decoding video once for all frame analyzers...")
+                frame_features = self._decode_frame_features(
+                    analysis_path, sample_scale=sample_scale, faces=planner is None
+                )
+                scenes = frame_features.scene_cuts.get_scenes(video_duration)
+            else:
+                # Simple scene detection
+                logger.info("Detecting scenes...")
+                scenes = self._detect_scenes(analysis_path, video_duration, sample_scale)
             logger.info(f"Found {len(scenes)} scenes")
 
+            if audio_branch is None:
+                self._prepare_audio(audio, input_path, video_duration, use_audio, active_jobs, planner)
+
             # Analyze scenes
             logger.info("Analyzing scenes...")
-            segments = self._analyze_scenes(input_path, scenes)
+            if planner and plan.diversity:
+                planner.reserve_diversity(video_duration)
+            segments = self._analyze_scenes(
+                input_path, scenes, frame_features, analysis_path, audio.cache, audio.timeline,
+                planner=planner, analyze_audio=use_audio, transcript=audio.transcript, vad=audio.vad,
+                cheap=cheap, speech=audio.speech
+            )
 
             # Rank and select
             logger.info("Selecting highlights...")
             selected = self._select_highlights(segments)
 
             # Apply diversity scoring to reduce repetition (if available)
-            if self.diversity_scorer:
+            if plan and plan.diversity and planner.remaining() < planner.composition_reserve(self.config.target_duration):
+                planner.skip('diversity')
+                plan.diversity = False
+            if self.diversity_scorer and (plan.diversity if plan else True):
                 logger.info("Applying diversity scoring...")
-                selected = self.diversity_scorer.calculate_diversity_penalty(input_path, selected)
+                thumbnails = frame_features.thumbnails if frame_features else None
+                selected = self.diversity_scorer.calculate_diversity_penalty(
+                    analysis_path, selected, thumbnails=thumbnails
+                )
             else:
                 logger.info("Skipping diversity scoring (not available)")
 
@@ -103,7 +447,7 @@ class SimpleVideoProcessor:
             if not selected:
                 raise ValueError("No segments selected for highlights")
 
-            # Create output video
+            # Create output video (the only stage that reads the original frames)
             logger.info("Creating highlight video...")
             self._create_output_video(input_path, selected, output_path)
 
@@ -117,8 +461,20 @@ class SimpleVideoProcessor:
                 'output_duration': sum(s['end'] - s['start'] for s in selected),
                 'processing_time': processing_time,
                 'segments_selected': len(selected),
-                'segments': selected
+                'segments': selected,
+                'analysis': {
+                    'scenes_total': len(segments),
+                    'ai_scenes': sum(1 for s in segments if s['analysis_tier'] == 'ai'),
+                    'cheap_only_scenes': [
+                        (s['start'], s['end']) for s in segments if s['analysis_tier'] == 'cheap'
+                    ]
+                }
             }
+            if audio.whisper_choice:
+                metadata['whisper'] = dict(audio.whisper_choice.to_dict(), active_jobs=active_jobs)
+            if planner:
+                metadata['deadline'] = planner.report()
+                metadata['skipped_stages'] = metadata['deadline']['skipped_stages']
 
             logger.info(f"Processing complete! Output: {output_path}")
             logger.info(f"Processing time: {processing_time:.2f} seconds")
@@ -129,181 +485,541 @@ class SimpleVideoProcessor:
             logger.error(f"Processing failed: {e}")
             raise
 
-    def _detect_scenes(self, video_path: str, duration: float) -> List[Tuple[float, float]]:
+        finally:
+            if audio_branch:
+                # Wait for the audio thread so nothing it opens outlives cleanup
+                audio_branch.shutdown(wait=True)
+            if audio.transcript:
+                audio.transcript.stop()
+            if proxy:
+                proxy.cleanup()
+            if audio.cache:
+                audio.cache.cleanup()
+
+    def _detect_scenes(self, video_path: str, duration: float,
+                       sample_scale: int = 1) -> List[Tuple[float, float]]:
         """Simple scene detection by analyzing frame differences"""
 
-        cap = cv2.VideoCapture(video_path)
-        fps = cap.get(cv2.CAP_PROP_FPS)
+        scene_cuts = SceneChangeConsumer(interval_scale=sample_scale)
+
+        # Candidate cuts from packet sizes/keyframes, confirmed on consecutive frames around
+        # them (with the prefilter's own threshold; 30 is calibrated for 1 s samples)
+        if self.config.scene_prefilter:
+            cuts = prefilter_cuts(video_path)
+            if cuts is not None:
+                for cut in cuts:
+                    scene_cuts.add_cut(cut)
+                return scene_cuts.get_scenes(duration)
+            logger.warning("Packet metadata unavailable, scanning every frame for scene cuts")
+
+        coarse = replace(COARSE_REQUEST, interval=COARSE_REQUEST.interval * sample_scale)
+        coarse_to_fine = self.config.scene_detection == 'coarse_to_fine'
+
+        # Long videos: detect changes per keyframe-aligned chunk on the worker pool,
+        # then replay them in order so the min-scene-length rule sees every cut
+        executor = self._scene_executor()
+        if executor and self.config.frame_backend == 'opencv':
+            if coarse_to_fine:
+                task = partial(coarse_to_fine_chunk, coarse=coarse)
+            else:
+                task = partial(frame_diff_candidates, request=scene_cuts.request, threshold=scene_cuts.threshold)
+            chunk_cuts = detect_chunked(video_path, duration, task, executor)
+            if chunk_cuts is not None:
+                for cut in merge_cuts(chunk_cuts):
+                    scene_cuts.add_cut(cut)
+                return scene_cuts.get_scenes(duration)
+
+        if coarse_to_fine:
+            for cut in detect_coarse_to_fine(video_path, backend=self.config.frame_backend, coarse=coarse):
+                scene_cuts.add_cut(cut)
+            return scene_cuts.get_scenes(duration)
+
+        for frame_idx, timestamp, frame in iter_frames(
+            video_path, scene_cuts.request, backend=self.config.frame_backend
+        ):
+            scene_cuts.consume(frame_idx, timestamp, frame)
+
+        return scene_cuts.get_scenes(duration)
+
+    def _decode_frame_features(self, video_path: str, sample_scale: int = 1,
+                               faces: bool = True) -> FrameFeatures:
+        """
+        Run every frame analyzer over a single decode of the video
 
-        scenes = []
-        scene_start = 0
-        prev_frame = None
-        frame_idx = 0
-        threshold = 30.0  # Scene change threshold
-
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
+        Args:
+            video_path: Video (or analysis proxy) to decode
+            sample_scale: Multiplies the scene and motion sampling intervals
+            faces: Run face analysis over the whole video in this pass
+        """
+
+        decoder = SharedFrameDecoder(video_path)
+        features = self._register_frame_consumers(decoder, sample_scale, faces)
+        decoder.run()
 
-            # Sample every 30 frames for speed
-            if frame_idx % 30 == 0:
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                gray = cv2.resize(gray, (160, 120))  # Small for speed
+        return features
 
-                if prev_frame is not None:
-                    diff = cv2.absdiff(prev_frame, gray)
-                    mean_diff = np.mean(diff)
+    def _register_frame_consumers(self, decoder: SharedFrameDecoder, sample_scale: int = 1,
+                                  faces: bool = True, on_scene=None) -> FrameFeatures:
+        """Register the scene, motion, face and thumbnail analyzers with a decoder"""
 
-                    # Scene change detected
-                    if mean_diff > threshold:
-                        scene_end = frame_idx / fps
-                        if scene_end - scene_start >= 2.0:  # Min scene length
-                            scenes.append((scene_start, scene_end))
-                            scene_start = scene_end
+        if self.config.scene_detection == 'coarse_to_fine':
+            scene_cuts = CoarseToFineSceneConsumer(decoder.video_path, interval_scale=sample_scale, on_scene=on_scene)
+        else:
+            scene_cuts = SceneChangeConsumer(interval_scale=sample_scale, on_scene=on_scene)
 
-                prev_frame = gray
+        features = FrameFeatures(
+            scene_cuts=decoder.register(scene_cuts),
+            motion=decoder.register(MotionTimelineConsumer(interval_scale=sample_scale))
+        )
 
-            frame_idx += 1
+        # In cascade mode faces are only analyzed for candidate scenes, not the whole video
+        if self.ai_analyzer and faces and not self._cascade_enabled():
+            features.faces = decoder.register(self.ai_analyzer.create_frame_consumer())
 
-        # Add final scene
-        if duration - scene_start >= 2.0:
-            scenes.append((scene_start, duration))
+        if self.diversity_scorer and ThumbnailConsumer:
+            features.thumbnails = decoder.register(ThumbnailConsumer())
 
-        cap.release()
+        return features
 
-        # If no scenes detected, create segments every 5 seconds
-        if not scenes:
-            scenes = []
-            t = 0
-            while t < duration:
-                end_t = min(t + 5, duration)
-                scenes.append((t, end_t))
-                t = end_t
+    def _run_pipeline(self, video_path: str, analysis_path: str, duration: float,
+                      sample_scale: int, faces: bool, audio_future: Future,
+                      audio: AudioFeatures, analyze_audio: bool = True):
+        """
+        Pipelined frame pass with streaming scene scoring
 
+        The decoder thread feeds each frame analyzer through its own bounded
+        queue. Meanwhile this thread takes scenes as their closing cut is
+        found, waits until the motion analyzer has passed the scene's end and
+        the audio branch (`audio_future`, filling `audio`) is ready, and
+        computes the scene's cheap features, so scoring keeps pace with
+        decoding instead of starting after it.
+
+        Returns:
+            (frame_features, scenes, cheap features per scene)
+        """
+        closed: queue.Queue = queue.Queue()
+        decoder = SharedFrameDecoder(analysis_path, queue_size=self.config.pipeline_queue_size)
+        features = self._register_frame_consumers(decoder, sample_scale, faces, on_scene=closed.put)
+        decoder.start()
+
+        streamed: List[Tuple[float, float]] = []
+        cheap = []
+
+        def score(start: float, end: float):
+            audio_future.result()
+            motion_data = features.motion.segment_stats(start, end)
+            audio_data = self._audio_stats(video_path, start, end, audio.cache, audio.timeline, analyze_audio)
+            cheap.append((motion_data, audio_data))
+
+        try:
+            while True:
+                try:
+                    start, end = closed.get(timeout=0.1)
+                except queue.Empty:
+                    if decoder.done() and closed.empty():
+                        break
+                    continue
+
+                decoder.wait_for(features.motion, end)
+                streamed.append((start, end))
+                score(start, end)
+        finally:
+            decoder.join()
+
+        # The final scene (or the fallback split when no cuts were found) closes at the end
+        scenes = features.scene_cuts.get_scenes(duration)
+        if scenes[:len(streamed)] != streamed:
+            streamed, cheap = [], []
+        for start, end in scenes[len(streamed):]:
+            score(start, end)
+
+        logger.info(f"Pipeline: {len(streamed)}/{len(scenes)} scenes scored during decode")
+
+        return features, scenes, cheap
+
+    def _prepare_audio(self, audio: AudioFeatures, input_path: str, video_duration: float,
+                       use_audio: bool = True, active_jobs: int = 1,
+                       planner: Optional[DeadlinePlanner] = None) -> AudioFeatures:
+        """
+        Audio branch: decode the track, find speech, start Whisper, build the timeline
+
+        Fills `audio` step by step, so whatever was created can be cleaned up
+        if a later step fails. Whisper is neither loaded nor run when the plan
+        drops audio or the remaining deadline cannot cover its estimate
+        (`audio.speech` stays False and scenes are scored without speech).
+        """
+        # Decode the audio track once; per-scene audio becomes slices of it
+        if self.config.cache_audio and use_audio:
+            logger.info("Decoding audio track...")
+            audio.cache = AudioPCMCache(input_path)
+            audio.cache.load()
+
+        # Find speech first so Whisper never runs on music, wind or silence
+        if (self.ai_analyzer and self.config.voice_activity
+                and audio.cache is not None and audio.cache.supports(16000)):
+            logger.info("Detecting voice activity...")
+            audio.vad = VoiceActivityDetector(audio.cache.samples(16000), sample_rate=16000)
+
+        # Trade Whisper accuracy for throughput under load or a tight deadline
+        audio.speech = self.ai_analyzer is not None and use_audio
+        if audio.speech:
+            audio_seconds = sum(end - start for start, end in audio.vad.regions) if audio.vad else video_duration
+            policy = WhisperPolicy()
+            adaptive = self.config.whisper_policy == 'adaptive'
+            choice = policy.choose(
+                active_jobs, audio_seconds, deadline=planner.remaining() if planner else None
+            ) if adaptive else self.ai_analyzer.whisper
+
+            # Under a deadline, Whisper is only loaded if even the chosen variant fits before composition
+            estimate = policy.estimate(choice.model_size, choice.cpu_threads, audio_seconds)
+            if planner and estimate > planner.remaining() - planner.composition_reserve(self.config.target_duration):
+                planner.skip('transcription')
+                audio.speech = False
+            elif adaptive:
+                audio.whisper_choice = choice
+                self.ai_analyzer.use_whisper(choice)
+
+        # Whisper runs once over the whole track (or its speech regions) while the scenes are analyzed
+        if audio.speech and self.config.transcription_mode == 'whole':
+            audio.transcript = self.ai_analyzer.start_transcription(
+                input_path, audio.cache, regions=audio.vad.regions if audio.vad else None
+            )
+
+        # Audio features for the whole track; per-scene stats become range queries
+        if self.config.audio_timeline and use_audio:
+            logger.info("Computing audio feature timeline...")
+            audio.timeline = self.audio_analyzer.build_timeline(input_path, audio.cache)
+
+        return audio
+
+    def _audio_stats(self, video_path: str, start: float, end: float,
+                     audio_cache: Optional[AudioPCMCache] = None,
+                     audio_timeline: Optional[AudioFeatureTimeline] = None,
+                     analyze_audio: bool = True) -> Dict:
+        """Volume/excitement stats of a scene from the timeline, the cache or the file"""
+        if audio_timeline:
+            return audio_timeline.analyze_segment(start, end)
+        if analyze_audio:
+            return self.audio_analyzer.analyze_segment(video_path, start, end, audio_cache)
+        return self.audio_analyzer._empty_analysis()
+
+    def _fixed_scenes(self, duration: float, length: float = 5.0) -> List[Tuple[float, float]]:
+        """Fixed-length scenes for jobs without scene detection"""
+        length = min(length, self.config.target_duration)
+        scenes = []
+        t = 0.0
+        while t < duration:
+            end_t = min(t + length, duration)
+            scenes.append((t, end_t))
+            t = end_t
         return scenes
 
-    def _analyze_scenes(self, video_path: str, scenes: List[Tuple[float, float]]) -> List[Dict]:
-        """Analyze each scene for motion, audio, and AI features"""
+    def _empty_frame_features(self) -> FrameFeatures:
+        """Frame features for a job that skipped the frame pass (fixed chunks, zero motion)"""
+        motion = MotionTimelineConsumer()
+        motion.finish()
+        return FrameFeatures(scene_cuts=SceneChangeConsumer(), motion=motion)
+
+    def _analyze_scenes(self, video_path: str, scenes: List[Tuple[float, float]],
+                        frame_features: Optional[FrameFeatures] = None,
+                        analysis_path: Optional[str] = None,
+                        audio_cache: Optional[AudioPCMCache] = None,
+                        audio_timeline: Optional[AudioFeatureTimeline] = None,
+                        planner: Optional[DeadlinePlanner] = None,
+                        analyze_audio: bool = True,
+                        transcript: Optional[BackgroundTranscription] = None,
+                        vad: Optional[VoiceActivityDetector] = None,
+                        cheap: Optional[List[Tuple[Dict, Dict]]] = None,
+                        speech: bool = True) -> List[Dict]:
+        """
+        Analyze each scene for motion, audio, and AI features
+
+        Audio stats come from `audio_timeline` when given, otherwise from
+        `audio_cache` or `video_path`; frames are read from `analysis_path`
+        (the analysis proxy) when given.
+
+        In cascade mode every scene is first scored on cheap features (motion,
+        audio volume, position) and only the best candidates go through the
+        AI models; the rest are marked with analysis_tier 'cheap'. With a
+        deadline `planner`, candidates are analyzed best first while the
+        budget allows. Speech is read from `transcript` (whole-file
+        transcription) when given; scenes without voice activity in `vad`
+        skip Whisper. `cheap` holds (motion, audio) features already computed
+        per scene by the pipelined frame pass. With `speech` False no scene
+        is transcribed.
+        """
 
-        segments = []
+        analysis_path = analysis_path or video_path
+        total_duration = scenes[-1][1] if scenes else 0.0
+
+        executor = self._scene_executor()
+
+        # Per-scene motion decoding is the expensive cheap feature; spread it over the pool
+        scene_motion = None
+        if executor and not frame_features and cheap is None:
+            scene_motion = executor.map(simple_motion_task, analysis_path, scenes)
+
+        # Tier 1: cheap features for every scene (unless the pipeline already scored them)
+        if cheap is None:
+            cheap = []
+            for i, (start, end) in enumerate(scenes):
+                # Existing analysis (read from the shared decode pass when available)
+                if frame_features:
+                    motion_data = frame_features.motion.segment_stats(start, end)
+                elif scene_motion is not None:
+                    motion_data = scene_motion[i]
+                else:
+                    motion_data = self._analyze_motion(analysis_path, start, end)
+
+                audio_data = self._audio_stats(video_path, start, end, audio_cache, audio_timeline, analyze_audio)
+
+                cheap.append((motion_data, audio_data))
+
+        cascade = self.ai_analyzer is not None and (self._cascade_enabled() or planner is not None)
+        if cascade:
+            ai_order = self._select_ai_candidates(scenes, cheap, total_duration)
+            logger.info(f"🔎 Cascade: AI analysis on {len(ai_order)}/{len(scenes)} candidate scenes")
+        elif self.ai_analyzer:
+            ai_order = list(range(len(scenes)))
+        else:
+            ai_order = []
 
-        for i, (start, end) in enumerate(scenes):
-            logger.info(f"Analyzing scene {i+1}/{len(scenes)}")
+        # Tier 2: AI analysis (if available), best candidates first
+        ai_results = {}
+        face_consumer = frame_features.faces if frame_features else None
+
+        if executor and ai_order and planner is None and face_consumer is None:
+            ai_results = self._analyze_ai_parallel(
+                executor, analysis_path, video_path, scenes, ai_order, audio_cache, transcript, vad, speech
+            )
+            ai_order = []
 
-            # Existing analysis
-            motion_data = self._analyze_motion(video_path, start, end)
-            audio_data = self.audio_analyzer.analyze_segment(video_path, start, end)
+        for i in ai_order:
+            start, end = scenes[i]
 
-            # NEW: AI analysis (if available)
+            if planner and not planner.can_afford_ai(end - start, self.config.target_duration):
+                planner.skip(f"ai ({len(ai_order) - len(ai_results)} of {len(ai_order)} candidate scenes)")
+                break
+
+            ai_started = time.time()
             ai_result = None
-            if self.ai_analyzer:
-                try:
-                    logger.info(f"  🧠 AI analyzing scene {i+1} ({start:.1f}s-{end:.1f}s)")
-                    ai_result = self.ai_analyzer.analyze_segment(video_path, start, end)
-                    logger.info(f"  ✅ AI: faces={ai_result.face_score:.2f}, emotion={ai_result.emotion_score:.2f}, speech={ai_result.speech_score:.2f}")
-                except Exception as e:
-                    logger.warning(f"  ⚠️ AI analysis failed for scene {i+1}: {e}")
-                    ai_result = None
-
-            # Simple quality score based on motion
-            quality_score = 0.5 + min(motion_data['motion_intensity'] * 0.01, 0.4)
-
-            # Position score (beginning and end are important)
-            total_duration = scenes[-1][1] if scenes else end
-            position_ratio = start / total_duration if total_duration > 0 else 0
-            position_score = 1.0 if position_ratio < 0.1 else 0.8 if position_ratio > 0.9 else 0.5
-
-            # Audio excitement score
-            audio_score = audio_data.get('excitement_level', 0.0)
-
-            # Calculate score with or without AI
-            if ai_result and AI_AVAILABLE:
-                # NEW: AI-powered scoring (much better!)
-                score = (
-                    ai_result.emotion_score * 0.30 +      # Emotion is most important
-                    ai_result.speech_score * 0.25 +       # Speech keywords very important
-                    ai_result.face_score * 0.15 +         # Having faces is important
-                    audio_score * 0.15 +                  # Loud moments still matter
-                    motion_data['motion_intensity'] * 0.001 +  # Motion less important now (10%)
-                    position_score * 0.05                 # Position minor factor
-                )
-                logger.info(f"  📊 AI Score: {score:.3f} (emotion: {ai_result.emotion_score:.2f}, speech: {ai_result.speech_score:.2f})")
-            else:
-                # Fallback: Original scoring without AI
-                score = (
-                    motion_data['motion_intensity'] * 0.003 +
-                    quality_score * 0.25 +
-                    position_score * 0.20 +
-                    (1 if motion_data['has_significant_motion'] else 0) * 0.25 +
-                    audio_score * 0.30
+            try:
+                logger.info(f"  🧠 AI analyzing scene {i+1} ({start:.1f}s-{end:.1f}s)")
+                ai_result = self.ai_analyzer.analyze_segment(
+                    analysis_path, start, end,
+                    face_consumer=face_consumer,
+                    audio_path=video_path,
+                    audio_cache=audio_cache,
+                    transcript=transcript,
+                    vad=vad,
+                    speech=speech,
+                    transcript_timeout=(
+                        max(0.0, planner.remaining() - planner.composition_reserve(self.config.target_duration))
+                        if planner else None
+                    )
                 )
+                logger.info(f"  ✅ AI: faces={ai_result.face_score:.2f}, emotion={ai_result.emotion_score:.2f}, speech={ai_result.speech_score:.2f}")
+            except Exception as e:
+                logger.warning(f"  ⚠️ AI analysis failed for scene {i+1}: {e}")
+                ai_result = None
 
-            segment = {
-                'start': start,
-                'end': end,
-                'duration': end - start,
-                'score': score,
-                'motion_intensity': motion_data['motion_intensity'],
-                'has_motion': motion_data['has_significant_motion'],
-                'audio_excitement': audio_score,
-                'has_loud_moments': audio_data.get('has_loud_moments', False),
-                'volume_peak': audio_data.get('volume_peak', 0.0),
-                # NEW: AI features
-                'has_faces': ai_result.has_faces if ai_result else False,
-                'has_happy_faces': ai_result.has_happy_faces if ai_result else False,
-                'has_speech': ai_result.has_speech if ai_result else False,
-                'transcription': ai_result.transcription if ai_result else '',
-                'emotion_score': ai_result.emotion_score if ai_result else 0.0,
-                'speech_score': ai_result.speech_score if ai_result else 0.0,
-                'ai_enabled': ai_result is not None
-            }
+            ai_results[i] = ai_result
+            if planner:
+                planner.record_ai_scene(end - start, time.time() - ai_started)
+
+        # Final scoring in scene order
+        segments = []
+
+        for i, (start, end) in enumerate(scenes):
+            motion_data, audio_data = cheap[i]
+
+            segment = self._score_segment(
+                start, end, total_duration, motion_data, audio_data, ai_results.get(i),
+                ai_scale=cascade
+            )
+            segment['analysis_tier'] = 'ai' if i in ai_results else 'cheap'
 
             segments.append(segment)
 
         return segments
 
-    def _analyze_motion(self, video_path: str, start_time: float, end_time: float) -> Dict:
-        """Analyze motion in video segment"""
+    def _scene_executor(self):
+        """Process-wide worker pool for this config, or None for in-process analysis"""
+        if self.config.analysis_workers <= 1:
+            return None
+
+        ai_options = self._ai_options() if self.ai_analyzer else None
+
+        return get_executor(
+            self.config.analysis_workers, init_simple_worker,
+            (self.config.frame_backend, tuple(sorted(ai_options.items())) if ai_options else None)
+        )
+
+    def _ai_options(self) -> Dict:
+        """AIVideoAnalyzer keyword arguments from the config (in-process and in workers)"""
+        return dict(
+            face_detect_every=self.config.face_detect_every,
+            emotion_window=self.config.emotion_window,
+            emotion_batch_size=self.config.emotion_batch_size,
+            emotion_batch_bytes=self.config.emotion_batch_bytes
+        )
+
+    def _analyze_ai_parallel(self, executor, analysis_path: str, video_path: str,
+                             scenes: List[Tuple[float, float]], ai_order: List[int],
+                             audio_cache: Optional[AudioPCMCache],
+                             transcript: Optional[BackgroundTranscription],
+                             vad: Optional[VoiceActivityDetector], speech: bool = True) -> Dict:
+        """
+        AI analysis of candidate scenes with faces and emotions computed in the pool
 
-        cap = cv2.VideoCapture(video_path)
-        fps = cap.get(cv2.CAP_PROP_FPS)
+        Candidates are submitted in time order (contiguous chunks seek forward);
+        speech stays in this process, where the transcript and audio cache live.
 
-        start_frame = int(start_time * fps)
-        end_frame = int(end_time * fps)
-        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+        Returns:
+            Scene index -> AIAnalysisResult (None where the visual analysis failed)
+        """
+        indices = sorted(ai_order)
+        logger.info(f"  🧠 AI analyzing {len(indices)} scenes on {executor.workers} workers")
+        visual = executor.map(simple_visual_task, analysis_path, [scenes[i] for i in indices])
+
+        ai_results = {}
+        for i, visual_data in zip(indices, visual):
+            if visual_data is None:
+                ai_results[i] = None
+                continue
 
-        motion_scores = []
-        prev_gray = None
+            start, end = scenes[i]
+            speech_data = self.ai_analyzer.analyze_speech(
+                video_path, start, end, audio_cache=audio_cache, transcript=transcript, vad=vad, speech=speech
+            )
+            ai_results[i] = self.ai_analyzer.combine(*visual_data, speech_data)
+
+        return ai_results
+
+    def _cascade_enabled(self) -> bool:
+        return self.config.ai_top_k is not None or self.config.ai_coverage_multiple is not None
+
+    def _position_score(self, start: float, total_duration: float) -> float:
+        """Position score (beginning and end are important)"""
+        position_ratio = start / total_duration if total_duration > 0 else 0
+        return 1.0 if position_ratio < 0.1 else 0.8 if position_ratio > 0.9 else 0.5
+
+    def _cheap_score(self, start: float, total_duration: float,
+                     motion_data: Dict, audio_data: Dict) -> float:
+        """Score from motion, audio and position only (the non-AI formula)"""
+        # Simple quality score based on motion
+        quality_score = 0.5 + min(motion_data['motion_intensity'] * 0.01, 0.4)
+
+        return (
+            motion_data['motion_intensity'] * 0.003 +
+            quality_score * 0.25 +
+            self._position_score(start, total_duration) * 0.20 +
+            (1 if motion_data['has_significant_motion'] else 0) * 0.25 +
+            audio_data.get('excitement_level', 0.0) * 0.30
+        )
+
+    def _select_ai_candidates(self, scenes: List[Tuple[float, float]],
+                              cheap: List[Tuple[Dict, Dict]], total_duration: float) -> List[int]:
+        """
+        Pick the scenes worth running the AI models on
+
+        Scenes are ranked by their cheap score and taken until `ai_top_k`
+        scenes are picked or they cover `ai_coverage_multiple` times the
+        target duration, whichever comes first.
 
-        # Sample every 10 frames for speed
-        for frame_idx in range(start_frame, end_frame, 10):
-            ret, frame = cap.read()
-            if not ret:
+        Returns:
+            Scene indices, best candidate first
+        """
+        ranked = sorted(
+            range(len(scenes)),
+            key=lambda i: self._cheap_score(scenes[i][0], total_duration, *cheap[i]),
+            reverse=True
+        )
+
+        top_k = self.config.ai_top_k
+        coverage_target = (
+            self.config.target_duration * self.config.ai_coverage_multiple
+            if self.config.ai_coverage_multiple is not None else None
+        )
+
+        candidates = []
+        covered = 0.0
+        for i in ranked:
+            if top_k is not None and len(candidates) >= top_k:
+                break
+            if coverage_target is not None and covered >= coverage_target:
                 break
 
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            gray = cv2.resize(gray, (320, 240))
+            start, end = scenes[i]
+            duration = min(end - start, self.config.max_segment_duration)
+            if duration < self.config.min_segment_duration:
+                continue
 
-            if prev_gray is not None:
-                # Simple motion detection using frame difference
-                diff = cv2.absdiff(prev_gray, gray)
-                motion_score = np.mean(diff)
-                motion_scores.append(motion_score)
+            candidates.append(i)
+            covered += duration
 
-            prev_gray = gray
+        return candidates
 
-        cap.release()
+    def _score_segment(self, start: float, end: float, total_duration: float,
+                       motion_data: Dict, audio_data: Dict, ai_result=None,
+                       ai_scale: bool = False) -> Dict:
+        """
+        Final score and segment record for a scene
 
-        motion_intensity = np.mean(motion_scores) if motion_scores else 0
-        peak_motion = np.max(motion_scores) if motion_scores else 0
+        Args:
+            ai_scale: Score scenes without AI results on the AI formula with
+                      zero AI terms, so they rank alongside AI-analyzed scenes
+        """
+        position_score = self._position_score(start, total_duration)
+
+        # Audio excitement score
+        audio_score = audio_data.get('excitement_level', 0.0)
+
+        # Calculate score with or without AI
+        if (ai_result or ai_scale) and AI_AVAILABLE:
+            emotion_score = ai_result.emotion_score if ai_result else 0.0
+            speech_score = ai_result.speech_score if ai_result else 0.0
+            face_score = ai_result.face_score if ai_result else 0.0
+
+            # NEW: AI-powered scoring (much better!)
+            score = (
+                emotion_score * 0.30 +                # Emotion is most important
+                speech_score * 0.25 +                 # Speech keywords very important
+                face_score * 0.15 +                   # Having faces is important
+                audio_score * 0.15 +                  # Loud moments still matter
+                motion_data['motion_intensity'] * 0.001 +  # Motion less important now (10%)
+                position_score * 0.05                 # Position minor factor
+            )
+            if ai_result:
+                logger.info(f"  📊 AI Score: {score:.3f} (emotion: {emotion_score:.2f}, speech: {speech_score:.2f})")
+        else:
+            # Fallback: Original scoring without AI
+            score = self._cheap_score(start, total_duration, motion_data, audio_data)
 
         return {
-            'motion_intensity': motion_intensity,
-            'peak_motion': peak_motion,
-            'has_significant_motion': motion_intensity > 5.0
+            'start': start,
+            'end': end,
+            'duration': end - start,
+            'score': score,
+            'motion_intensity': motion_data['motion_intensity'],
+            'has_motion': motion_data['has_significant_motion'],
+            'audio_excitement': audio_score,
+            'has_loud_moments': audio_data.get('has_loud_moments', False),
+            'volume_peak': audio_data.get('volume_peak', 0.0),
+            # NEW: AI features
+            'has_faces': ai_result.has_faces if ai_result else False,
+            'has_happy_faces': ai_result.has_happy_faces if ai_result else False,
+            'has_speech': ai_result.has_speech if ai_result else False,
+            'transcription': ai_result.transcription if ai_result else '',
+            'emotion_score': ai_result.emotion_score if ai_result else 0.0,
+            'speech_score': ai_result.speech_score if ai_result else 0.0,
+            'ai_enabled': ai_result is not None
         }
 
+    def _analyze_motion(self, video_path: str, start_time: float, end_time: float) -> Dict:
+        """Analyze motion in video segment"""
+        return segment_motion(video_path, start_time, end_time, self.config.frame_backend)
+
     def _select_highlights(self, segments: List[Dict]) -> List[Dict]:
         """Select best segments for highlight reel"""
 
@@ -0,0 +1,183 @@
+"""
+Whole-File Transcription
+Transcribes a job's audio once in the background and answers per-scene queries
+"""
+
+import bisect
+import threading
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .audio_cache import AudioPCMCache
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptIndex:
+    """
+    Interval index over timestamped transcript segments
+
+    Segments are appended in start-time order (the order Whisper emits them).
+    A running maximum of end times lets a query skip every segment that ends
+    before the range, so overlap lookups cost O(log n + matches).
+    """
+
+    def __init__(self):
+        self.segments: List[Dict] = []
+        self._starts: List[float] = []
+        self._max_ends: List[float] = []
+
+    def add(self, segment: Dict):
+        """Append a segment (start times must be non-decreasing)"""
+        max_end = max(self._max_ends[-1], segment['end']) if self._max_ends else segment['end']
+        self.segments.append(segment)
+        self._starts.append(segment['start'])
+        self._max_ends.append(max_end)
+
+    def overlapping(self, start_time: float, end_time: float) -> List[Dict]:
+        """Segments that overlap [start_time, end_time)"""
+        lo = bisect.bisect_right(self._max_ends, start_time)
+        hi = bisect.bisect_left(self._starts, end_time)
+        return [
+            segment for segment in self.segments[lo:hi]
+            if segment['end'] > start_time
+        ]
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+
+class BackgroundTranscription:
+    """
+    Runs Whisper once over a job's audio in a worker thread
+
+    Scene analysis queries `segment_result(start, end)`, which returns as
+    soon as the worker has transcribed past `end`; segments are assigned to
+    scenes by interval overlap, so words are never cut at scene boundaries
+    and no per-scene Whisper call is made. With `regions`, only those
+    (start, end) spans are transcribed, e.g. VAD-merged speech regions;
+    scenes outside them never touch the model.
+    """
+
+    def __init__(self, transcriber, video_path: str,
+                 audio_cache: Optional[AudioPCMCache] = None,
+                 regions: Optional[Sequence[Tuple[float, float]]] = None):
+        """
+        Initialize BackgroundTranscription
+
+        Args:
+            transcriber: AudioTranscriber with a loaded model
+            video_path: Audio source when no cache is given (decoded by faster-whisper)
+            audio_cache: Job-wide decoded audio (16 kHz track is transcribed in memory)
+            regions: Spans to transcribe (None = the whole track)
+        """
+        self.transcriber = transcriber
+        self.video_path = video_path
+        self.audio_cache = audio_cache
+        self.regions = list(regions) if regions is not None else None
+
+        self.index = TranscriptIndex()
+        self.info: Dict = {}
+        self.progress = 0.0  # Audio time up to which the index is complete
+        self.done = False
+        self.error: Optional[Exception] = None
+
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'BackgroundTranscription':
+        """Start the worker thread"""
+        self._thread = threading.Thread(target=self._run, name='transcription', daemon=True)
+        self._thread.start()
+        logger.info("🎙️ Whole-file transcription started in background")
+        return self
+
+    def _sources(self):
+        """(audio_input, offset, end) for each span to transcribe"""
+        use_cache = self.audio_cache is not None and self.audio_cache.supports(16000)
+
+        if self.regions is None:
+            if use_cache:
+                yield self.audio_cache.samples(16000), 0.0, float('inf')
+            else:
+                yield self.video_path, 0.0, float('inf')
+            return
+
+        for start, end in self.regions:
+            if use_cache:
+                yield self.audio_cache.segment_float(start, end, 16000), start, end
+            else:
+                # No decoded audio to slice; stream the region from ffmpeg
+                yield self.transcriber._extract_audio_segment(self.video_path, start, end), start, end
+
+    def _run(self):
+        try:
+            for audio_input, offset, end in self._sources():
+                if self._stop.is_set():
+                    break
+                if audio_input is None or (not isinstance(audio_input, str) and len(audio_input) == 0):
+                    self._advance(end)
+                    continue
+
+                for segment in self.transcriber.transcribe(
+                    audio_input, offset=offset, info=self.info, stop_event=self._stop
+                ):
+                    with self._condition:
+                        self.index.add(segment)
+                        self.progress = max(self.progress, segment['start'])
+                        self._condition.notify_all()
+
+                self._advance(end)
+
+            logger.info(f"🎙️ Transcription finished: {len(self.index)} segments")
+        except Exception as e:
+            logger.warning(f"Whole-file transcription failed: {e}")
+            self.error = e
+        finally:
+            with self._condition:
+                self.done = True
+                self.progress = float('inf')
+                self._condition.notify_all()
+
+    def _advance(self, time_point: float):
+        with self._condition:
+            self.progress = max(self.progress, time_point)
+            self._condition.notify_all()
+
+    def wait_until(self, time_point: float, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the transcript is complete up to `time_point`
+
+        Returns:
+            False if the timeout expired first
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self.progress >= time_point, timeout)
+
+    def segment_result(self, start_time: float, end_time: float,
+                       timeout: Optional[float] = None) -> Dict:
+        """
+        Transcription result for a scene, shaped like AudioTranscriber.transcribe_segment
+
+        Args:
+            start_time, end_time: Scene boundaries in seconds
+            timeout: Seconds to wait for the worker (None = wait as long as needed)
+        """
+        # A segment starting after end_time cannot overlap the scene
+        self.wait_until(end_time, timeout)
+
+        with self._condition:
+            segments = self.index.overlapping(start_time, end_time)
+
+        if not segments:
+            return self.transcriber._empty_result()
+
+        return self.transcriber.build_result(segments, **self.info)
+
+    def stop(self):
+        """Stop the worker and wait for it (before the audio cache is released)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -1,7 +1,7 @@
 import os
 import time
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import json
 import cv2
@@ -11,6 +11,7 @@ from .motion_analyzer import MotionAnalyzer
 from .audio_analyzer import AudioAnalyzer
 from .highlight_ranker import HighlightRanker, Segment
 from .video_composer import VideoComposer, CompositionSegment
+from .parallel_analysis import SceneExecutor, get_executor, init_video_processor_worker, video_processor_scene_task
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -25,13 +26,19 @@ class ProcessingConfig:
     output_quality: str = 'high'
     output_resolution: str = '1920x1080'
     output_fps: int = 30
+    analysis_workers: int = 1  # Worker processes for scene detection and per-scene analysis (1 = in-process)
+    scene_prefilter: bool = False  # Scene detection decodes only around packet-metadata cut candidates
+    motion_backend: str = 'vectors'  # 'vectors' = codec motion vectors via PyAV (falls back to flow), 'flow' = Farneback
 
 class VideoProcessor:
     def __init__(self, config: ProcessingConfig = None):
         self.config = config or ProcessingConfig()
 
-        self.scene_detector = SceneDetector()
-        self.motion_analyzer = MotionAnalyzer()
+        self.motion_analyzer = MotionAnalyzer(motion_backend=self.config.motion_backend)
+        self.scene_detector = SceneDetector(
+            workers=self.config.analysis_workers, prefilter=self.config.scene_prefilter,
+            executor=self._scene_executor
+        )
         self.audio_analyzer = AudioAnalyzer()
         self.highlight_ranker = HighlightRanker()
         self.video_composer = VideoComposer()
@@ -112,25 +119,43 @@ class VideoProcessor:
             logger.error(f"Processing failed: {e}")
             raise
 
+    def _scene_executor(self) -> SceneExecutor:
+        """Worker pool shared by chunked scene detection and per-scene analysis"""
+        return get_executor(
+            self.config.analysis_workers, init_video_processor_worker,
+            (self.motion_analyzer.frame_backend, self.config.enable_speech_recognition, self.config.motion_backend)
+        )
+
     def _analyze_scenes(self, video_path: str, scenes: List[Tuple[float, float]]) -> List[Segment]:
         """Analyze each scene for various features"""
 
         segments = []
         total_scenes = len(scenes)
 
+        # Scenes are independent; analyze them on a worker pool when configured
+        scene_data = None
+        if self.config.analysis_workers > 1:
+            executor = self._scene_executor()
+            logger.info(f"Analyzing {total_scenes} scenes on {executor.workers} workers")
+            long_scenes = [(s, e) for s, e in scenes if e - s >= 0.5]
+            scene_data = dict(zip(long_scenes, executor.map(video_processor_scene_task, video_path, long_scenes)))
+
         for i, (start_time, end_time) in enumerate(scenes):
             logger.info(f"Analyzing scene {i+1}/{total_scenes}")
 
             if end_time - start_time < 0.5:
                 continue
 
-            motion_data = self.motion_analyzer.analyze_segment(
-                video_path, start_time, end_time
-            )
+            if scene_data is not None:
+                motion_data, audio_data = scene_data[(start_time, end_time)]
+            else:
+                motion_data = self.motion_analyzer.analyze_segment(
+                    video_path, start_time, end_time
+                )
 
-            audio_data = self.audio_analyzer.analyze_segment(
-                video_path, start_time, end_time
-            ) if self.config.enable_speech_recognition else {}
+                audio_data = self.audio_analyzer.analyze_segment(
+                    video_path, start_time, end_time
+                ) if self.config.enable_speech_recognition else {}
 
             quality_score = 0.5 + (motion_data.get('motion_intensity', 0) * 0.01)
             quality_score = min(1.0, quality_score)
@@ -0,0 +1,147 @@
+"""
+Voice Activity Detection
+Energy and zero-crossing pre-pass that finds where Whisper is worth running
+"""
+
+import bisect
+import numpy as np
+import logging
+from typing import List, Tuple
+
+from .audio_volume_analyzer import frame_features
+
+logger = logging.getLogger(__name__)
+
+
+class VoiceActivityDetector:
+    """
+    Frame-level speech probability for a whole track
+
+    Uses the same strided RMS / zero-crossing framing as AudioVolumeAnalyzer
+    (25 ms frames, 10 ms hop). A frame's speech probability combines its
+    energy above the track's noise floor with a zero-crossing rate in the
+    range of speech; probabilities are smoothed and thresholded into voiced
+    regions. Voiced-frame counts are prefix-summed and regions are looked up
+    by bisection, so per-scene queries do not scan the track.
+    """
+
+    def __init__(
+        self,
+        y: np.ndarray,
+        sample_rate: int = 16000,
+        frame_ms: float = 25.0,
+        hop_ms: float = 10.0,
+        margin_db: float = 10.0,
+        min_level_db: float = -50.0,
+        zcr_range: Tuple[float, float] = (0.01, 0.35),
+        smooth_ms: float = 150.0,
+        min_speech: float = 0.25,
+        merge_gap: float = 0.3,
+        padding: float = 0.2
+    ):
+        """
+        Initialize VoiceActivityDetector and run the pre-pass
+
+        Args:
+            y: Mono samples for the whole track (float in [-1, 1])
+            sample_rate: Sample rate of y
+            frame_ms, hop_ms: Analysis frame and hop
+            margin_db: Energy above the noise floor (10th percentile) that counts as activity
+            min_level_db: Absolute energy below which nothing is speech
+            zcr_range: Zero-crossing rates typical of speech (per sample)
+            smooth_ms: Moving-average window over frame probabilities
+            min_speech: Shortest voiced region kept, in seconds
+            merge_gap: Regions closer than this are merged, in seconds
+            padding: Seconds added around each region (keeps word onsets)
+        """
+        self.sample_rate = sample_rate
+        self.hop_length = max(1, int(sample_rate * hop_ms / 1000))
+        frame_length = max(self.hop_length, int(sample_rate * frame_ms / 1000))
+        self.hop_seconds = self.hop_length / sample_rate
+        self.frame_seconds = frame_length / sample_rate
+
+        rms, zcr = frame_features(y, frame_length, self.hop_length)
+
+        if len(rms) == 0:
+            self.probability = np.zeros(0)
+            self.voiced = np.zeros(0, dtype=bool)
+            self.regions: List[Tuple[float, float]] = []
+            self._region_ends: List[float] = []
+            self._voiced_count = np.zeros(1)
+            return
+
+        level_db = 20 * np.log10(rms + 1e-10)
+        threshold_db = max(np.percentile(level_db, 10) + margin_db, min_level_db)
+
+        # Soft energy score around the threshold, gated by a speech-like ZCR
+        energy = 1 / (1 + np.exp(-(level_db - threshold_db) / 3.0))
+        zcr_ok = (zcr >= zcr_range[0]) & (zcr <= zcr_range[1])
+        probability = energy * np.where(zcr_ok, 1.0, 0.3)
+
+        width = max(1, int(smooth_ms / hop_ms))
+        if width > 1:
+            probability = np.convolve(probability, np.ones(width) / width, mode='same')
+
+        self.probability = probability
+        self.voiced = probability > 0.5
+
+        self._voiced_count = np.zeros(len(self.voiced) + 1)
+        np.cumsum(self.voiced, out=self._voiced_count[1:])
+
+        self.regions = self._build_regions(min_speech, merge_gap, padding, len(y) / sample_rate)
+        self._region_ends = [end for _, end in self.regions]
+
+        voiced_seconds = sum(end - start for start, end in self.regions)
+        logger.info(
+            f"🗣️ VAD: {len(self.regions)} speech regions, "
+            f"{voiced_seconds:.1f}s of {len(y) / sample_rate:.1f}s"
+        )
+
+    def _build_regions(self, min_speech: float, merge_gap: float, padding: float,
+                       duration: float) -> List[Tuple[float, float]]:
+        """Voiced frames to merged, padded (start, end) regions in seconds"""
+        edges = np.diff(np.concatenate([[0], self.voiced.astype(np.int8), [0]]))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+
+        merged = []
+        for s, e in zip(starts, ends):
+            start = float(s * self.hop_seconds)
+            end = float((e - 1) * self.hop_seconds + self.frame_seconds)
+
+            if merged and start - merged[-1][1] < merge_gap:
+                merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+
+        # Drop blips, pad, and merge regions the padding made overlap
+        regions = []
+        for start, end in merged:
+            if end - start < min_speech:
+                continue
+            start, end = max(0.0, start - padding), min(duration, end + padding)
+            if regions and start <= regions[-1][1]:
+                regions[-1] = (regions[-1][0], end)
+            else:
+                regions.append((start, end))
+
+        return regions
+
+    def voiced_seconds(self, start_time: float, end_time: float) -> float:
+        """Voiced frame time inside [start_time, end_time)"""
+        lo = min(len(self.voiced), max(0, int(start_time / self.hop_seconds)))
+        hi = min(len(self.voiced), max(lo, int(end_time / self.hop_seconds)))
+        return float(self._voiced_count[hi] - self._voiced_count[lo]) * self.hop_seconds
+
+    def regions_in(self, start_time: float, end_time: float) -> List[Tuple[float, float]]:
+        """Speech regions clipped to [start_time, end_time)"""
+        clipped = []
+        i = bisect.bisect_right(self._region_ends, start_time)
+        while i < len(self.regions) and self.regions[i][0] < end_time:
+            start, end = self.regions[i]
+            clipped.append((max(start, start_time), min(end, end_time)))
+            i += 1
+        return clipped
+
+    def has_speech(self, start_time: float, end_time: float) -> bool:
+        return bool(self.regions_in(start_time, end_time))
@@ -0,0 +1,128 @@
+"""
+Whisper Policy
+Picks the Whisper model size and thread count for a job from load and deadline
+"""
+
+import os
+import logging
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Approximate real-time factor of faster-whisper INT8 on 4 CPU threads
+MODEL_SPEEDS = {
+    'tiny.en': 32.0,
+    'base.en': 16.0,
+    'small.en': 6.0,
+}
+
+MODEL_SIZES = ('tiny.en', 'base.en', 'small.en')  # Fastest to most accurate
+
+
+@dataclass
+class WhisperChoice:
+    """Model variant chosen for a job"""
+    model_size: str = 'base.en'
+    cpu_threads: int = 4  # The job's share of the cores; the model variant is loaded with exactly this many
+    compute_type: str = 'int8'
+    reason: str = 'default'
+    estimated_seconds: float = 0.0
+
+    @property
+    def key(self) -> str:
+        """
+        Model registry key of this variant
+
+        Threads are part of the key: CTranslate2 fixes them when a model is
+        loaded, so a job limited to a share of the cores gets a model loaded
+        with that share instead of one sized for an idle machine.
+        """
+        return f"whisper:{self.model_size}:{self.compute_type}:{self.cpu_threads}"
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class WhisperPolicy:
+    """
+    Chooses a Whisper variant per job
+
+    Threads are the job's share of the CPU cores among the active jobs. The
+    model size follows that share: a job with 4 or more cores to itself can
+    afford small.en, one with 2-3 gets base.en, and once jobs crowd the
+    cores further it drops to tiny.en for throughput. A deadline then
+    steps the size down until the estimated transcription time fits in the
+    share of the deadline transcription may use (it runs alongside scene
+    analysis, so it need not fit in the whole budget).
+    """
+
+    def __init__(self, cpu_count: Optional[int] = None, max_threads: int = 8,
+                 deadline_share: float = 0.5, compute_type: str = 'int8'):
+        """
+        Initialize WhisperPolicy
+
+        Args:
+            cpu_count: Cores available to the worker (None = os.cpu_count())
+            max_threads: Upper bound on threads per job (returns diminish past ~8)
+            deadline_share: Fraction of a job's deadline transcription may take
+            compute_type: faster-whisper compute type for every variant
+        """
+        self.cpu_count = cpu_count or os.cpu_count() or 4
+        self.max_threads = max_threads
+        self.deadline_share = deadline_share
+        self.compute_type = compute_type
+
+    def estimate(self, model_size: str, cpu_threads: int, audio_seconds: float) -> float:
+        """Estimated seconds to transcribe audio_seconds of speech"""
+        speed = MODEL_SPEEDS[model_size] * cpu_threads / 4
+        return audio_seconds / speed
+
+    def choose(self, active_jobs: int = 1, audio_seconds: float = 0.0,
+               deadline: Optional[float] = None) -> WhisperChoice:
+        """
+        Pick a variant for a job
+
+        Args:
+            active_jobs: Jobs queued or running, including this one
+            audio_seconds: Audio Whisper will see (speech regions, or the whole track)
+            deadline: Seconds the job may take, if it has a deadline
+
+        Returns:
+            WhisperChoice
+        """
+        jobs = max(1, active_jobs)
+        threads = max(1, min(self.max_threads, self.cpu_count // jobs))
+
+        # Cores each job actually gets once the active jobs split the machine
+        share = self.cpu_count / jobs
+        if share >= 4:
+            size, reason = 'small.en', 'off-peak'
+        elif share >= 2:
+            size, reason = 'base.en', 'moderate load'
+        else:
+            size, reason = 'tiny.en', 'peak load'
+
+        if deadline is not None:
+            budget = deadline * self.deadline_share
+            index = MODEL_SIZES.index(size)
+            while index > 0 and self.estimate(MODEL_SIZES[index], threads, audio_seconds) > budget:
+                index -= 1
+                reason = 'deadline'
+            size = MODEL_SIZES[index]
+
+        choice = WhisperChoice(
+            model_size=size,
+            cpu_threads=threads,
+            compute_type=self.compute_type,
+            reason=reason,
+            estimated_seconds=self.estimate(size, threads, audio_seconds)
+        )
+
+        logger.info(
+            f"🎙️ Whisper policy: {size} x{threads} threads ({reason}; "
+            f"{jobs} active jobs, {self.cpu_count} cores)"
+        )
+
+        return choice
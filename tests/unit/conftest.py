@@ -0,0 +1,13 @@
+import pytest
+
+from helpers import CUTS, CUTS_FRAMES, write_cuts_video, write_index_video
+
+
+@pytest.fixture(scope='session')
+def index_video(tmp_path_factory):
+    return write_index_video(str(tmp_path_factory.mktemp('video') / 'index.mp4'))
+
+
+@pytest.fixture(scope='session')
+def cuts_video(tmp_path_factory):
+    return write_cuts_video(str(tmp_path_factory.mktemp('video') / 'cuts.mp4'), CUTS, CUTS_FRAMES)
@@ -0,0 +1,65 @@
+"""
+Test Helpers
+Synthetic videos whose frames carry their own index or known scene cuts
+"""
+
+import cv2
+import numpy as np
+from typing import Sequence
+
+INDEX_BITS = 10
+INDEX_SIZE = (320, 240)
+
+# The cuts_video fixture: 25 fps, cuts at 8.08 s and 15.08 s
+CUTS = (202, 377)
+CUTS_FRAMES = 625
+
+
+def write_index_video(path: str, frames: int = 300, fps: float = 25.0) -> str:
+    """Video whose frame i shows i in binary as vertical bars (survives scaling and compression)"""
+    width, height = INDEX_SIZE
+    bar = width // INDEX_BITS
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    for i in range(frames):
+        frame = np.zeros((height, width, 3), np.uint8)
+        for b in range(INDEX_BITS):
+            if i >> b & 1:
+                frame[:, b * bar:(b + 1) * bar] = 255
+        out.write(frame)
+    out.release()
+    return path
+
+
+def read_index(frame: np.ndarray) -> int:
+    """Frame index shown by a frame of write_index_video, at any size, gray or BGR"""
+    if frame.ndim == 3:
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    bar = frame.shape[1] / INDEX_BITS
+    index = 0
+    for b in range(INDEX_BITS):
+        lo, hi = int(b * bar + bar / 4), int((b + 1) * bar - bar / 4)
+        if frame[:, lo:hi].mean() > 127:
+            index |= 1 << b
+    return index
+
+
+def write_cuts_video(path: str, cuts: Sequence[int], frames: int, fps: float = 25.0,
+                     size=(320, 180), seed: int = 0) -> str:
+    """
+    Video with hard cuts at the given frame indices
+
+    Each shot has its own colors and a moving circle, so consecutive frames
+    differ a little everywhere and a lot at the cuts.
+    """
+    width, height = size
+    colors = np.random.default_rng(seed).integers(0, 255, (len(cuts) + 1, 3))
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    for i in range(frames):
+        shot = sum(i >= c for c in cuts)
+        frame = np.zeros((height, width, 3), np.uint8)
+        frame[:] = colors[shot]
+        frame[:, :width // 3] = 255 - colors[shot]
+        cv2.circle(frame, (int(width / 2 + 100 * np.sin(i * 0.15)), height // 2), 20, (255, 255, 255), -1)
+        out.write(frame)
+    out.release()
+    return path
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from core.audio_volume_analyzer import AudioFeatureTimeline, frame_features, pick_peaks
+
+SR = 22050
+
+
+@pytest.fixture(scope='module')
+def track():
+    """60 s of bursts over noise, with a stretch of digital silence"""
+    rng = np.random.default_rng(0)
+    y = rng.normal(0, 0.02, SR * 60).astype(np.float32)
+    for t in rng.uniform(0, 58, 40):
+        i = int(t * SR)
+        y[i:i + SR // 4] += rng.normal(0, 0.4, SR // 4).astype(np.float32)
+    y[SR * 20:SR * 25] = 0
+    return y
+
+
+@pytest.fixture(scope='module')
+def timeline(track):
+    return AudioFeatureTimeline(track, SR)
+
+
+def test_frame_features_match_a_direct_computation(track):
+    rms, zcr = frame_features(track)
+
+    frames = np.stack([track[i:i + 2048].astype(np.float64) for i in range(0, len(track) - 2048, 512)])
+    assert rms.dtype == np.float32 and zcr.dtype == np.float32
+    assert rms == pytest.approx(np.sqrt(np.mean(frames ** 2, axis=1)), rel=1e-5)
+    assert zcr == pytest.approx(np.abs(np.diff(np.sign(frames), axis=1)).sum(axis=1) / 2 / 2048)
+
+
+def test_frame_features_average_channels():
+    stereo = np.stack([np.full(8192, 0.5, np.float32), np.full(8192, -0.1, np.float32)], axis=1)
+    rms, _ = frame_features(stereo)
+    assert rms == pytest.approx(np.full(len(rms), 0.2))
+
+
+@pytest.mark.parametrize('start, end', [
+    (0.0, 60.0), (3.3, 9.7), (19.0, 26.0), (21.0, 24.0), (12.0, 12.5), (40.0, 40.3), (57.1, 60.0),
+])
+def test_segment_queries_match_the_frames_inside_the_segment(track, timeline, start, end):
+    rms, zcr = frame_features(track)
+    lo, hi = timeline.frame_range(start, end)
+    assert lo * 512 >= start * SR and (hi - 1) * 512 + 2048 <= end * SR
+
+    segment = rms[lo:hi].astype(np.float64)
+    result = timeline.analyze_segment(start, end)
+
+    assert result['volume_mean'] == pytest.approx(segment.mean(), rel=1e-5, abs=1e-7)
+    assert result['volume_std'] == pytest.approx(segment.std(), rel=1e-3, abs=1e-6)
+    assert result['volume_peak'] == pytest.approx(segment.max())
+    assert result['audio_dynamic_range'] == pytest.approx(segment.max() - segment.min())
+    assert result['spectral_flux_mean'] == pytest.approx(np.abs(np.diff(segment)).mean(), rel=1e-5, abs=1e-7)
+    assert result['zero_crossing_rate'] == pytest.approx(zcr[lo:hi].mean(), rel=1e-5)
+    assert result['silence_ratio'] == pytest.approx(np.mean(segment < 0.01))
+
+
+def test_range_extremes_on_block_edges(track, timeline):
+    rms, _ = frame_features(track)
+    block = AudioFeatureTimeline.BLOCK_FRAMES
+    for lo, hi in [(0, 1), (0, block), (block, 2 * block), (block - 1, block + 1), (5, 3 * block + 7),
+                   (len(rms) - 3, len(rms)), (0, len(rms))]:
+        assert timeline._range_extreme(timeline._block_max, np.maximum, lo, hi) == rms[lo:hi].max()
+        assert timeline._range_extreme(timeline._block_min, np.minimum, lo, hi) == rms[lo:hi].min()
+
+
+def test_empty_segments_and_tracks():
+    timeline = AudioFeatureTimeline(np.zeros(1000, np.float32), SR)
+    assert timeline.num_frames == 0
+    assert timeline.analyze_segment(0.0, 1.0)['excitement_level'] == 0.0
+
+
+def test_pick_peaks_ignores_edges_and_plateaus():
+    x = np.array([5.0, 1.0, 3.0, 1.0, 2.0, 2.0, 1.0, 4.0])
+    assert pick_peaks(x, 0.0).tolist() == [2]
+    assert pick_peaks(x, 3.0).tolist() == []
+
+
+@pytest.mark.parametrize('start, end', [(0.0, 60.0), (3.3, 9.7), (19.0, 26.0), (40.0, 45.0)])
+def test_onsets_and_spikes_use_the_segments_own_threshold(track, timeline, start, end):
+    rms, _ = frame_features(track)
+    lo, hi = timeline.frame_range(start, end)
+    segment = rms[lo:hi]
+    threshold = np.percentile(segment, 75)
+
+    result = timeline.analyze_segment(start, end)
+
+    assert result['num_spikes'] == np.count_nonzero(segment > threshold)
+    assert result['num_onsets'] == len(pick_peaks(segment, threshold))
+    assert result['onset_times'] == pytest.approx(pick_peaks(segment, threshold) * 512 / SR)
+
+
+def test_timeline_matches_the_per_segment_analyzer(track, timeline):
+    from core.audio_volume_analyzer import AudioVolumeAnalyzer
+
+    # A segment starting on a frame boundary sees the same frames either way (framing of
+    # a standalone clip drops a last frame that ends exactly on its end, hence one extra sample)
+    start, end = 512 * 300 / SR, 512 * 700 / SR
+    direct = AudioVolumeAnalyzer()._analyze_samples(track[round(start * SR):round(end * SR) + 1], SR)
+    result = timeline.analyze_segment(start, end)
+
+    for key in ('num_onsets', 'num_spikes', 'volume_peak', 'silence_ratio'):
+        assert result[key] == pytest.approx(direct[key]), key
+    assert result['excitement_level'] == pytest.approx(direct['excitement_level'], rel=1e-4)
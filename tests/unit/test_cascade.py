@@ -0,0 +1,43 @@
+import pytest
+
+from core.simple_processor import SimpleConfig, SimpleVideoProcessor
+
+
+def processor(**config):
+    # Candidate selection only reads the config; skip loading the AI models
+    proc = object.__new__(SimpleVideoProcessor)
+    proc.config = SimpleConfig(**config)
+    return proc
+
+
+def motion(intensity):
+    return {'motion_intensity': intensity, 'has_significant_motion': intensity > 5.0}
+
+
+SCENES = [(0.0, 4.0), (4.0, 8.0), (8.0, 8.5), (8.5, 14.0), (14.0, 30.0), (30.0, 34.0)]
+CHEAP = [(motion(m), {'excitement_level': e}) for m, e in [(1, 0.1), (20, 0.9), (50, 1.0), (10, 0.5), (30, 0.2), (2, 0.0)]]
+
+
+def test_cascade_is_opt_in():
+    assert not processor()._cascade_enabled()
+    assert processor(ai_top_k=3)._cascade_enabled()
+    assert processor(ai_coverage_multiple=2.0)._cascade_enabled()
+
+
+def test_candidates_are_best_cheap_scores_first_and_skip_short_scenes():
+    proc = processor(target_duration=60)
+    order = proc._select_ai_candidates(SCENES, CHEAP, 34.0)
+
+    scores = [proc._cheap_score(SCENES[i][0], 34.0, *CHEAP[i]) for i in order]
+    assert scores == sorted(scores, reverse=True)
+    assert 2 not in order  # 0.5 s is below min_segment_duration
+    assert sorted(order) == [0, 1, 3, 4, 5]
+
+
+def test_top_k_and_coverage_limits():
+    assert len(processor(target_duration=60, ai_top_k=2)._select_ai_candidates(SCENES, CHEAP, 34.0)) == 2
+
+    # Coverage counts scene durations capped at max_segment_duration (10 s)
+    order = processor(target_duration=5, ai_coverage_multiple=2.0)._select_ai_candidates(SCENES, CHEAP, 34.0)
+    covered = [min(SCENES[i][1] - SCENES[i][0], 10.0) for i in order]
+    assert sum(covered[:-1]) < 10.0 <= sum(covered)
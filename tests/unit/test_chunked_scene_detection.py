@@ -0,0 +1,78 @@
+import pytest
+
+import core.chunked_scene_detection as chunked
+from core.chunked_scene_detection import (
+    cuts_to_scenes, detect_chunked, frame_diff_candidates, merge_cuts, plan_chunks, probe_keyframes
+)
+from core.frame_source import FrameRequest
+from helpers import CUTS, CUTS_FRAMES
+
+
+def test_merge_cuts_keeps_distinct_cuts_in_order():
+    assert merge_cuts([[12.0, 3.0], [], [40.0, 25.0]]) == [3.0, 12.0, 25.0, 40.0]
+
+
+def test_merge_cuts_merges_a_boundary_cut_reported_by_both_chunks():
+    # Chunk boundary at 60 s: both neighbors see the cut right at it
+    assert merge_cuts([[10.0, 59.96], [60.0, 90.0]], tolerance=0.08) == [10.0, 59.96, 90.0]
+
+
+def test_merge_cuts_tolerance_edge_is_inclusive():
+    assert merge_cuts([[10.0], [10.5]], tolerance=0.5) == [10.0]
+    assert merge_cuts([[10.0], [10.51]], tolerance=0.5) == [10.0, 10.51]
+
+
+def test_merge_cuts_min_gap_is_measured_from_the_last_kept_cut():
+    assert merge_cuts([[10.0, 10.4, 10.8, 11.2]], min_gap=0.5) == [10.0, 10.8]
+
+
+def test_plan_chunks_without_keyframes_splits_evenly():
+    assert plan_chunks(300.0, 3) == [(0.0, 100.0), (100.0, 200.0), (200.0, 300.0)]
+    assert plan_chunks(300.0, 3, keyframes=[]) == plan_chunks(300.0, 3)
+
+
+def test_plan_chunks_snaps_to_keyframes_and_drops_collapsed_boundaries():
+    assert plan_chunks(300.0, 3, keyframes=[0.0, 96.0, 210.0]) == [(0.0, 96.0), (96.0, 210.0), (210.0, 300.0)]
+    # Both boundaries snap to the only interior keyframe
+    assert plan_chunks(300.0, 3, keyframes=[0.0, 150.0]) == [(0.0, 150.0), (150.0, 300.0)]
+
+
+def test_probe_keyframes_without_ffprobe_is_empty(monkeypatch, cuts_video):
+    monkeypatch.setattr(chunked.shutil, 'which', lambda name: None)
+
+    assert probe_keyframes(cuts_video) == []
+
+
+class SerialExecutor:
+    workers = 2
+    chunks_per_worker = 2
+
+    def map(self, task, video_path, chunks):
+        self.chunks = chunks
+        return [task(video_path, start, end) for start, end in chunks]
+
+
+def test_detect_chunked_without_ffprobe_uses_the_even_split(monkeypatch):
+    monkeypatch.setattr(chunked.shutil, 'which', lambda name: None)
+    executor = SerialExecutor()
+
+    result = detect_chunked('video.mp4', 600.0, lambda path, start, end: [start], executor)
+
+    assert executor.chunks == [(0.0, 150.0), (150.0, 300.0), (300.0, 450.0), (450.0, 600.0)]
+    assert result == [[0.0], [150.0], [300.0], [450.0]]
+
+
+def test_detect_chunked_leaves_short_videos_to_a_single_pass():
+    assert detect_chunked('video.mp4', 200.0, lambda path, start, end: [], SerialExecutor()) is None
+
+
+def test_chunk_candidates_equal_the_single_pass(cuts_video):
+    request = FrameRequest(interval=1.0, size=(160, 120), grayscale=True)
+    duration = CUTS_FRAMES / 25
+    single = frame_diff_candidates(cuts_video, 0.0, duration, request)
+    chunks = plan_chunks(duration, 3)
+    merged = merge_cuts([frame_diff_candidates(cuts_video, start, end, request) for start, end in chunks])
+
+    assert merged == single
+    assert len(single) == len(CUTS)
+    assert cuts_to_scenes(single, duration)[-1][1] == pytest.approx(duration)
@@ -0,0 +1,112 @@
+import pytest
+
+from core.deadline_planner import DEFAULT_STAGE_COSTS, DeadlinePlanner
+from core.simple_processor import AudioFeatures, SimpleConfig, SimpleVideoProcessor
+from core.whisper_policy import WhisperChoice
+
+
+def test_negative_deadlines_are_rejected():
+    with pytest.raises(ValueError):
+        DeadlinePlanner(-1.0)
+
+
+def test_generous_deadline_keeps_every_stage():
+    plan = DeadlinePlanner(3600).plan(600, 60)
+
+    assert (plan.analysis_proxy, plan.frame_pass, plan.sample_scale, plan.audio, plan.diversity) == \
+        (True, True, 1, True, True)
+    assert plan.skipped_stages == []
+
+
+def test_spent_deadline_plans_the_cheapest_tier():
+    planner = DeadlinePlanner(0)
+    plan = planner.plan(600, 60)
+
+    assert not plan.frame_pass and not plan.audio and not plan.diversity
+    assert set(plan.skipped_stages) >= {'scene_detection', 'motion', 'audio', 'diversity'}
+    assert not planner.can_afford_ai(5.0, 60)
+
+
+def test_tight_deadline_samples_coarser_before_dropping_the_frame_pass():
+    costs = DEFAULT_STAGE_COSTS
+    duration, target = 600, 30
+    reserve = target * costs['composition'] + duration * costs['audio']
+    full = duration * (costs['analysis_proxy'] + costs['frame_decode_proxy'] + costs['frame_samples'])
+    quarter = duration * (costs['analysis_proxy'] + costs['frame_decode_proxy'] + costs['frame_samples'] / 4)
+
+    # Usable budget between the x4 and x1 frame pass costs
+    planner = DeadlinePlanner((reserve + (full + quarter) / 2) / 0.85)
+    plan = planner.plan(duration, target)
+
+    assert plan.frame_pass and plan.audio
+    assert plan.sample_scale > 1
+    assert 'full_rate_sampling' in plan.skipped_stages
+
+
+def test_ai_cost_is_learned_from_measured_scenes():
+    planner = DeadlinePlanner(100)
+    assert planner.ai_scene_cost(10) == pytest.approx(10 * DEFAULT_STAGE_COSTS['ai_scene'])
+
+    planner.record_ai_scene(10, 1.0)
+    planner.record_ai_scene(10, 3.0)
+    assert planner.ai_scene_cost(5) == pytest.approx(1.0)
+
+
+def test_skips_are_recorded_once_and_reported():
+    planner = DeadlinePlanner(100)
+    planner.skip('diversity')
+    planner.skip('diversity')
+
+    report = planner.report()
+    assert report['skipped_stages'] == ['diversity']
+    assert report['met']
+
+
+class FakeAIAnalyzer:
+    """Records whether the audio branch loaded or started Whisper"""
+
+    def __init__(self):
+        self.whisper = WhisperChoice()
+        self.switched = []
+        self.started = 0
+
+    def use_whisper(self, choice):
+        self.switched.append(choice)
+        self.whisper = choice
+
+    def start_transcription(self, video_path, audio_cache=None, regions=None):
+        self.started += 1
+        return None
+
+
+def prepare_audio(use_audio=True, planner=None):
+    # Only the Whisper gating is under test: no audio decode, no timeline
+    proc = object.__new__(SimpleVideoProcessor)
+    proc.config = SimpleConfig(target_duration=30, cache_audio=False, audio_timeline=False)
+    proc.ai_analyzer = FakeAIAnalyzer()
+    audio = proc._prepare_audio(AudioFeatures(), 'unused.mp4', 600.0, use_audio=use_audio, planner=planner)
+    return proc.ai_analyzer, audio
+
+
+def test_whisper_runs_without_a_deadline():
+    ai, audio = prepare_audio()
+    assert audio.speech and ai.started == 1 and audio.whisper_choice is not None
+
+
+def test_whisper_is_skipped_when_the_plan_drops_audio():
+    ai, audio = prepare_audio(use_audio=False, planner=DeadlinePlanner(3600))
+    assert not audio.speech and ai.started == 0 and ai.switched == []
+
+
+def test_whisper_is_skipped_when_the_deadline_cannot_cover_it():
+    planner = DeadlinePlanner(0)
+    ai, audio = prepare_audio(planner=planner)
+
+    assert not audio.speech and ai.started == 0
+    assert audio.whisper_choice is None
+    assert 'transcription' in planner.skipped_stages
+
+
+def test_whisper_runs_when_the_deadline_covers_it():
+    ai, audio = prepare_audio(planner=DeadlinePlanner(3600))
+    assert audio.speech and ai.started == 1
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from core.ai_analyzers import EmotionAnalyzer
+
+EMOTIONS = ['Anger', 'Contempt', 'Disgust', 'Fear', 'Happiness', 'Neutral', 'Sadness', 'Surprise']
+
+
+class RecordingRecognizer:
+    """Stands in for HSEmotionRecognizer and records the batch sizes it is called with"""
+    img_size = 224
+    idx_to_class = dict(enumerate(EMOTIONS))
+
+    def __init__(self):
+        self.batches = []
+
+    def predict_multi_emotions(self, faces, logits=False):
+        self.batches.append(len(faces))
+        scores = np.tile(np.eye(len(EMOTIONS))[4], (len(faces), 1))
+        return ['Happiness'] * len(faces), scores
+
+
+@pytest.fixture
+def analyzer():
+    analyzer = EmotionAnalyzer(batch_size=4, max_batch_bytes=64 * 1024 * 1024)
+    # HSEmotion is not needed to exercise batching
+    analyzer.recognizer = RecordingRecognizer()
+    analyzer.positive_emotions = {'Happiness', 'Surprise'}
+    return analyzer
+
+
+def faces(n, side=48):
+    return (np.full((side, side, 3), i, np.uint8) for i in range(n))
+
+
+def test_batches_default_to_the_analyzer_limits(analyzer):
+    results = analyzer.analyze_faces(faces(10))
+
+    assert len(results) == 10 and all(r['emotion'] == 'Happiness' for r in results)
+    assert analyzer.recognizer.batches == [4, 4, 2]
+
+
+def test_per_call_limits_override_the_shared_analyzer(analyzer):
+    analyzer.analyze_faces(faces(10), batch_size=3)
+    assert analyzer.recognizer.batches == [3, 3, 3, 1]
+
+    # Two faces (crop plus float32 input tensor each) fit the budget, a third does not
+    tensor_bytes = 3 * 224 * 224 * 4
+    analyzer.recognizer.batches = []
+    analyzer.analyze_faces(faces(5), batch_size=16, max_batch_bytes=2 * (tensor_bytes + 48 * 48 * 3))
+    assert analyzer.recognizer.batches == [2, 2, 1]
+
+    assert analyzer.batch_size == 4
+
+
+def test_a_single_face_larger_than_the_budget_still_runs(analyzer):
+    analyzer.analyze_faces(faces(2), max_batch_bytes=1)
+    assert analyzer.recognizer.batches == [1, 1]
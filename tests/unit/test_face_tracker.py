@@ -0,0 +1,72 @@
+import cv2
+import numpy as np
+import pytest
+
+from core.face_tracker import FaceTracker, box_iou
+
+
+def face(x, y, w=80, h=80, score=0.9):
+    """YuNet-layout face with landmarks spread over the box"""
+    landmarks = [x + 0.3 * w, y + 0.4 * h, x + 0.7 * w, y + 0.4 * h, x + 0.5 * w, y + 0.55 * h,
+                 x + 0.35 * w, y + 0.75 * h, x + 0.65 * w, y + 0.75 * h]
+    return np.array([x, y, w, h, *landmarks, score], dtype=np.float32)
+
+
+def texture(width, height, seed=0):
+    noise = np.random.default_rng(seed).integers(0, 255, (height, width), dtype=np.uint8)
+    return cv2.cvtColor(cv2.GaussianBlur(noise, (7, 7), 0), cv2.COLOR_GRAY2BGR)
+
+
+def shifted(frame, dx, dy):
+    return np.roll(np.roll(frame, dy, axis=0), dx, axis=1)
+
+
+def test_box_iou():
+    assert box_iou(face(0, 0), face(0, 0)) == pytest.approx(1.0)
+    assert box_iou(face(0, 0), face(200, 0)) == 0.0
+    assert box_iou(face(0, 0), face(40, 0)) == pytest.approx(1 / 3)
+
+
+def test_detections_keep_their_track_ids():
+    tracker = FaceTracker()
+    frame = texture(640, 480)
+
+    first = tracker.update(frame, [face(100, 100), face(400, 200)])
+    second = tracker.update(frame, [face(410, 205), face(105, 98), face(250, 350)])
+
+    ids = {tuple(f[:2]): track_id for track_id, f in second}
+    assert ids[(105, 98)] == first[0][0]
+    assert ids[(410, 205)] == first[1][0]
+    assert ids[(250, 350)] not in (first[0][0], first[1][0])
+
+
+def test_a_track_continues_only_once():
+    tracker = FaceTracker()
+    frame = texture(640, 480)
+    (track_id, _), = tracker.update(frame, [face(100, 100)])
+
+    # Two detections overlap the track; the better overlap keeps the ID
+    tracks = tracker.update(frame, [face(130, 100), face(102, 100)])
+    assert [tid == track_id for tid, _ in tracks] == [False, True]
+
+
+@pytest.mark.parametrize('size, max_side', [((640, 480), 640), ((1280, 720), 640)])
+def test_tracks_follow_the_image_between_detections(size, max_side):
+    tracker = FaceTracker(max_side=max_side)
+    frame = texture(*size)
+    tracker.update(frame, [face(300, 200, 120, 120)])
+
+    (_, moved), = tracker.update(shifted(frame, 12, -6))
+
+    assert moved[0] == pytest.approx(312, abs=1.5)
+    assert moved[1] == pytest.approx(194, abs=1.5)
+    assert moved[4:14:2] == pytest.approx(face(312, 194, 120, 120)[4:14:2], abs=1.5)
+
+
+def test_tracks_leaving_the_frame_or_without_history_are_dropped():
+    tracker = FaceTracker()
+    assert tracker.update(texture(640, 480)) == []
+
+    frame = texture(640, 480)
+    tracker.update(frame, [face(590, 200, 80, 80)])
+    assert tracker.update(shifted(frame, 30, 0)) == []
@@ -0,0 +1,43 @@
+import shutil
+
+import pytest
+
+from core.frame_source import FrameRequest, iter_frames
+from helpers import INDEX_SIZE, read_index
+
+pytestmark = pytest.mark.skipif(shutil.which('ffmpeg') is None, reason="ffmpeg not installed")
+
+
+@pytest.mark.parametrize('request_, start, end', [
+    (FrameRequest(interval=1.0, size=INDEX_SIZE, grayscale=True), 0.0, None),
+    (FrameRequest(interval=0.5, size=INDEX_SIZE, grayscale=True), 0.0, None),
+    (FrameRequest(interval=1 / 3, size=(160, 120), grayscale=True), 0.0, None),
+    (FrameRequest(interval=0.3, size=INDEX_SIZE, grayscale=True), 2.37, 9.1),
+    (FrameRequest(interval=1.0, lead=1, size=INDEX_SIZE, grayscale=True), 3.0, 8.0),
+    (FrameRequest(stride=7, size=INDEX_SIZE, grayscale=True), 1.5, None),
+    (FrameRequest(stride=5, size=(160, 120)), 0.0, 4.0),
+])
+def test_ffmpeg_labels_match_opencv_and_frame_content(index_video, request_, start, end):
+    opencv = [frame_idx for frame_idx, _, _ in iter_frames(index_video, request_, start, end, backend='opencv')]
+    ffmpeg = [
+        (frame_idx, timestamp, read_index(frame))
+        for frame_idx, timestamp, frame in iter_frames(index_video, request_, start, end, backend='ffmpeg')
+    ]
+
+    assert opencv
+    assert [frame_idx for frame_idx, _, _ in ffmpeg] == opencv
+    # Each label names the frame that was actually delivered
+    assert all(shown == frame_idx for frame_idx, _, shown in ffmpeg)
+    assert all(timestamp == pytest.approx(frame_idx / 25) for frame_idx, timestamp, _ in ffmpeg)
+
+
+def test_ffmpeg_frames_have_the_requested_variant(index_video):
+    request = FrameRequest(interval=1.0, size=(160, 120))
+    frame_idx, timestamp, frame = next(iter_frames(index_video, request, backend='ffmpeg'))
+
+    assert frame.shape == (120, 160, 3)
+
+
+def test_unknown_backend_is_rejected(index_video):
+    with pytest.raises(ValueError, match="Unknown frame backend"):
+        next(iter_frames(index_video, FrameRequest(), backend='gstreamer'))
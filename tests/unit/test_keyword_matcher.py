@@ -0,0 +1,84 @@
+import json
+import random
+
+import pytest
+
+from core.keyword_matcher import KeywordMatcher, get_matcher, normalize_token, tokenize
+
+
+KEYWORDS = {
+    'excitement': {'happy': 1.0, 'birthday': 1.0, 'happy birthday': 2.0, 'oh my god': 1.5, 'wow': 1.0},
+    'intensity': {'so': 1.0, 'my god': 0.5},
+}
+
+
+def spans(matches):
+    return [(m.phrase, m.start, m.end) for m in matches]
+
+
+@pytest.mark.parametrize('raw, normalized', [
+    ('WOW', 'wow'),
+    ('Wooooow', 'wow'),
+    ('yesss', 'yes'),
+    ('hahahaha', 'haha'),
+    ('Héhéhé', 'hehe'),
+    ('’cause', 'cause'),
+])
+def test_normalize_token(raw, normalized):
+    assert normalize_token(raw) == normalized
+
+
+def test_matches_whole_tokens_only():
+    matcher = KeywordMatcher(KEYWORDS)
+
+    assert matcher.find("I also saw it") == []
+    assert spans(matcher.find("Wow! It's so good")) == [('wow', 0, 1), ('so', 2, 3)]
+
+
+def test_leftmost_longest_drops_contained_phrases():
+    matcher = KeywordMatcher(KEYWORDS)
+    text = "happy birthday, oh my god"
+
+    assert spans(matcher.find(text)) == [('happy birthday', 0, 2), ('oh my god', 2, 5)]
+    assert spans(matcher.find(text, overlapping=True)) == [
+        ('happy birthday', 0, 2), ('happy', 0, 1), ('birthday', 1, 2),
+        ('oh my god', 2, 5), ('my god', 3, 5),
+    ]
+
+
+def test_failure_links_recover_a_phrase_after_a_partial_match():
+    matcher = KeywordMatcher(KEYWORDS)
+
+    # "oh my oh my god": the first "oh my" is a dead end, the second completes
+    assert spans(matcher.find("oh my oh my god")) == [('oh my god', 2, 5)]
+
+
+def test_matches_agree_with_a_brute_force_scan():
+    matcher = KeywordMatcher(KEYWORDS)
+    phrases = [(tuple(tokenize(p)), p) for phrases in KEYWORDS.values() for p in phrases]
+    vocabulary = ['happy', 'birthday', 'oh', 'my', 'god', 'so', 'wow', 'also', 'the']
+    rng = random.Random(0)
+
+    for _ in range(200):
+        tokens = [rng.choice(vocabulary) for _ in range(rng.randint(0, 12))]
+        expected = sorted(
+            (phrase, start, start + len(pattern))
+            for pattern, phrase in phrases
+            for start in range(len(tokens) - len(pattern) + 1)
+            if tuple(tokens[start:start + len(pattern)]) == pattern
+        )
+        assert sorted(spans(matcher.find_tokens(tokens, overlapping=True))) == expected
+
+
+def test_get_matcher_compiles_once_and_reads_dictionary_files(tmp_path):
+    assert get_matcher('en') is get_matcher('en')
+
+    path = tmp_path / 'de.json'
+    path.write_text(json.dumps({'excitement': {'toll': 1.0, 'alles gute': 2.0}}), encoding='utf-8')
+    matcher = get_matcher('de', path=str(path))
+
+    assert len(matcher) == 2
+    assert spans(matcher.find("Alles Gute, toll!")) == [('alles gute', 0, 2), ('toll', 2, 3)]
+
+    with pytest.raises(FileNotFoundError):
+        get_matcher('xx')
@@ -0,0 +1,74 @@
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+
+from core.audio_volume_analyzer import AudioVolumeAnalyzer
+from core.frame_source import SharedFrameDecoder
+from core.hierarchical_scene_detection import AdaptiveCutStream, adaptive_cut_indices, detect_coarse_to_fine
+from core.simple_processor import (
+    AudioFeatures, CoarseToFineSceneConsumer, SceneChangeConsumer, SimpleConfig, SimpleVideoProcessor
+)
+from helpers import CUTS, CUTS_FRAMES
+
+DURATION = CUTS_FRAMES / 25
+EXACT = [(0.0, CUTS[0] / 25), (CUTS[0] / 25, CUTS[1] / 25), (CUTS[1] / 25, DURATION)]
+
+
+def processor(**config):
+    proc = object.__new__(SimpleVideoProcessor)
+    proc.config = SimpleConfig(**config)
+    proc.audio_analyzer = AudioVolumeAnalyzer()
+    proc.ai_analyzer = None
+    proc.diversity_scorer = None
+    return proc
+
+
+def test_stream_flags_the_same_spans_as_a_whole_pass():
+    # Flat frames: consecutive differences are the steps between these levels
+    levels = [0, 1, 3, 2, 42, 40, 41, 44, 42, 43, 41, 71, 70, 72, 97]
+    stream = AdaptiveCutStream()
+    spans = []
+    for i, level in enumerate(levels):
+        spans += stream.push(float(i), np.full((4, 4), level, np.uint8))
+    spans += stream.finish()
+
+    expected = adaptive_cut_indices(stream.diffs)
+    assert expected == [3, 10, 13]
+    assert spans == [(float(i), float(i + 1)) for i in expected]
+
+
+def test_shared_decode_finds_frame_accurate_cuts(cuts_video):
+    features = processor()._decode_frame_features(cuts_video)
+
+    assert isinstance(features.scene_cuts, CoarseToFineSceneConsumer)
+    assert features.scene_cuts.get_scenes(DURATION) == EXACT
+    assert features.scene_cuts.probe.cap is None
+
+
+def test_shared_decode_matches_the_standalone_coarse_to_fine_pass(cuts_video):
+    decoder = SharedFrameDecoder(cuts_video)
+    consumer = decoder.register(CoarseToFineSceneConsumer(cuts_video, min_scene_length=0.0))
+    decoder.run()
+
+    assert [end for _, end in consumer.scenes] == pytest.approx(detect_coarse_to_fine(cuts_video))
+
+
+def test_fixed_detection_keeps_the_one_second_consumer(cuts_video):
+    features = processor(scene_detection='fixed')._decode_frame_features(cuts_video)
+
+    assert type(features.scene_cuts) is SceneChangeConsumer
+    assert features.scene_cuts.get_scenes(DURATION) == [(0.0, 9.0), (9.0, 16.0), (16.0, DURATION)]
+
+
+def test_pipeline_streams_the_refined_scenes(cuts_video):
+    audio_ready = Future()
+    audio_ready.set_result(None)
+
+    features, scenes, cheap = processor()._run_pipeline(
+        cuts_video, cuts_video, DURATION, 1, faces=False,
+        audio_future=audio_ready, audio=AudioFeatures(), analyze_audio=False
+    )
+
+    assert scenes == EXACT
+    assert len(cheap) == len(scenes)
@@ -0,0 +1,92 @@
+import pytest
+
+from core.frame_source import FrameConsumer, FrameRequest, SharedFrameDecoder, iter_frames
+from helpers import read_index
+
+
+class Recorder(FrameConsumer):
+    def __init__(self, request: FrameRequest):
+        self.request = request
+        self.frames = []
+        self.finished = False
+
+    def consume(self, frame_idx, timestamp, frame):
+        self.frames.append((frame_idx, timestamp, frame))
+
+    def finish(self):
+        self.finished = True
+
+
+class Failing(FrameConsumer):
+    request = FrameRequest(stride=10)
+
+    def consume(self, frame_idx, timestamp, frame):
+        raise RuntimeError("analyzer broke")
+
+
+REQUESTS = [
+    FrameRequest(interval=1.0, size=(160, 120), grayscale=True),
+    FrameRequest(interval=1 / 3, size=(320, 240), grayscale=True),
+    FrameRequest(stride=7, size=(160, 120)),
+    FrameRequest(interval=0.5, lead=1, size=(160, 120), grayscale=True),
+]
+
+
+@pytest.mark.parametrize('queue_size', [None, 4])
+def test_each_consumer_gets_exactly_its_own_schedule(index_video, queue_size):
+    decoder = SharedFrameDecoder(index_video, queue_size=queue_size)
+    consumers = [decoder.register(Recorder(request)) for request in REQUESTS]
+    decoder.run()
+
+    for consumer in consumers:
+        alone = [frame_idx for frame_idx, _, _ in iter_frames(index_video, consumer.request)]
+        assert [frame_idx for frame_idx, _, _ in consumer.frames] == alone
+        assert all(read_index(frame) == frame_idx for frame_idx, _, frame in consumer.frames)
+        assert consumer.finished
+
+
+def test_frames_are_labelled_with_their_timestamp(index_video):
+    decoder = SharedFrameDecoder(index_video)
+    consumer = decoder.register(Recorder(FrameRequest(interval=1.0, size=(160, 120), grayscale=True)))
+    decoder.run()
+
+    assert [frame_idx for frame_idx, _, _ in consumer.frames] == list(range(0, 300, 25))
+    assert [timestamp for _, timestamp, _ in consumer.frames] == pytest.approx([i / 25 for i in range(0, 300, 25)])
+
+
+def test_consumers_with_the_same_variant_share_one_array(index_video):
+    decoder = SharedFrameDecoder(index_video)
+    request = FrameRequest(interval=1.0, size=(160, 120), grayscale=True)
+    a, b = decoder.register(Recorder(request)), decoder.register(Recorder(request))
+    c = decoder.register(Recorder(FrameRequest(interval=1.0, size=(160, 120))))
+    decoder.run()
+
+    assert all(fa is fb for (_, _, fa), (_, _, fb) in zip(a.frames, b.frames))
+    assert c.frames[0][2].shape == (120, 160, 3)
+    assert a.frames[0][2].shape == (120, 160)
+
+
+def test_unrequested_frames_are_not_decoded(index_video):
+    decoder = SharedFrameDecoder(index_video)
+    decoder.register(Recorder(FrameRequest(interval=1.0, size=(160, 120), grayscale=True)))
+    walked = decoder.run()
+
+    assert walked == 300
+    assert decoder.frames_decoded == 12
+
+
+def test_pipelined_wait_for_and_consumer_errors(index_video):
+    decoder = SharedFrameDecoder(index_video, queue_size=2)
+    consumer = decoder.register(Recorder(FrameRequest(interval=1.0, size=(160, 120), grayscale=True)))
+    decoder.register(Failing())
+    decoder.start()
+
+    assert decoder.wait_for(consumer, 5.0, timeout=30)
+    assert max(timestamp for _, timestamp, _ in consumer.frames) >= 5.0 - 1.0
+
+    with pytest.raises(RuntimeError, match="analyzer broke"):
+        decoder.join()
+
+    # The healthy consumer still saw the whole video
+    assert len(consumer.frames) == 12
+    assert all(read_index(frame) == frame_idx for frame_idx, _, frame in consumer.frames)
@@ -0,0 +1,53 @@
+import pytest
+
+import core.shot_prefilter as shot_prefilter
+from core.shot_prefilter import PacketInfo, candidate_cuts, keyframe_windows, prefilter_cuts, verify_cuts
+from helpers import CUTS, write_cuts_video
+
+
+def packets(sizes, keyframes=(), fps=25):
+    return [PacketInfo(i / fps, size, i in keyframes) for i, size in enumerate(sizes)]
+
+
+def test_oversized_inter_frames_are_candidates():
+    sizes = [1000] * 100
+    sizes[40] = 5000
+    sizes[41] = 2500  # Under 3x the local median
+
+    assert candidate_cuts(packets(sizes, keyframes={0})) == [40 / 25]
+
+
+def test_off_cadence_keyframes_are_candidates():
+    # The encoder restarts its 50-frame GOP at the scene-cut keyframe
+    keyframes = {0, 50, 100, 130, 180, 230}
+
+    assert candidate_cuts(packets([1000] * 250, keyframes)) == [130 / 25]
+
+
+def test_verify_confirms_cuts_frame_accurately(cuts_video):
+    windows = [(cut / 25 - 0.5, cut / 25 + 0.5) for cut in CUTS] + [(3.0, 4.0)]
+
+    assert verify_cuts(cuts_video, windows) == pytest.approx([cut / 25 for cut in CUTS])
+
+
+def test_verify_threshold_keeps_cuts_between_similar_shots(tmp_path):
+    # The cut at frame 611 only changes the mean frame by ~13 gray levels
+    video = write_cuts_video(str(tmp_path / 'weak.mp4'), (202, 377, 380, 611), 700)
+
+    assert verify_cuts(video, [(24.0, 25.0)], threshold=30.0) == []
+    assert verify_cuts(video, [(24.0, 25.0)]) == pytest.approx([611 / 25])
+
+
+def test_keyframe_windows_bracket_the_changed_gops(cuts_video):
+    windows = keyframe_windows(cuts_video, [0.0, 4.0, 8.0, 12.0, 16.0, 20.0])
+
+    assert [start for start, _ in windows] == pytest.approx([8.0 - 1 / 25, 12.0 - 1 / 25])
+    assert [end for _, end in windows] == pytest.approx([12.0 + 1 / 25, 16.0 + 1 / 25])
+    assert verify_cuts(cuts_video, windows) == pytest.approx([cut / 25 for cut in CUTS])
+
+
+def test_prefilter_without_packet_metadata_falls_back(monkeypatch, cuts_video):
+    monkeypatch.setattr(shot_prefilter, 'AV_AVAILABLE', False)
+    monkeypatch.setattr(shot_prefilter.shutil, 'which', lambda name: None)
+
+    assert prefilter_cuts(cuts_video) is None
@@ -0,0 +1,103 @@
+import threading
+
+import numpy as np
+
+from core.transcription import BackgroundTranscription, TranscriptIndex
+
+
+def brute_force(segments, start, end):
+    return [s for s in segments if s['start'] < end and s['end'] > start]
+
+
+def test_overlap_queries_match_a_linear_scan():
+    rng = np.random.default_rng(0)
+    starts = np.sort(rng.uniform(0, 300, 200))
+    segments = [{'start': float(s), 'end': float(s + rng.exponential(4.0)), 'text': str(i)}
+                for i, s in enumerate(starts)]
+    segments[10]['end'] = 250.0  # One long segment spanning most of the track
+
+    index = TranscriptIndex()
+    for segment in segments:
+        index.add(segment)
+
+    for start in np.arange(0, 310, 7.3):
+        for length in (0.5, 5.0, 40.0):
+            assert index.overlapping(start, start + length) == brute_force(segments, start, start + length)
+
+
+def test_touching_segments_do_not_overlap():
+    index = TranscriptIndex()
+    index.add({'start': 0.0, 'end': 5.0})
+    index.add({'start': 5.0, 'end': 9.0})
+
+    assert index.overlapping(5.0, 9.0) == [{'start': 5.0, 'end': 9.0}]
+    assert index.overlapping(0.0, 5.0) == [{'start': 0.0, 'end': 5.0}]
+    assert len(index) == 2
+
+
+class ScriptedTranscriber:
+    """Emits fixed segments per source, optionally waiting for a release signal"""
+
+    def __init__(self, script, gate=None):
+        self.script = script
+        self.gate = gate
+        self.inputs = []
+
+    def transcribe(self, audio_input, offset=0.0, info=None, stop_event=None):
+        self.inputs.append((offset, audio_input))
+        for start, end, text in self.script.get(offset, []):
+            if self.gate is not None:
+                self.gate.wait()
+            yield {'start': start, 'end': end, 'text': text}
+
+    def build_result(self, segments, **info):
+        return {'text': ' '.join(s['text'] for s in segments), 'has_speech': True}
+
+    def _empty_result(self):
+        return {'text': '', 'has_speech': False}
+
+    def _extract_audio_segment(self, video_path, start, end):
+        return np.zeros(int((end - start) * 16000), np.float32)
+
+
+def test_scenes_get_the_segments_that_overlap_them():
+    transcriber = ScriptedTranscriber({0.0: [(0.5, 3.0, 'hello'), (2.5, 6.0, 'world'), (12.0, 14.0, 'later')]})
+    transcript = BackgroundTranscription(transcriber, 'video.mp4').start()
+    try:
+        assert transcript.segment_result(0.0, 2.0)['text'] == 'hello'
+        assert transcript.segment_result(2.0, 8.0)['text'] == 'hello world'
+        assert transcript.segment_result(8.0, 11.0)['has_speech'] is False
+    finally:
+        transcript.stop()
+
+
+def test_only_regions_are_transcribed_and_queries_wait_for_them():
+    gate = threading.Event()
+    transcriber = ScriptedTranscriber({10.0: [(10.5, 12.0, 'speech')]}, gate=gate)
+    transcript = BackgroundTranscription(transcriber, 'video.mp4', regions=[(0.0, 2.0), (10.0, 13.0)]).start()
+    try:
+        # Region 0-2 s has no speech; the worker has passed it but not 10-13 s yet
+        assert transcript.wait_until(2.0, timeout=5)
+        assert not transcript.wait_until(13.0, timeout=0.05)
+
+        gate.set()
+        assert transcript.segment_result(9.0, 14.0, timeout=5)['text'] == 'speech'
+        assert [offset for offset, _ in transcriber.inputs] == [0.0, 10.0]
+        assert len(transcriber.inputs[1][1]) == 3 * 16000
+    finally:
+        gate.set()
+        transcript.stop()
+
+
+def test_worker_errors_unblock_waiting_scenes():
+    class Failing(ScriptedTranscriber):
+        def transcribe(self, *args, **kwargs):
+            raise RuntimeError("model crashed")
+            yield
+
+    transcript = BackgroundTranscription(Failing({}), 'video.mp4').start()
+    try:
+        assert transcript.segment_result(0.0, 100.0, timeout=5)['has_speech'] is False
+        assert isinstance(transcript.error, RuntimeError)
+    finally:
+        transcript.stop()
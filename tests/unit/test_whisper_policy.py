@@ -0,0 +1,46 @@
+import pytest
+
+import core.ai_analyzers as ai_analyzers
+from core.whisper_policy import WhisperChoice, WhisperPolicy
+
+
+@pytest.mark.parametrize('active_jobs, size, threads', [
+    (1, 'small.en', 8),
+    (2, 'small.en', 8),
+    (4, 'small.en', 4),
+    (6, 'base.en', 2),
+    (16, 'tiny.en', 1),
+    (64, 'tiny.en', 1),
+])
+def test_size_and_threads_follow_the_jobs_share(active_jobs, size, threads):
+    choice = WhisperPolicy(cpu_count=16).choose(active_jobs)
+
+    assert (choice.model_size, choice.cpu_threads) == (size, threads)
+
+
+def test_deadline_steps_the_size_down_until_the_estimate_fits():
+    policy = WhisperPolicy(cpu_count=4, deadline_share=0.5)
+    choice = policy.choose(1, audio_seconds=600, deadline=100)
+
+    assert choice.model_size == 'base.en'
+    assert choice.reason == 'deadline'
+    assert choice.estimated_seconds == pytest.approx(policy.estimate('base.en', 4, 600))
+    assert choice.estimated_seconds <= 50
+
+
+def test_key_separates_thread_counts():
+    one = WhisperChoice(model_size='base.en', cpu_threads=1)
+    four = WhisperChoice(model_size='base.en', cpu_threads=4)
+
+    assert one.key != four.key
+    assert one.key == WhisperChoice(model_size='base.en', cpu_threads=1, reason='deadline').key
+
+
+def test_transcriber_is_loaded_with_the_chosen_threads(monkeypatch):
+    loaded = []
+    monkeypatch.setattr(ai_analyzers, 'AudioTranscriber', lambda **kwargs: loaded.append(kwargs))
+    choice = WhisperPolicy(cpu_count=8).choose(4)
+
+    ai_analyzers.transcriber_factory(choice)()
+
+    assert loaded == [{'model_size': 'base.en', 'compute_type': 'int8', 'cpu_threads': 2}]